@@ -335,6 +335,7 @@ def full_analysis(
             include_core,
             include_dashas,
             include_divisional_charts,
+            tuple(dcharts or ()),  # charts may be a requested subset
             ANALYSIS_CACHE_VERSION,  # Include version in cache key
         )
         if key in _CACHE:
@@ -1,7 +1,17 @@
 # backend/ashtakavarga.py
-"""Simplified Ashtakavarga calculations."""
+"""Ashtakavarga calculations.
 
-from typing import Dict, List
+``calculate_ashtakavarga`` is the simplified single-pattern version.
+``calculate_full_ashtakavarga`` implements the classical (BPHS) scheme in
+which the Sun..Saturn and the lagna each contribute bindus to every
+planet's Bhinnashtakavarga. Contributor tables are stored as 12-bit
+masks; a chart's BAV is the sum of those masks rotated to each
+contributor's sign, computed in NumPy so many charts can be scored at once.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
 
 # Patterns of benefic houses counted from a planet's sign.
 # Each set contains the offsets (1-12) that yield a bindu.
@@ -54,3 +64,197 @@ def calculate_ashtakavarga(planets: List[dict]) -> Dict[str, Dict[int, int]]:
         bav[name] = points
 
     return {"bav": bav, "total_points": totals}
+
+
+BAV_PLANETS = ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn")
+CONTRIBUTORS = BAV_PLANETS + ("Lagna",)
+
+
+def _mask(houses: Sequence[int]) -> int:
+    """Encode houses (1-12) counted from a contributor as a 12-bit mask."""
+    mask = 0
+    for house in houses:
+        mask |= 1 << (house - 1)
+    return mask
+
+
+# BPHS contributor tables: for each planet's BAV, the houses counted from
+# each contributor (in CONTRIBUTORS order) that receive a bindu.
+BAV_MASKS: Dict[str, tuple] = {
+    "Sun": tuple(map(_mask, (
+        (1, 2, 4, 7, 8, 9, 10, 11), (3, 6, 10, 11), (1, 2, 4, 7, 8, 9, 10, 11),
+        (3, 5, 6, 9, 10, 11, 12), (5, 6, 9, 11), (6, 7, 12),
+        (1, 2, 4, 7, 8, 9, 10, 11), (3, 4, 6, 10, 11, 12),
+    ))),
+    "Moon": tuple(map(_mask, (
+        (3, 6, 7, 8, 10, 11), (1, 3, 6, 7, 10, 11), (2, 3, 5, 6, 9, 10, 11),
+        (1, 3, 4, 5, 7, 8, 10, 11), (1, 4, 7, 8, 10, 11, 12), (3, 4, 5, 7, 9, 10, 11),
+        (3, 5, 6, 11), (3, 6, 10, 11),
+    ))),
+    "Mars": tuple(map(_mask, (
+        (3, 5, 6, 10, 11), (3, 6, 11), (1, 2, 4, 7, 8, 10, 11),
+        (3, 5, 6, 11), (6, 10, 11, 12), (6, 8, 11, 12),
+        (1, 4, 7, 8, 9, 10, 11), (1, 3, 6, 10, 11),
+    ))),
+    "Mercury": tuple(map(_mask, (
+        (5, 6, 9, 11, 12), (2, 4, 6, 8, 10, 11), (1, 2, 4, 7, 8, 9, 10, 11),
+        (1, 3, 5, 6, 9, 10, 11, 12), (6, 8, 11, 12), (1, 2, 3, 4, 5, 8, 9, 11),
+        (1, 2, 4, 7, 8, 9, 10, 11), (1, 2, 4, 6, 8, 10, 11),
+    ))),
+    "Jupiter": tuple(map(_mask, (
+        (1, 2, 3, 4, 7, 8, 9, 10, 11), (2, 5, 7, 9, 11), (1, 2, 4, 7, 8, 10, 11),
+        (1, 2, 4, 5, 6, 9, 10, 11), (1, 2, 3, 4, 7, 8, 10, 11), (2, 5, 6, 9, 10, 11),
+        (3, 5, 6, 12), (1, 2, 4, 5, 6, 7, 9, 10, 11),
+    ))),
+    "Venus": tuple(map(_mask, (
+        (8, 11, 12), (1, 2, 3, 4, 5, 8, 9, 11, 12), (3, 5, 6, 9, 11, 12),
+        (3, 5, 6, 9, 11), (5, 8, 9, 10, 11), (1, 2, 3, 4, 5, 8, 9, 10, 11),
+        (3, 4, 5, 8, 9, 10, 11), (1, 2, 3, 4, 5, 8, 9, 11),
+    ))),
+    "Saturn": tuple(map(_mask, (
+        (1, 2, 4, 7, 8, 10, 11), (3, 6, 11), (3, 5, 6, 10, 11, 12),
+        (6, 8, 9, 10, 11, 12), (5, 6, 11, 12), (6, 11, 12),
+        (3, 5, 6, 11), (1, 3, 4, 6, 10, 11),
+    ))),
+}
+
+# _BAV_ROTATED[c, s, p] holds contributor c's bindus for planet p's BAV
+# per sign when c occupies sign s (0-based): every mask rotated 12 ways.
+# Row s = 12 (addressed as -1) is all zeros for a missing contributor.
+_BAV_ROTATED = np.array(
+    [
+        [
+            [[(BAV_MASKS[p][c] >> ((sign - s) % 12)) & 1 for sign in range(12)] for p in BAV_PLANETS]
+            for s in range(12)
+        ]
+        + [[[0] * 12 for _ in BAV_PLANETS]]
+        for c in range(len(CONTRIBUTORS))
+    ],
+    dtype=np.int16,
+)
+
+# Signs (0-based) sharing a lord, for Ekadhipatya shodhana; the Sun and
+# Moon own a single sign each and are left out.
+_SAME_LORD_PAIRS = np.array([(0, 7), (1, 6), (2, 5), (8, 11), (9, 10)])
+_RASI_GUNAKARA = np.array([7, 10, 8, 4, 10, 5, 7, 8, 9, 5, 11, 12])
+_GRAHA_GUNAKARA = np.array([5, 5, 8, 5, 10, 7, 5])
+
+
+def contributor_signs(planets: List[dict], ascendant: Optional[float]) -> np.ndarray:
+    """Return the 0-based signs of the eight contributors for one chart.
+
+    Contributors missing from ``planets`` (or a missing ascendant) are
+    encoded as -1 and add no bindus.
+    """
+    by_name = {p["name"]: p for p in planets}
+    signs = []
+    for name in BAV_PLANETS:
+        planet = by_name.get(name)
+        if planet is None:
+            signs.append(-1)
+            continue
+        sign = planet.get("sign")
+        if not isinstance(sign, int):
+            sign = int(planet["longitude"] % 360 // 30) + 1
+        signs.append(sign - 1)
+    signs.append(-1 if ascendant is None else int(ascendant % 360 // 30))
+    return np.array(signs, dtype=np.int64)
+
+
+def bav_from_signs(signs: np.ndarray) -> np.ndarray:
+    """Sum the contributor masks rotated to each contributor's sign.
+
+    ``signs`` has shape ``(..., 8)`` (0-based contributor signs); the
+    result has shape ``(..., 7, 12)`` with bindus per planet and sign.
+    """
+    signs = np.asarray(signs)
+    return _BAV_ROTATED[np.arange(len(CONTRIBUTORS)), signs].sum(axis=-3)
+
+
+def trikona_shodhana(bav: np.ndarray) -> np.ndarray:
+    """Reduce each trine (1-5-9, 2-6-10, ...) by its smallest value."""
+    trines = bav.reshape(bav.shape[:-1] + (3, 4))
+    return (trines - trines.min(axis=-2, keepdims=True)).reshape(bav.shape)
+
+
+def ekadhipatya_shodhana(bav: np.ndarray, occupied: np.ndarray) -> np.ndarray:
+    """Reduce the two signs of each lord.
+
+    ``occupied`` flags signs holding a planet and must broadcast to ``bav``.
+    No reduction when both signs are occupied or either is already zero.
+    Two empty signs both take the smaller value (zero when equal); an
+    empty sign paired with an occupied one drops to zero when it has no
+    more bindus than the occupied sign and to the occupied sign's count
+    otherwise.
+    """
+    result = bav.copy()
+    a, b = _SAME_LORD_PAIRS[:, 0], _SAME_LORD_PAIRS[:, 1]
+    va, vb = bav[..., a], bav[..., b]
+    occ = np.broadcast_to(occupied, bav.shape)
+    oa, ob = occ[..., a], occ[..., b]
+    skip = (oa & ob) | (va == 0) | (vb == 0)
+
+    both_empty = ~oa & ~ob
+    low = np.minimum(va, vb)
+    equal = va == vb
+    new_a = np.where(both_empty, np.where(equal, 0, low), va)
+    new_b = np.where(both_empty, np.where(equal, 0, low), vb)
+    only_a = oa & ~ob
+    only_b = ob & ~oa
+    new_b = np.where(only_a, np.where(vb <= va, 0, va), new_b)
+    new_a = np.where(only_b, np.where(va <= vb, 0, vb), new_a)
+
+    result[..., a] = np.where(skip, va, new_a)
+    result[..., b] = np.where(skip, vb, new_b)
+    return result
+
+
+def _occupied(signs: np.ndarray) -> np.ndarray:
+    """Signs holding at least one of the seven planets: ``(..., 12)`` bool."""
+    planets = signs[..., :7]
+    return (planets[..., :, None] == np.arange(12)).any(axis=-2)
+
+
+def batch_ashtakavarga(signs: np.ndarray) -> Dict[str, np.ndarray]:
+    """Full Ashtakavarga for many charts at once.
+
+    ``signs`` is an ``(N, 8)`` array of 0-based contributor signs (see
+    :func:`contributor_signs`). Returns arrays ``bav`` ``(N, 7, 12)``,
+    ``sav`` ``(N, 12)``, ``sodhya`` ``(N, 7, 12)`` and ``sodhya_pinda``
+    ``(N, 7)``.
+    """
+    signs = np.asarray(signs, dtype=np.int64)
+    bav = bav_from_signs(signs)
+    sodhya = ekadhipatya_shodhana(trikona_shodhana(bav), _occupied(signs)[..., None, :])
+    rasi_pinda = (sodhya * _RASI_GUNAKARA).sum(axis=-1)
+    # Graha pinda: reduced bindus under each planet times its multiplier.
+    planet_signs = np.broadcast_to(signs[..., None, :7], sodhya.shape[:-1] + (7,))
+    under = np.take_along_axis(sodhya, planet_signs % 12, axis=-1)
+    graha_pinda = (np.where(planet_signs >= 0, under, 0) * _GRAHA_GUNAKARA).sum(axis=-1)
+    return {
+        "bav": bav,
+        "sav": bav.sum(axis=-2),
+        "sodhya": sodhya,
+        "sodhya_pinda": rasi_pinda + graha_pinda,
+    }
+
+
+def _by_sign(row: np.ndarray) -> Dict[int, int]:
+    return {sign + 1: int(v) for sign, v in enumerate(row)}
+
+
+def calculate_full_ashtakavarga(planets: List[dict], ascendant: Optional[float]) -> Dict[str, dict]:
+    """Return classical BAV, SAV and Sodhya (reduced) BAV for a chart.
+
+    ``planets`` need ``name`` and either an integer ``sign`` or a sidereal
+    ``longitude`` for the Sun through Saturn; ``ascendant`` is the sidereal
+    lagna longitude. ``bav``/``total_points`` keep the shape of
+    :func:`calculate_ashtakavarga` (planet -> sign -> bindus).
+    """
+    result = batch_ashtakavarga(contributor_signs(planets, ascendant)[None, :])
+    return {
+        "bav": {p: _by_sign(result["bav"][0, i]) for i, p in enumerate(BAV_PLANETS)},
+        "total_points": _by_sign(result["sav"][0]),
+        "sodhya": {p: _by_sign(result["sodhya"][0, i]) for i, p in enumerate(BAV_PLANETS)},
+        "sodhya_pinda": {p: int(result["sodhya_pinda"][0, i]) for i, p in enumerate(BAV_PLANETS)},
+    }
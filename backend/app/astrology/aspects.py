@@ -3,9 +3,179 @@
 Vedic aspects (Graha Drishti) are different from Western aspects.
 All planets aspect the 7th house from their position (100% strength).
 Mars, Jupiter, and Saturn have special aspects.
+
+Aspects come from a precomputed 9 x 12 table of strengths (in virupas,
+60 = full) by planet and house counted from it. :func:`build_aspect_matrix`
+turns a chart into planet x house and planet x planet matrices once, and
+the graha drishti list, house analysis, yogas and Shadbala all read them.
 """
 
-def calculate_vedic_aspects(planets, houses):
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+GRAHAS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+_ROW = {name: i for i, name in enumerate(GRAHAS)}
+
+FULL_ASPECT = 60
+
+# Houses counted from the planet (1 = its own) and virupas cast there.
+SPECIAL_ASPECTS = {
+    "Mars": {4: 45, 8: 60},       # 4th aspect at 3/4 strength
+    "Jupiter": {5: 60, 9: 60},
+    "Saturn": {3: 60, 10: 60},
+    # Some traditions give special aspects to nodes
+    "Rahu": {5: 60, 9: 60},
+    "Ketu": {5: 60, 9: 60},
+}
+
+ASPECT_TABLE = np.zeros((len(GRAHAS), 12))
+ASPECT_TABLE[:, 6] = FULL_ASPECT
+for _name, _specials in SPECIAL_ASPECTS.items():
+    for _house, _virupas in _specials.items():
+        ASPECT_TABLE[_ROW[_name], _house - 1] = _virupas
+
+_ASPECT_TYPES = {
+    ("Mars", 4): "4th aspect (special)",
+    ("Mars", 8): "8th aspect (special)",
+    ("Jupiter", 5): "5th aspect (trine)",
+    ("Jupiter", 9): "9th aspect (trine)",
+    ("Saturn", 3): "3rd aspect (special)",
+    ("Saturn", 10): "10th aspect (special)",
+    ("Rahu", 5): "5th aspect (nodal)",
+    ("Rahu", 9): "9th aspect (nodal)",
+    ("Ketu", 5): "5th aspect (nodal)",
+    ("Ketu", 9): "9th aspect (nodal)",
+}
+
+# Sphuta drishti (virupas) as a piecewise linear function of the angle
+# from the aspecting to the aspected point.
+_DRISHTI_ANGLES = [0, 30, 60, 90, 120, 150, 180, 300, 360]
+_DRISHTI_VIRUPAS = [0, 0, 15, 45, 30, 0, 60, 0, 0]
+# Arcs over which Mars, Jupiter and Saturn cast a full special aspect.
+SPECIAL_DRISHTI = {
+    "Mars": [(90, 120), (210, 240)],
+    "Jupiter": [(120, 150), (240, 270)],
+    "Saturn": [(60, 90), (270, 300)],
+}
+
+
+def drishti_virupas(angle, aspecting=None):
+    """Aspect strength in virupas (0-60) cast across ``angle`` degrees."""
+    angle = np.asarray(angle, dtype=float) % 360
+    virupas = np.interp(angle, _DRISHTI_ANGLES, _DRISHTI_VIRUPAS)
+    for low, high in SPECIAL_DRISHTI.get(aspecting, ()):
+        virupas = np.where((angle >= low) & (angle <= high), FULL_ASPECT, virupas)
+    return virupas
+
+
+def _occupants(house):
+    """Occupants of a house given as a list or as an ``analyze_houses`` entry."""
+    return house.get("occupants", []) if isinstance(house, dict) else house
+
+
+def planet_houses(houses) -> dict:
+    """Map planet name to house number from a houses structure.
+
+    Accepts ``analyze_houses`` output (``placements``) or a plain
+    ``{"houses": {house: [occupants]}}`` mapping.
+    """
+    if houses.get("placements"):
+        return {name: info["house"] for name, info in houses["placements"].items()}
+    placed = {}
+    for house_num, house in houses.get("houses", {}).items():
+        for occupant in _occupants(house):
+            placed.setdefault(occupant, int(house_num))
+    return placed
+
+
+@dataclass(frozen=True)
+class AspectMatrix:
+    """Aspect strengths (virupas) of one chart; rows aspect columns."""
+
+    planets: tuple
+    houses: np.ndarray      # (n,) house occupied by each planet
+    to_house: np.ndarray    # (n, 12) strength cast on houses 1-12
+    to_planet: np.ndarray   # (n, n) strength cast on each planet
+    virupa: bool = False
+
+    def index(self, name: str) -> Optional[int]:
+        try:
+            return self.planets.index(name)
+        except ValueError:
+            return None
+
+    def aspects(self, source: str, target: str) -> bool:
+        """Whether ``source`` casts any aspect on ``target``'s house."""
+        i, j = self.index(source), self.index(target)
+        if i is None or j is None:
+            return False
+        return bool(self.to_house[i, self.houses[j] - 1] > 0)
+
+    def submatrix(self, names) -> np.ndarray:
+        """Planet x planet strengths restricted to ``names`` (0 when absent)."""
+        idx = [self.index(n) for n in names]
+        out = np.zeros((len(names), len(names)))
+        present = [k for k, i in enumerate(idx) if i is not None]
+        rows = [idx[k] for k in present]
+        out[np.ix_(present, present)] = self.to_planet[np.ix_(rows, rows)]
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "planets": list(self.planets),
+            "unit": "virupa",
+            "degree_based": self.virupa,
+            "planet_to_house": self.to_house.tolist(),
+            "planet_to_planet": self.to_planet.tolist(),
+        }
+
+
+def _longitude(planet):
+    if "longitude" in planet:
+        return planet["longitude"]
+    return (planet["sign"] - 1) * 30 + planet.get("degree", 0)
+
+
+def sphuta_drishti(planets) -> np.ndarray:
+    """Degree-based aspect strengths (virupas) between ``planets``; rows aspect columns.
+
+    Only longitudes are used, so planets need no house.
+    """
+    lons = np.array([_longitude(p) for p in planets], dtype=float)
+    angles = lons[None, :] - lons[:, None]
+    to_planet = np.array([drishti_virupas(angles[i], p["name"]) for i, p in enumerate(planets)])
+    to_planet = to_planet.reshape(len(planets), len(planets))
+    np.fill_diagonal(to_planet, 0)
+    return to_planet
+
+
+def build_aspect_matrix(planets, houses, *, virupa: bool = False) -> AspectMatrix:
+    """Compute the aspect matrices of a chart.
+
+    Planet x house strengths always follow the house table. Planet x
+    planet strengths do too unless ``virupa`` is set, in which case they
+    are degree-based sphuta drishti. Planets without a house are left out.
+    """
+    placed = planet_houses(houses)
+    chart = [p for p in planets if p["name"] in _ROW and p["name"] in placed]
+    names = tuple(p["name"] for p in chart)
+    rows = np.array([_ROW[n] for n in names], dtype=int)
+    occupied = np.array([placed[n] for n in names], dtype=int)
+
+    offsets = (np.arange(12)[None, :] - (occupied[:, None] - 1)) % 12
+    to_house = ASPECT_TABLE[rows[:, None], offsets]
+    if virupa:
+        to_planet = sphuta_drishti(chart)
+    else:
+        to_planet = to_house[:, occupied - 1]
+    to_planet = to_planet.copy()
+    np.fill_diagonal(to_planet, 0)
+    return AspectMatrix(names, occupied, to_house, to_planet, virupa)
+
+
+def calculate_vedic_aspects(planets, houses, matrix: Optional[AspectMatrix] = None):
     """
     Calculate Vedic planetary aspects (Graha Drishti).
     
@@ -18,107 +188,30 @@ def calculate_vedic_aspects(planets, houses):
     - Saturn: 3rd and 10th aspects (in addition to 7th)
     
     Rahu/Ketu: 5th, 7th, and 9th aspects (some traditions)
+
+    Pass a ``matrix`` from :func:`build_aspect_matrix` to reuse it.
     """
-    
+    if matrix is None:
+        matrix = build_aspect_matrix(planets, houses)
+    signs = {p["name"]: p.get("sign") for p in planets}
+
     aspects = []
-    
-    for planet in planets:
-        planet_name = planet['name']
-        planet_sign = planet['sign']
-        planet_house = None
-        
-        # Find which house the planet occupies
-        for house_num, occupants in houses['houses'].items():
-            if planet_name in occupants:
-                planet_house = house_num
-                break
-        
-        if not planet_house:
-            continue
-        
+    for i, planet_name in enumerate(matrix.planets):
+        planet_house = int(matrix.houses[i])
         aspected_houses = []
-        
-        # All planets aspect 7th house/sign
-        seventh_house = ((planet_house + 6) % 12) or 12
-        aspected_houses.append({
-            'house': seventh_house,
-            'strength': 100,  # Full strength
-            'type': '7th aspect (opposition)'
-        })
-        
-        # Special aspects
-        if planet_name == 'Mars':
-            # 4th aspect
-            fourth_house = ((planet_house + 3) % 12) or 12
-            aspected_houses.append({
-                'house': fourth_house,
-                'strength': 75,  # 3/4 strength
-                'type': '4th aspect (special)'
-            })
-            # 8th aspect
-            eighth_house = ((planet_house + 7) % 12) or 12
-            aspected_houses.append({
-                'house': eighth_house,
-                'strength': 100,  # Full strength
-                'type': '8th aspect (special)'
-            })
-            
-        elif planet_name == 'Jupiter':
-            # 5th aspect
-            fifth_house = ((planet_house + 4) % 12) or 12
-            aspected_houses.append({
-                'house': fifth_house,
-                'strength': 100,  # Full strength
-                'type': '5th aspect (trine)'
-            })
-            # 9th aspect
-            ninth_house = ((planet_house + 8) % 12) or 12
-            aspected_houses.append({
-                'house': ninth_house,
-                'strength': 100,  # Full strength
-                'type': '9th aspect (trine)'
-            })
-            
-        elif planet_name == 'Saturn':
-            # 3rd aspect
-            third_house = ((planet_house + 2) % 12) or 12
-            aspected_houses.append({
-                'house': third_house,
-                'strength': 100,  # Full strength
-                'type': '3rd aspect (special)'
-            })
-            # 10th aspect
-            tenth_house = ((planet_house + 9) % 12) or 12
-            aspected_houses.append({
-                'house': tenth_house,
-                'strength': 100,  # Full strength
-                'type': '10th aspect (special)'
-            })
-            
-        elif planet_name in ['Rahu', 'Ketu']:
-            # Some traditions give special aspects to nodes
-            # 5th aspect
-            fifth_house = ((planet_house + 4) % 12) or 12
+        for offset in np.flatnonzero(ASPECT_TABLE[_ROW[planet_name]]):
+            count = int(offset) + 1
             aspected_houses.append({
-                'house': fifth_house,
-                'strength': 100,
-                'type': '5th aspect (nodal)'
+                "house": (planet_house + count - 2) % 12 + 1,
+                "strength": round(ASPECT_TABLE[_ROW[planet_name], offset] * 100 / FULL_ASPECT),
+                "type": _ASPECT_TYPES.get((planet_name, count), "7th aspect (opposition)"),
             })
-            # 9th aspect
-            ninth_house = ((planet_house + 8) % 12) or 12
-            aspected_houses.append({
-                'house': ninth_house,
-                'strength': 100,
-                'type': '9th aspect (nodal)'
-            })
-        
         aspects.append({
-            'planet': planet_name,
-            'from_house': planet_house,
-            'from_sign': planet_sign,
-            'aspects_to': aspected_houses
+            "planet": planet_name,
+            "from_house": planet_house,
+            "from_sign": signs.get(planet_name),
+            "aspects_to": aspected_houses,
         })
-    
     return aspects
 
 def calculate_sign_aspects(planets):
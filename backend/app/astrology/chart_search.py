@@ -0,0 +1,153 @@
+"""Inverse chart search: when do the grahas and lagna satisfy a set of conditions.
+
+A condition such as "Jupiter in Cancer" is the set of intervals read from
+the ingress table of :mod:`.event_table`; "Lagna Leo" comes from the
+cached rising-time tables of :mod:`.lagna`. The sets are intersected with
+:mod:`.intervals`. Graha conditions are applied first, so the ascendant
+is only solved on the days they leave open -- a multi-year search costs a
+few table lookups rather than a ``calculate_planets`` call per sample.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from .constants import NAKSHATRA_METADATA, RASHI_METADATA
+from .event_table import event_table_for
+from .events import GRAHAS
+from .intervals import intersect, labelled_spans, normalize, select, subtract, union
+from .lagna import lagna_boundaries
+
+LAGNA = "Lagna"
+BODIES = (*GRAHAS, LAGNA)
+
+# Lagna conditions are solved this many days at a time, so a search that
+# stops at a result limit only solves the ascendant as far as it needs.
+CHUNK_DAYS = 30
+
+
+def sign_number(value: int | str) -> int:
+    """Return the sign (1-12) for a number or a name such as ``"Leo"``."""
+    return _lookup(value, RASHI_METADATA, "sign")
+
+
+def nakshatra_number(value: int | str) -> int:
+    """Return the nakshatra (1-27) for a number or a name."""
+    return _lookup(value, NAKSHATRA_METADATA, "nakshatra")
+
+
+def _lookup(value: int | str, metadata: list[dict], kind: str) -> int:
+    if isinstance(value, int):
+        if 1 <= value <= len(metadata):
+            return value
+        raise ValueError(f"{kind} must be between 1 and {len(metadata)}")
+    wanted = value.strip().lower()
+    for number, meta in enumerate(metadata, start=1):
+        if meta["name"].lower() == wanted:
+            return number
+    raise ValueError(f"Unknown {kind} '{value}'")
+
+
+@dataclass(frozen=True)
+class ChartCondition:
+    """``body`` (a graha or ``"Lagna"``) in a sign (1-12) and/or nakshatra (1-27).
+
+    ``retrograde`` additionally constrains a graha's motion.
+    """
+
+    body: str
+    sign: Optional[int] = None
+    nakshatra: Optional[int] = None
+    retrograde: Optional[bool] = None
+
+    def __post_init__(self):
+        if self.body not in BODIES:
+            raise ValueError(f"Unknown body '{self.body}'")
+        if self.body == LAGNA and self.retrograde is not None:
+            raise ValueError("The lagna has no retrograde motion")
+        if self.sign is None and self.nakshatra is None and self.retrograde is None:
+            raise ValueError(f"Condition on {self.body} needs a sign, nakshatra or retrograde flag")
+
+
+def _graha_intervals(table, condition: ChartCondition, start_jd: float, end_jd: float) -> np.ndarray:
+    windows = normalize([(start_jd, end_jd)])
+    for kind, wanted in (("sign_ingress", condition.sign),
+                         ("nakshatra_ingress", None if condition.nakshatra is None
+                          else condition.nakshatra - 1)):
+        if wanted is not None:
+            starts, ends, values = table.intervals(condition.body, start_jd, end_jd, kind)
+            inside = values == wanted
+            windows = intersect(windows, np.column_stack([starts[inside], ends[inside]]))
+    if condition.retrograde is not None:
+        retrograde = np.column_stack(table.retrograde_intervals(condition.body, start_jd, end_jd))
+        windows = (intersect if condition.retrograde else subtract)(windows, retrograde)
+    return windows
+
+
+def _lagna_intervals(condition: ChartCondition, windows: np.ndarray, latitude: float,
+                     longitude: float, ayanamsa: str) -> np.ndarray:
+    for division, wanted in (("sign", condition.sign), ("nakshatra", condition.nakshatra)):
+        if wanted is None or len(windows) == 0:
+            continue
+        pieces = []
+        for start, end in windows:
+            ends, indices = lagna_boundaries(start, end, latitude, longitude,
+                                             division=division, ayanamsa=ayanamsa)
+            edges, labels = labelled_spans(start, end, ends, indices)
+            pieces.append(select(edges, labels + 1, [wanted]))
+        windows = union(*pieces)
+    return windows
+
+
+def iter_chart_search(conditions: Iterable[ChartCondition], start_jd: float, end_jd: float,
+                      latitude: float, longitude: float, *, ayanamsa: str = "lahiri",
+                      node_type: str = "mean") -> Iterator[tuple[float, float]]:
+    """Yield ``(start, end)`` Julian days where every condition holds, in time order.
+
+    Graha conditions are intersected up front; lagna conditions are then
+    solved lazily, :data:`CHUNK_DAYS` at a time.
+    """
+    conditions = list(conditions)
+    table = event_table_for(start_jd, end_jd, ayanamsa=ayanamsa, node_type=node_type)
+    windows = normalize([(start_jd, end_jd)])
+    for condition in conditions:
+        if condition.body != LAGNA:
+            windows = intersect(windows, _graha_intervals(table, condition, start_jd, end_jd))
+    lagna = [c for c in conditions if c.body == LAGNA]
+    if not lagna:
+        for start, end in windows:
+            yield float(start), float(end)
+        return
+
+    pending = None
+    for start, end in windows:
+        for chunk in np.arange(start, end, CHUNK_DAYS):
+            pieces = normalize([(chunk, min(chunk + CHUNK_DAYS, end))])
+            for condition in lagna:
+                pieces = _lagna_intervals(condition, pieces, latitude, longitude, ayanamsa)
+            for a, b in pieces:
+                # A match running over a chunk edge is joined up before it is yielded.
+                if pending is not None and a <= pending[1]:
+                    pending = (pending[0], float(b))
+                    continue
+                if pending is not None:
+                    yield pending
+                pending = (float(a), float(b))
+    if pending is not None:
+        yield pending
+
+
+def search_chart(conditions: Iterable[ChartCondition], start_jd: float, end_jd: float,
+                 latitude: float, longitude: float, *, ayanamsa: str = "lahiri",
+                 node_type: str = "mean", limit: Optional[int] = None) -> np.ndarray:
+    """Return the ``(n, 2)`` Julian day intervals where every condition holds.
+
+    With ``limit`` only the first ``limit`` intervals are searched for.
+    """
+    matches = iter_chart_search(conditions, start_jd, end_jd, latitude, longitude,
+                                ayanamsa=ayanamsa, node_type=node_type)
+    return np.array(list(islice(matches, limit)), dtype=np.float64).reshape(-1, 2)
@@ -86,14 +86,17 @@ def get_d_chart_details(chart_key, placements):
     
     return report
 
-def augment_divisional_charts(d_charts_raw):
+def augment_divisional_charts(d_charts_raw, charts=None):
     """
     Take the raw d_charts dictionary ( { "D1": {"Sun": 1...} } )
     and return a rich dictionary with full reports.
+
+    ``charts`` optionally limits the report to a subset of chart keys.
     """
     rich_charts = {}
-    for key, placements in d_charts_raw.items():
-        details = get_d_chart_details(key, placements)
+    keys = d_charts_raw.keys() if charts is None else [k for k in charts if k in d_charts_raw]
+    for key in keys:
+        details = get_d_chart_details(key, d_charts_raw[key])
         if details:
             rich_charts[key] = details
     return rich_charts
@@ -1,5 +1,19 @@
+"""Dasha (planetary period) systems.
+
+Every system is described by a period table -- the sequence of lords and
+their years -- and compiled once into cumulative-offset arrays. A
+:class:`DashaTimeline` keeps only the top-level periods and derives
+sub-periods from those arrays on demand, so finding the period running at
+any instant is one bisect per level. All arithmetic is in Julian days.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Optional
+from itertools import accumulate
+from typing import Iterator, List, Dict, Optional, Sequence, Tuple
+
+from .constants import RASHI_METADATA
 
 
 DASHA_YEARS = {
@@ -26,52 +40,473 @@ ORDER = [
     "Mercury",
 ]
 
+# Yogini dasha: eight yoginis of 1..8 years (36-year cycle).
+YOGINI_YEARS = {
+    "Mangala": 1,
+    "Pingala": 2,
+    "Dhanya": 3,
+    "Bhramari": 4,
+    "Bhadrika": 5,
+    "Ulka": 6,
+    "Siddha": 7,
+    "Sankata": 8,
+}
+YOGINI_PLANETS = {
+    "Mangala": "Moon",
+    "Pingala": "Sun",
+    "Dhanya": "Jupiter",
+    "Bhramari": "Mars",
+    "Bhadrika": "Mercury",
+    "Ulka": "Saturn",
+    "Siddha": "Venus",
+    "Sankata": "Rahu",
+}
 
-def _build_sub_periods(lord: str, start_dt: datetime, duration: float, depth: int) -> List[Dict]:
-    """Recursively build sub-periods for a given dasha lord."""
-
-    if depth == 0:
-        return []
-
-    ratio = {k: v / 120 for k, v in DASHA_YEARS.items()}
-    idx = ORDER.index(lord)
-    result = []
-    current = start_dt
-    for i in range(len(ORDER)):
-        sub_lord = ORDER[(idx + i) % len(ORDER)]
-        sub_duration = duration * ratio[sub_lord]
-        end = current + timedelta(days=sub_duration)
-        entry = {
-            "lord": sub_lord,
-            "start": current,
-            "end": end,
-        }
-        if depth > 1:
-            entry["sub"] = _build_sub_periods(sub_lord, current, sub_duration, depth - 1)
-        result.append(entry)
-        current = end
-    return result
+# Ashtottari dasha: 108-year cycle without Ketu.
+ASHTOTTARI_YEARS = {
+    "Sun": 6,
+    "Moon": 15,
+    "Mars": 8,
+    "Mercury": 17,
+    "Saturn": 10,
+    "Jupiter": 19,
+    "Rahu": 12,
+    "Venus": 21,
+}
+# Nakshatras ruled by each Ashtottari lord, counted from Ardra.
+ASHTOTTARI_NAKSHATRAS = (4, 3, 4, 3, 3, 3, 4, 3)
+
+SIGN_NAMES = tuple(r["name"] for r in RASHI_METADATA)
+
+LEVEL_NAMES = ["maha", "antar", "pratyantar", "sookshma", "prana"]
+MAX_DEPTH = len(LEVEL_NAMES)
+
+DAYS_PER_YEAR = 365.25
+UNIX_EPOCH_JD = 2440587.5
+NAKSHATRA_SPAN = 360 / 27
+# Cycles are repeated until at least this many years are covered.
+LIFESPAN_YEARS = 120
+
+
+def jd_to_datetime(jd: float) -> datetime:
+    """Convert a Julian day (UT) to a naive UTC ``datetime``."""
+    return datetime(1970, 1, 1) + timedelta(days=jd - UNIX_EPOCH_JD)
+
+
+def datetime_to_jd(value: date) -> float:
+    """Convert a naive UTC ``datetime`` (or ``date``) to a Julian day."""
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    return UNIX_EPOCH_JD + (value - datetime(1970, 1, 1)) / timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class DashaSystem:
+    """A period table compiled for lookups.
+
+    ``sub_lords[i]`` is the order of sub-periods inside a period ruled by
+    lord ``i`` and ``offsets[i]`` the cumulative share of the parent span
+    at which each of them starts (with a trailing 1.0).
+    """
+
+    name: str
+    lords: Tuple[str, ...]
+    years: Tuple[float, ...]
+    sub_lords: Tuple[Tuple[int, ...], ...]
+    offsets: Tuple[Tuple[float, ...], ...]
+
+    @property
+    def cycle_years(self) -> float:
+        return sum(self.years)
+
+
+def compile_system(
+    name: str,
+    lords: Sequence[str],
+    years: Sequence[float],
+    *,
+    step: int = 1,
+    antar_from_next: bool = False,
+    equal_shares: bool = False,
+) -> DashaSystem:
+    """Compile a period table into a :class:`DashaSystem`.
+
+    Sub-periods run through the lords in ``step`` direction starting with
+    the parent's own lord (or the one after it when ``antar_from_next``),
+    each taking ``years / cycle`` of the parent, or an equal share.
+    """
+    n = len(lords)
+    total = sum(years)
+    sub_lords = []
+    offsets = []
+    for i in range(n):
+        first = i + step if antar_from_next else i
+        seq = tuple((first + step * k) % n for k in range(n))
+        shares = [1 / n] * n if equal_shares else [years[j] / total for j in seq]
+        sub_lords.append(seq)
+        offsets.append((0.0, *accumulate(shares[:-1]), 1.0))
+    return DashaSystem(name, tuple(lords), tuple(years), tuple(sub_lords), tuple(offsets))
 
 
-def _filter_periods(periods: List[Dict], start_dt: datetime) -> List[Dict]:
-    """Trim periods so the sequence begins at ``start_dt``."""
+VIMSHOTTARI = compile_system("vimshottari", ORDER, [DASHA_YEARS[l] for l in ORDER])
+YOGINI = compile_system("yogini", list(YOGINI_YEARS), list(YOGINI_YEARS.values()))
+ASHTOTTARI = compile_system("ashtottari", list(ASHTOTTARI_YEARS), list(ASHTOTTARI_YEARS.values()))
+# Chara dasha years depend on the chart; only the sub-period layout
+# (equal twelfths starting from the next sign) is fixed per direction.
+CHARA_DIRECT = compile_system("chara", SIGN_NAMES, [12] * 12, antar_from_next=True, equal_shares=True)
+CHARA_REVERSE = compile_system(
+    "chara", SIGN_NAMES, [12] * 12, step=-1, antar_from_next=True, equal_shares=True
+)
 
-    result = []
-    for p in periods:
-        if p["end"] <= start_dt:
-            continue
 
-        entry = {
-            "lord": p["lord"],
-            "start": max(p["start"], start_dt),
-            "end": p["end"],
+@dataclass(frozen=True)
+class DashaPeriod:
+    """One node of the dasha tree.
+
+    ``path`` holds the child index taken at every level from the
+    mahadasha down, which makes it a stable cursor for pagination.
+    """
+
+    lord: str
+    lord_index: int
+    start_jd: float
+    end_jd: float
+    path: Tuple[int, ...]
+
+    @property
+    def level(self) -> int:
+        return len(self.path)
+
+    @property
+    def level_name(self) -> str:
+        return LEVEL_NAMES[self.level - 1]
+
+    @property
+    def start(self) -> datetime:
+        return jd_to_datetime(self.start_jd)
+
+    @property
+    def end(self) -> datetime:
+        return jd_to_datetime(self.end_jd)
+
+    def contains(self, jd: float) -> bool:
+        return self.start_jd <= jd < self.end_jd
+
+    def to_dict(self) -> Dict:
+        return {
+            "lord": self.lord,
+            "level": self.level_name,
+            "start": self.start,
+            "end": self.end,
+            "path": format_cursor(self.path),
         }
-        if "sub" in p:
-            sub = _filter_periods(p["sub"], start_dt)
-            if sub:
-                entry["sub"] = sub
-        result.append(entry)
-    return result
+
+
+def format_cursor(path: Tuple[int, ...]) -> str:
+    return ".".join(str(i) for i in path)
+
+
+def parse_cursor(cursor: Optional[str]) -> Tuple[int, ...]:
+    """Parse a ``"3.0.5"`` style cursor; raises ``ValueError`` when malformed."""
+    if not cursor:
+        return ()
+    path = tuple(int(part) for part in cursor.split("."))
+    if len(path) > MAX_DEPTH or any(i < 0 for i in path):
+        raise ValueError(f"Invalid dasha cursor: {cursor}")
+    return path
+
+
+class DashaTimeline:
+    """Lazily evaluated dasha tree for one chart and one system.
+
+    Only the top-level periods are materialised; sub-periods are derived
+    on demand from the parent's span, so point lookups cost O(depth) and
+    a subtree is only expanded when it is iterated. Every system starts
+    at birth (see :data:`DASHA_CONVENTION`).
+    """
+
+    def __init__(self, system: DashaSystem, birth_jd: float, mahas: Sequence[Tuple[int, float]]):
+        self.system = system
+        self.birth_jd = birth_jd
+        self._mahadashas = []
+        start = birth_jd
+        for lord_index, days in mahas:
+            if days <= 0:
+                continue
+            path = (len(self._mahadashas),)
+            self._mahadashas.append(
+                DashaPeriod(system.lords[lord_index], lord_index, start, start + days, path)
+            )
+            start += days
+        self._maha_starts = [p.start_jd for p in self._mahadashas]
+
+    @property
+    def end_jd(self) -> float:
+        return self._mahadashas[-1].end_jd
+
+    def mahadashas(self) -> List[DashaPeriod]:
+        return list(self._mahadashas)
+
+    def children(self, period: DashaPeriod) -> List[DashaPeriod]:
+        """Expand ``period`` into its sub-periods."""
+        if period.level >= MAX_DEPTH:
+            return []
+        return [self._child(period, k) for k in range(len(self.system.lords))]
+
+    def _child(self, period: DashaPeriod, k: int) -> DashaPeriod:
+        span = period.end_jd - period.start_jd
+        offsets = self.system.offsets[period.lord_index]
+        lord_index = self.system.sub_lords[period.lord_index][k]
+        return DashaPeriod(
+            self.system.lords[lord_index],
+            lord_index,
+            period.start_jd + span * offsets[k],
+            period.start_jd + span * offsets[k + 1],
+            period.path + (k,),
+        )
+
+    def period_at(self, path: Tuple[int, ...]) -> DashaPeriod:
+        """Return the period addressed by ``path`` without expanding siblings."""
+        if not path or path[0] >= len(self._mahadashas) or any(
+            k >= len(self.system.lords) for k in path[1:]
+        ):
+            raise ValueError(f"Invalid dasha path: {format_cursor(path)}")
+        period = self._mahadashas[path[0]]
+        for k in path[1:]:
+            period = self._child(period, k)
+        return period
+
+    def active_at(self, jd: float, depth: int = MAX_DEPTH) -> List[DashaPeriod]:
+        """Return the chain of periods (maha first) running at ``jd``.
+
+        Returns an empty list when ``jd`` lies before birth or after the
+        last computed period.
+        """
+        if not self.birth_jd <= jd < self.end_jd:
+            return []
+        period = self._mahadashas[bisect_right(self._maha_starts, jd) - 1]
+        chain = [period]
+        last = len(self.system.lords) - 1
+        for _ in range(min(depth, MAX_DEPTH) - 1):
+            offsets = self.system.offsets[period.lord_index]
+            k = bisect_right(offsets, (jd - period.start_jd) / (period.end_jd - period.start_jd)) - 1
+            period = self._child(period, min(max(k, 0), last))
+            chain.append(period)
+        return chain
+
+    def iter_periods(self, depth: int = 1, after: Tuple[int, ...] = ()) -> Iterator[DashaPeriod]:
+        """Yield periods down to ``depth`` in chronological pre-order.
+
+        Periods that ended before birth are skipped. ``after`` is the path
+        of the last period already seen; iteration resumes immediately
+        after it without expanding earlier subtrees.
+        """
+        if after:
+            self.period_at(after)
+        return self._iter(None, min(depth, MAX_DEPTH), after)
+
+    def _iter(self, parent: Optional[DashaPeriod], depth: int, after: Tuple[int, ...]):
+        kids = self._mahadashas if parent is None else self.children(parent)
+        first = after[0] if after else 0
+        for k in range(first, len(kids)):
+            node = kids[k]
+            if node.end_jd <= self.birth_jd:
+                continue
+            if after and k == first:
+                # On the cursor's branch: the node itself was already emitted.
+                rest = after[1:]
+            else:
+                rest = ()
+                yield node
+            if node.level < depth:
+                yield from self._iter(node, depth, rest)
+
+
+def _nakshatra_position(moon_longitude: float) -> Tuple[int, float]:
+    """Return the Moon's nakshatra index and the fraction of it traversed."""
+    lon = moon_longitude % 360
+    return int(lon // NAKSHATRA_SPAN) % 27, (lon % NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+
+
+def _cycle(system: DashaSystem, start_index: int, years: Optional[Sequence[float]] = None):
+    """Yield ``(lord_index, days)`` from ``start_index`` until a lifespan is covered."""
+    years = system.years if years is None else years
+    n = len(system.lords)
+    covered = 0.0
+    i = 0
+    while covered < LIFESPAN_YEARS:
+        lord_index = (start_index + i) % n
+        yield lord_index, years[lord_index] * DAYS_PER_YEAR
+        covered += years[lord_index]
+        i += 1
+
+
+# How every system treats the dasha running at birth; reported by /api/dasha.
+DASHA_CONVENTION = (
+    "The first mahadasha starts at birth. In the nakshatra systems it lasts "
+    "only its unelapsed balance and its sub-periods are spread proportionally "
+    "over that balance; Chara dasha starts its first sign in full."
+)
+
+
+def _with_balance(mahas: List[Tuple[int, float]], elapsed: float) -> List[Tuple[int, float]]:
+    """Shorten the first mahadasha to the part left after ``elapsed`` (0-1) of it."""
+    mahas[0] = (mahas[0][0], mahas[0][1] * (1 - elapsed))
+    return mahas
+
+
+class VimshottariDasha(DashaTimeline):
+    """Vimshottari dasha from the Moon's nakshatra.
+
+    The unelapsed balance of the birth mahadasha starts at birth and its
+    sub-periods are spread proportionally over that balance.
+    """
+
+    def __init__(self, moon_longitude: float, birth_jd: float):
+        nak, frac = _nakshatra_position(moon_longitude)
+        self.start_index = nak % len(ORDER)
+        mahas = _with_balance(list(_cycle(VIMSHOTTARI, self.start_index)), frac)
+        super().__init__(VIMSHOTTARI, birth_jd, mahas)
+
+    @classmethod
+    def from_chart(cls, binfo: Dict, planets: List[Dict]) -> "VimshottariDasha":
+        moon = next(p for p in planets if p["name"] == "Moon")
+        return cls(moon["longitude"], binfo["jd_ut"])
+
+
+class YoginiDasha(DashaTimeline):
+    """Yogini dasha: (nakshatra number + 3) mod 8 selects the first yogini."""
+
+    def __init__(self, moon_longitude: float, birth_jd: float):
+        nak, frac = _nakshatra_position(moon_longitude)
+        start_index = (nak + 3) % len(YOGINI_YEARS)
+        super().__init__(YOGINI, birth_jd, _with_balance(list(_cycle(YOGINI, start_index)), frac))
+
+    @classmethod
+    def from_chart(cls, binfo: Dict, planets: List[Dict]) -> "YoginiDasha":
+        moon = next(p for p in planets if p["name"] == "Moon")
+        return cls(moon["longitude"], binfo["jd_ut"])
+
+
+class AshtottariDasha(DashaTimeline):
+    """Ashtottari dasha: each lord rules a group of nakshatras from Ardra."""
+
+    def __init__(self, moon_longitude: float, birth_jd: float):
+        nak, frac = _nakshatra_position(moon_longitude)
+        pos = (nak - 5) % 27
+        for start_index, size in enumerate(ASHTOTTARI_NAKSHATRAS):
+            if pos < size:
+                break
+            pos -= size
+        mahas = _with_balance(list(_cycle(ASHTOTTARI, start_index)), (pos + frac) / size)
+        super().__init__(ASHTOTTARI, birth_jd, mahas)
+
+    @classmethod
+    def from_chart(cls, binfo: Dict, planets: List[Dict]) -> "AshtottariDasha":
+        moon = next(p for p in planets if p["name"] == "Moon")
+        return cls(moon["longitude"], binfo["jd_ut"])
+
+
+# Signs whose dasha years are counted forward to the lord (savya group).
+_CHARA_FORWARD_SIGNS = {1, 2, 3, 7, 8, 9}
+_SIGN_LORDS = {
+    1: ("Mars",), 2: ("Venus",), 3: ("Mercury",), 4: ("Moon",), 5: ("Sun",),
+    6: ("Mercury",), 7: ("Venus",), 8: ("Mars", "Ketu"), 9: ("Jupiter",),
+    10: ("Saturn",), 11: ("Saturn", "Rahu"), 12: ("Jupiter",),
+}
+_EXALTATION_SIGNS = {
+    "Sun": 1, "Moon": 2, "Mars": 10, "Mercury": 6, "Jupiter": 4, "Venus": 12, "Saturn": 7,
+}
+
+
+def _sign_of(planet: Dict) -> int:
+    return int(planet["longitude"] % 360 // 30) + 1
+
+
+def _chara_lord(sign: int, positions: Dict[str, Dict]) -> Optional[str]:
+    """Pick the stronger lord of ``sign`` (Scorpio and Aquarius have two)."""
+    lords = [l for l in _SIGN_LORDS[sign] if l in positions]
+    if len(lords) < 2:
+        return lords[0] if lords else None
+    outside = [l for l in lords if _sign_of(positions[l]) != sign]
+    if len(outside) == 1:
+        return outside[0]
+    if not outside:
+        return None
+
+    def strength(lord):
+        lord_sign = _sign_of(positions[lord])
+        company = sum(1 for p in positions.values() if _sign_of(p) == lord_sign)
+        return company, positions[lord]["longitude"] % 30
+
+    return max(lords, key=strength)
+
+
+def chara_dasha_years(sign: int, planets: List[Dict]) -> int:
+    """Return the Chara dasha years of ``sign`` (1-12) for a chart.
+
+    Counted from the sign to its lord (forward for the savya group,
+    backward otherwise) less one, with 12 years for a lord in its own
+    sign, plus one year for an exalted and minus one for a debilitated lord.
+    """
+    positions = {p["name"]: p for p in planets}
+    lord = _chara_lord(sign, positions)
+    if lord is None:
+        return 12
+    lord_sign = _sign_of(positions[lord])
+    if sign in _CHARA_FORWARD_SIGNS:
+        years = (lord_sign - sign) % 12
+    else:
+        years = (sign - lord_sign) % 12
+    if years == 0:
+        years = 12
+    exalt = _EXALTATION_SIGNS.get(lord)
+    if exalt == lord_sign:
+        years += 1
+    elif exalt is not None and (exalt + 5) % 12 + 1 == lord_sign:
+        years -= 1
+    return years
+
+
+class CharaDasha(DashaTimeline):
+    """Jaimini Chara (sign) dasha starting from the lagna sign.
+
+    The sequence runs forward when the ninth sign from lagna is in the
+    savya group and backward otherwise; the second cycle gives each sign
+    the complement of its first-cycle years.
+    """
+
+    def __init__(self, lagna_sign: int, planets: List[Dict], birth_jd: float):
+        ninth = (lagna_sign + 7) % 12 + 1
+        system = CHARA_DIRECT if ninth in _CHARA_FORWARD_SIGNS else CHARA_REVERSE
+        step = 1 if system is CHARA_DIRECT else -1
+        years = [chara_dasha_years(s, planets) for s in range(1, 13)]
+        order = [(lagna_sign - 1 + step * i) % 12 for i in range(12)]
+        mahas = [(i, years[i] * DAYS_PER_YEAR) for i in order]
+        mahas += [(i, (12 - years[i]) * DAYS_PER_YEAR) for i in order]
+        super().__init__(system, birth_jd, mahas)
+
+    @classmethod
+    def from_chart(cls, binfo: Dict, planets: List[Dict]) -> "CharaDasha":
+        lagna_sign = int(binfo["ascendant"] % 360 // 30) + 1
+        return cls(lagna_sign, planets, binfo["jd_ut"])
+
+
+DASHA_SYSTEMS = {
+    "vimshottari": VimshottariDasha,
+    "yogini": YoginiDasha,
+    "ashtottari": AshtottariDasha,
+    "chara": CharaDasha,
+}
+
+
+def build_dasha(system: str, binfo: Dict, planets: List[Dict]) -> DashaTimeline:
+    """Return the lazy dasha timeline of ``system`` for a chart."""
+    try:
+        cls = DASHA_SYSTEMS[system]
+    except KeyError:
+        raise ValueError(f"Unknown dasha system: {system}") from None
+    return cls.from_chart(binfo, planets)
 
 
 def calculate_vimshottari_dasha(
@@ -83,51 +518,24 @@ def calculate_vimshottari_dasha(
 ) -> List[Dict]:
     """Return Vimshottari dasha periods with optional depth and start date."""
 
-    moon = next(p for p in planets if p["name"] == "Moon")
-    lon = moon["longitude"]
-    frac = (lon % (360 / 27)) / (360 / 27)
-    start_index = int(lon // (360 / 27)) % len(ORDER)
-
-    birth_dt = datetime.fromtimestamp((binfo["jd_ut"] - 2440587.5) * 86400)
-    if start_date is None:
-        start_date = birth_dt
-    elif isinstance(start_date, date) and not isinstance(start_date, datetime):
-        start_date = datetime.combine(start_date, datetime.min.time())
-
-    sequence = []
-    current_start = birth_dt
-    for i in range(len(ORDER)):
-        lord = ORDER[(start_index + i) % len(ORDER)]
-        years = DASHA_YEARS[lord]
-        duration_days = years * 365.25
-        if i == 0:
-            duration_days *= 1 - frac
-        end = current_start + timedelta(days=duration_days)
-        entry = {
-            "lord": lord,
-            "start": current_start,
-            "end": end,
-        }
-        if depth > 1:
-            entry["sub"] = _build_sub_periods(lord, current_start, duration_days, depth - 1)
-        sequence.append(entry)
-        current_start = end
-
-    filtered = _filter_periods(sequence, start_date)
+    engine = VimshottariDasha.from_chart(binfo, planets)
+    start_jd = engine.birth_jd if start_date is None else datetime_to_jd(start_date)
 
-    def _format(period_list: List[Dict]) -> List[Dict]:
+    def _format(periods: List[DashaPeriod]) -> List[Dict]:
         formatted = []
-        for p in period_list:
+        for p in periods:
+            if p.end_jd <= start_jd:
+                continue
             item = {
-                "lord": p["lord"],
-                "start": p["start"].date(),
-                "end": p["end"].date(),
+                "lord": p.lord,
+                "start": jd_to_datetime(max(p.start_jd, start_jd)).date(),
+                "end": p.end.date(),
             }
-            if "sub" in p:
-                sub = _format(p["sub"])
+            if p.level < depth:
+                sub = _format(engine.children(p))
                 if sub:
                     item["sub"] = sub
             formatted.append(item)
         return formatted
 
-    return _format(filtered)
+    return _format(engine.mahadashas())
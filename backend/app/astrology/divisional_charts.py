@@ -2,8 +2,21 @@
 """
 Divisional chart calculations according to Brihat Parashara Hora Shastra (BPHS)
 Each divisional chart has specific calculation rules, not simple division.
+
+The per-varga functions below are the reference rules. At import they are
+compiled into ``VARGA_TABLE`` so charts for many planets are computed with
+a single NumPy lookup instead of 60 Python calls per planet.
 """
 
+from collections.abc import Mapping
+
+import numpy as np
+
+
+def calculate_rasi(longitude):
+    """D1 - Rasi chart"""
+    return int(longitude // 30) + 1
+
 def calculate_generic_division(longitude, divisions):
     """Return the sign placement when a sign is divided equally."""
     sign = int(longitude // 30)
@@ -448,89 +461,181 @@ def calculate_nav_panchasamsa(longitude):
     """D59 - Nav panchasamsa"""
     return calculate_generic_division(longitude, 59)
 
+VARGA_FUNCTIONS = {
+    1: calculate_rasi,
+    2: calculate_hora,
+    3: calculate_drekkana,
+    4: calculate_chaturthamsa,
+    5: calculate_panchamsa,
+    6: calculate_shashthamsa,
+    7: calculate_saptamsa,
+    8: calculate_ashtamsa,
+    9: calculate_navamsa,
+    10: calculate_dasamsa,
+    11: calculate_rudramsa,
+    12: calculate_dwadasamsa,
+    13: calculate_trayodashamsa,
+    14: calculate_chaturdamsa,
+    15: calculate_panchadasamsa,
+    16: calculate_shodasamsa,
+    17: calculate_saptadasamsa,
+    18: calculate_ashtadasamsa,
+    19: calculate_navadasamsa,
+    20: calculate_vimsamsa,
+    21: calculate_ekavimsamsa,
+    22: calculate_bhavamsa,
+    23: calculate_trayovimsamsa,
+    24: calculate_chaturvimsamsa,
+    25: calculate_quintamsa,
+    26: calculate_shadvimsamsa,
+    27: calculate_nakshatramsa,
+    28: calculate_ashtakavimsamsa,
+    29: calculate_ekonatrimsamsa,
+    30: calculate_trimsamsa,
+    31: calculate_trimshatsamsa,
+    32: calculate_dwatrimsamsa,
+    33: calculate_tritrimsamsa,
+    34: calculate_chatvarimsamsa,
+    35: calculate_panchatvimsamsa,
+    36: calculate_shadtrimsamsa,
+    37: calculate_saptatrimsamsa,
+    38: calculate_ashtatrimsamsa,
+    39: calculate_navatrimsamsa,
+    40: calculate_khavedamsa,
+    41: calculate_eka_Chatvarimsamsa,
+    42: calculate_dvi_chatvarimsamsa,
+    43: calculate_tri_chatvarimsamsa,
+    44: calculate_chatu_chatvarimsamsa,
+    45: calculate_akshvedamsa,
+    46: calculate_chatvimsamsa,
+    47: calculate_saptchatvarimsamsa,
+    48: calculate_ashtchatvarimsamsa,
+    49: calculate_navchatvarimsamsa,
+    50: calculate_panchasaptamsa,
+    51: calculate_ekonnapanchasamsa,
+    52: calculate_dvi_panchasamsa,
+    53: calculate_tri_panchasamsa,
+    54: calculate_chatu_panchasamsa,
+    55: calculate_panch_panchasamsa,
+    56: calculate_shad_panchasamsa,
+    57: calculate_sapt_panchasamsa,
+    58: calculate_asht_panchasamsa,
+    59: calculate_nav_panchasamsa,
+    60: calculate_shashtiamsa,
+}
+
+VARGA_NUMBERS = np.arange(1, 61)
+
+
+def _build_varga_table():
+    """Evaluate every varga rule once per (sign, part) cell.
+
+    Every rule above is constant within each of the ``D`` equal parts of a
+    sign (D30's unequal spans all fall on whole degrees, i.e. on its 30
+    parts), so a 60 x 12 x 60 table indexed by varga, sign and part is exact
+    for any longitude -- unlike a fixed arc-minute grid, which cannot
+    represent boundaries such as 30/7 degrees.
+    """
+    table = np.zeros((60, 12, 60), dtype=np.uint8)
+    for d, func in VARGA_FUNCTIONS.items():
+        width = 30 / d
+        for sign in range(12):
+            for part in range(d):
+                table[d - 1, sign, part] = func(sign * 30 + (part + 0.5) * width)
+    return table
+
+
+VARGA_TABLE = _build_varga_table()
+
+
+def varga_signs(longitudes, vargas=None):
+    """Return a ``(len(vargas), len(longitudes))`` array of varga signs (1-12).
+
+    ``vargas`` is a sequence of divisional numbers (default all of D1-D60).
+    """
+    lons = np.asarray(longitudes, dtype=float) % 360
+    d = VARGA_NUMBERS if vargas is None else np.asarray(vargas, dtype=np.intp)
+    d = d[:, None]
+    signs = (lons // 30).astype(np.intp)
+    parts = np.floor_divide(lons % 30, 30 / d).astype(np.intp)
+    np.minimum(parts, d - 1, out=parts)
+    return VARGA_TABLE[d - 1, signs[None, :], parts]
+
+
 def calculate_all_vargas(longitude):
     """Return all divisional chart placements from D1 through D60."""
+    signs = varga_signs([longitude])[:, 0].tolist()
+    return {f'D{i}': sign for i, sign in zip(range(1, 61), signs)}
 
-    special = {
-        1: lambda lon: int(lon // 30) + 1,
-        2: calculate_hora,
-        3: calculate_drekkana,
-        4: calculate_chaturthamsa,
-        5: calculate_panchamsa,
-        6: calculate_shashthamsa,
-        7: calculate_saptamsa,
-        8: calculate_ashtamsa,
-        9: calculate_navamsa,
-        10: calculate_dasamsa,
-        11: calculate_rudramsa,
-        12: calculate_dwadasamsa,
-        13: calculate_trayodashamsa,
-        14: calculate_chaturdamsa,
-        15: calculate_panchadasamsa,
-        16: calculate_shodasamsa,
-        17: calculate_saptadasamsa,
-        18: calculate_ashtadasamsa,
-        19: calculate_navadasamsa,
-        20: calculate_vimsamsa,
-        21: calculate_ekavimsamsa,
-        22: calculate_bhavamsa,
-        23: calculate_trayovimsamsa,
-        24: calculate_chaturvimsamsa,
-        25: calculate_quintamsa,
-        26: calculate_shadvimsamsa,
-        27: calculate_nakshatramsa,
-        28: calculate_ashtakavimsamsa,
-        29: calculate_ekonatrimsamsa,
-        30: calculate_trimsamsa,
-        31: calculate_trimshatsamsa,
-        32: calculate_dwatrimsamsa,
-        33: calculate_tritrimsamsa,
-        34: calculate_chatvarimsamsa,
-        35: calculate_panchatvimsamsa,
-        36: calculate_shadtrimsamsa,
-        37: calculate_saptatrimsamsa,
-        38: calculate_ashtatrimsamsa,
-        39: calculate_navatrimsamsa,
-        40: calculate_khavedamsa,
-        41: calculate_eka_Chatvarimsamsa,
-        42: calculate_dvi_chatvarimsamsa,
-        43: calculate_tri_chatvarimsamsa,
-        44: calculate_chatu_chatvarimsamsa,
-        45: calculate_akshvedamsa,
-        46: calculate_chatvimsamsa,
-        47: calculate_saptchatvarimsamsa,
-        48: calculate_ashtchatvarimsamsa,
-        49: calculate_navchatvarimsamsa,
-        50: calculate_panchasaptamsa,
-        51: calculate_ekonnapanchasamsa,
-        52: calculate_dvi_panchasamsa,
-        53: calculate_tri_panchasamsa,
-        54: calculate_chatu_panchasamsa,
-        55: calculate_panch_panchasamsa,
-        56: calculate_shad_panchasamsa,
-        57: calculate_sapt_panchasamsa,
-        58: calculate_asht_panchasamsa,
-        59: calculate_nav_panchasamsa,
-        60: calculate_shashtiamsa,
-    }
-
-    results = {}
-    for i in range(1, 61):
-        func = special.get(i, lambda lon, d=i: calculate_generic_division(lon, d))
-        results[f'D{i}'] = func(longitude)
-    return results
-
-def calculate_divisional_charts(planets):
-    """Calculate divisional charts D1 through D60 for all planets."""
-    charts = {f'D{i}': {} for i in range(1, 61)}
-    
-    # Calculate for each planet
-    for planet in planets:
-        vargas = calculate_all_vargas(planet['longitude'])
-        for varga, sign in vargas.items():
-            charts[varga][planet['name']] = sign
-    
-    return charts
+ALL_CHART_KEYS = tuple(f'D{i}' for i in range(1, 61))
+
+
+def parse_chart_keys(charts=None):
+    """Normalize a chart selection to an ordered tuple of ``'D<n>'`` keys.
+
+    Accepts ``None`` (all charts), a comma separated string such as
+    ``"D1,D9,d60"`` or an iterable of keys / divisional numbers.
+    """
+    if charts is None:
+        return ALL_CHART_KEYS
+    if isinstance(charts, str):
+        charts = [c for c in charts.split(',') if c.strip()]
+    keys = []
+    for chart in charts:
+        text = str(chart).strip().upper()
+        number = text[1:] if text.startswith('D') else text
+        if not number.isdigit() or not 1 <= int(number) <= 60:
+            raise ValueError(f"Unknown divisional chart '{chart}'")
+        key = f'D{int(number)}'
+        if key not in keys:
+            keys.append(key)
+    return tuple(sorted(keys, key=lambda k: int(k[1:])))
+
+
+class DivisionalCharts(Mapping):
+    """Read-only mapping of divisional charts computed on first access.
+
+    Only the requested charts are exposed; each one is resolved from
+    ``VARGA_TABLE`` the first time it is read and then kept.
+    """
+
+    def __init__(self, planets, charts=None):
+        self._names = [planet['name'] for planet in planets]
+        self._longitudes = np.array([planet['longitude'] for planet in planets], dtype=float)
+        self._keys = parse_chart_keys(charts)
+        self._computed = {}
+
+    def __getitem__(self, key):
+        if key not in self._computed:
+            if key not in self._keys:
+                raise KeyError(key)
+            row = varga_signs(self._longitudes, [int(key[1:])])[0].tolist()
+            self._computed[key] = dict(zip(self._names, row))
+        return self._computed[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def to_dict(self):
+        """Materialize every selected chart in one batched lookup."""
+        pending = [k for k in self._keys if k not in self._computed]
+        if pending:
+            matrix = varga_signs(self._longitudes, [int(k[1:]) for k in pending]).tolist()
+            for key, row in zip(pending, matrix):
+                self._computed[key] = dict(zip(self._names, row))
+        return {key: self._computed[key] for key in self._keys}
+
+
+def calculate_divisional_charts(planets, charts=None):
+    """Return lazily computed divisional charts for all planets.
+
+    ``charts`` selects a subset (see :func:`parse_chart_keys`); by default
+    all of D1 through D60 are available.
+    """
+    return DivisionalCharts(planets, charts)
 
 def get_vargottama_planets(rasi_chart, navamsa_chart):
     """Find planets that are vargottama (same sign in D1 and D9)."""
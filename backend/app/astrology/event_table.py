@@ -0,0 +1,311 @@
+"""Precomputed ingress/station table shared by all charts.
+
+Sign and nakshatra ingresses and retrograde stations are the same for
+every user, so they are solved once (see ``backend/build_event_table.py``)
+and stored as flat NumPy arrays sorted by (planet, event type, time).
+Each (planet, type) pair is then a contiguous block and every transit
+query is a ``searchsorted`` over it -- no ephemeris calls at request time.
+
+When the table file is missing, or was built for another ayanamsa or node
+type, :func:`event_table_for` computes a table for just the requested
+window with the event solver.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .events import EVENT_TYPES, GRAHAS, Event, ephemeris, iter_planet_events, set_ayanamsa
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLE_FILE = Path(__file__).resolve().parent.parent / "data" / "event_table.npz"
+TABLE_VERSION = 1
+
+SIGN_INGRESS = EVENT_TYPES.index("sign_ingress")
+NAKSHATRA_INGRESS = EVENT_TYPES.index("nakshatra_ingress")
+STATION_RETROGRADE = EVENT_TYPES.index("station_retrograde")
+STATION_DIRECT = EVENT_TYPES.index("station_direct")
+
+# Windows computed on the fly are widened to whole blocks of this many
+# days so neighbouring requests share a cache entry.
+_WINDOW_BLOCK = 366
+
+
+def _planet_index(planet: str) -> int:
+    try:
+        return GRAHAS.index(planet)
+    except ValueError:
+        raise ValueError(f"Unknown planet: {planet}") from None
+
+
+class EventTable:
+    """Flat event arrays plus each graha's state at ``start_jd``."""
+
+    def __init__(
+        self,
+        jd: np.ndarray,
+        planet: np.ndarray,
+        kind: np.ndarray,
+        index: np.ndarray,
+        previous: np.ndarray,
+        longitude: np.ndarray,
+        initial: np.ndarray,
+        start_jd: float,
+        end_jd: float,
+        ayanamsa: str = "lahiri",
+        node_type: str = "mean",
+    ):
+        order = np.lexsort((jd, kind, planet))
+        self.jd = np.asarray(jd, dtype=np.float64)[order]
+        self.planet = np.asarray(planet, dtype=np.uint8)[order]
+        self.kind = np.asarray(kind, dtype=np.uint8)[order]
+        self.index = np.asarray(index, dtype=np.int8)[order]
+        self.previous = np.asarray(previous, dtype=np.int8)[order]
+        self.longitude = np.asarray(longitude, dtype=np.float32)[order]
+        # initial[p] = (sign, nakshatra, retrograde) at start_jd
+        self.initial = np.asarray(initial, dtype=np.int8)
+        self.start_jd = float(start_jd)
+        self.end_jd = float(end_jd)
+        self.ayanamsa = ayanamsa
+        self.node_type = node_type
+        keys = self.planet.astype(np.int64) * len(EVENT_TYPES) + self.kind
+        self._offsets = np.searchsorted(keys, np.arange(len(GRAHAS) * len(EVENT_TYPES) + 1))
+
+    def __len__(self) -> int:
+        return len(self.jd)
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event], initial, start_jd, end_jd, **meta) -> "EventTable":
+        events = list(events)
+        return cls(
+            jd=np.array([e.jd_ut for e in events], dtype=np.float64),
+            planet=np.array([GRAHAS.index(e.planet) for e in events], dtype=np.uint8),
+            kind=np.array([EVENT_TYPES.index(e.type) for e in events], dtype=np.uint8),
+            index=np.array([-1 if e.index is None else e.index for e in events], dtype=np.int8),
+            previous=np.array([-1 if e.previous is None else e.previous for e in events], dtype=np.int8),
+            longitude=np.array([e.longitude for e in events], dtype=np.float32),
+            initial=initial,
+            start_jd=start_jd,
+            end_jd=end_jd,
+            **meta,
+        )
+
+    def save(self, path: str | Path) -> None:
+        np.savez_compressed(
+            path,
+            version=TABLE_VERSION,
+            jd=self.jd,
+            planet=self.planet,
+            kind=self.kind,
+            index=self.index,
+            previous=self.previous,
+            longitude=self.longitude,
+            initial=self.initial,
+            start_jd=self.start_jd,
+            end_jd=self.end_jd,
+            ayanamsa=self.ayanamsa,
+            node_type=self.node_type,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "EventTable":
+        with np.load(path) as data:
+            if int(data["version"]) != TABLE_VERSION:
+                raise ValueError(f"Unsupported event table version in {path}")
+            return cls(
+                jd=data["jd"],
+                planet=data["planet"],
+                kind=data["kind"],
+                index=data["index"],
+                previous=data["previous"],
+                longitude=data["longitude"],
+                initial=data["initial"],
+                start_jd=float(data["start_jd"]),
+                end_jd=float(data["end_jd"]),
+                ayanamsa=str(data["ayanamsa"]),
+                node_type=str(data["node_type"]),
+            )
+
+    def covers(self, start_jd: float, end_jd: float, ayanamsa: str = "lahiri",
+               node_type: str = "mean") -> bool:
+        return (
+            self.start_jd <= start_jd
+            and end_jd <= self.end_jd
+            and self.ayanamsa == ayanamsa.lower()
+            and self.node_type == node_type.lower()
+        )
+
+    def _block(self, planet: int, kind: int) -> slice:
+        key = planet * len(EVENT_TYPES) + kind
+        return slice(self._offsets[key], self._offsets[key + 1])
+
+    def events(
+        self,
+        start_jd: float,
+        end_jd: float,
+        planets: Optional[Iterable[str]] = None,
+        types: Optional[Iterable[str]] = None,
+    ) -> list[Event]:
+        """Return events in ``[start_jd, end_jd)`` in time order."""
+        planet_ids = [_planet_index(p) for p in planets] if planets is not None else range(len(GRAHAS))
+        kinds = [EVENT_TYPES.index(t) for t in types] if types is not None else range(len(EVENT_TYPES))
+        picks = []
+        for p in planet_ids:
+            for k in kinds:
+                block = self._block(p, k)
+                lo, hi = np.searchsorted(self.jd[block], [start_jd, end_jd]) + block.start
+                picks.append(np.arange(lo, hi))
+        rows = np.concatenate(picks) if picks else np.empty(0, dtype=np.int64)
+        rows = rows[np.argsort(self.jd[rows], kind="stable")]
+        return [self._event(i) for i in rows]
+
+    def _event(self, i: int) -> Event:
+        index = int(self.index[i])
+        return Event(
+            GRAHAS[self.planet[i]],
+            EVENT_TYPES[self.kind[i]],
+            float(self.jd[i]),
+            float(self.longitude[i]),
+            None if index < 0 else index,
+            None if index < 0 else int(self.previous[i]),
+        )
+
+    def intervals(self, planet: str, start_jd: float, end_jd: float,
+                  kind: str = "sign_ingress") -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(starts, ends, values)`` of the sign (or nakshatra) held.
+
+        The intervals tile ``[start_jd, end_jd)``; values are signs 1-12
+        for ``sign_ingress`` and nakshatra indexes 0-26 otherwise.
+        """
+        p = _planet_index(planet)
+        k = EVENT_TYPES.index(kind)
+        block = self._block(p, k)
+        times = self.jd[block]
+        lo, hi = np.searchsorted(times, [start_jd, end_jd], side="right")
+        if lo > 0:
+            current = self.index[block][lo - 1]
+        else:
+            current = self.initial[p, 0 if k == SIGN_INGRESS else 1]
+        starts = np.concatenate(([start_jd], times[lo:hi]))
+        ends = np.concatenate((times[lo:hi], [end_jd]))
+        values = np.concatenate(([current], self.index[block][lo:hi])).astype(np.int64)
+        return starts, ends, values
+
+    def value_at(self, planet: str, jd: float, kind: str = "sign_ingress") -> int:
+        """Return the sign (or nakshatra) of ``planet`` at ``jd``."""
+        return int(self.intervals(planet, jd, jd, kind)[2][-1])
+
+    def retrograde_intervals(self, planet: str, start_jd: float,
+                             end_jd: float) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(starts, ends)`` of retrograde spans clipped to the window."""
+        p = _planet_index(planet)
+        if planet in ("Rahu", "Ketu") and self.node_type == "mean":
+            return np.array([start_jd]), np.array([end_jd])
+        retro = self.jd[self._block(p, STATION_RETROGRADE)]
+        direct = self.jd[self._block(p, STATION_DIRECT)]
+        times = np.concatenate((retro, direct))
+        flags = np.concatenate((np.ones(len(retro), bool), np.zeros(len(direct), bool)))
+        order = np.argsort(times)
+        times, flags = times[order], flags[order]
+        lo, hi = np.searchsorted(times, [start_jd, end_jd], side="right")
+        state = flags[lo - 1] if lo > 0 else bool(self.initial[p, 2])
+        starts = np.concatenate(([start_jd], times[lo:hi]))
+        ends = np.concatenate((times[lo:hi], [end_jd]))
+        values = np.concatenate(([state], flags[lo:hi]))
+        return starts[values], ends[values]
+
+    def occupancy(self, planet: str, signs: Iterable[int], start_jd: float,
+                  end_jd: float) -> tuple[np.ndarray, np.ndarray]:
+        """Return merged ``(starts, ends)`` while ``planet`` is in any of ``signs``."""
+        starts, ends, values = self.intervals(planet, start_jd, end_jd)
+        inside = np.isin(values, list(signs)).astype(np.int8)
+        edges = np.diff(np.concatenate(([0], inside, [0])))
+        first = np.flatnonzero(edges == 1)
+        last = np.flatnonzero(edges == -1) - 1
+        return starts[first], ends[last]
+
+    def sade_sati(self, moon_sign: int, start_jd: float, end_jd: float) -> list[dict]:
+        """Return Saturn's transits of the 12th, 1st and 2nd signs from the Moon."""
+        signs = [(moon_sign + d - 1) % 12 + 1 for d in (-1, 0, 1)]
+        phase = dict(zip(signs, ("rising", "peak", "setting")))
+        starts, ends, values = self.intervals("Saturn", start_jd, end_jd)
+        periods = []
+        for s, e in zip(*self.occupancy("Saturn", signs, start_jd, end_jd)):
+            inside = (starts < e) & (ends > s)
+            periods.append({
+                "start_jd": float(s),
+                "end_jd": float(e),
+                "phases": [
+                    {"phase": phase[int(v)], "sign": int(v),
+                     "start_jd": float(max(a, s)), "end_jd": float(min(b, e))}
+                    for a, b, v in zip(starts[inside], ends[inside], values[inside])
+                ],
+            })
+        return periods
+
+
+def _initial_state(start_jd: float, node_type: str) -> np.ndarray:
+    initial = np.zeros((len(GRAHAS), 3), dtype=np.int8)
+    for p, name in enumerate(GRAHAS):
+        lon, speed = ephemeris(name, node_type)(start_jd)
+        initial[p] = (int(lon // 30) + 1, int(lon // (360 / 27)) % 27, speed < 0)
+    return initial
+
+
+def build_event_table(start_jd: float, end_jd: float, *, ayanamsa: str = "lahiri",
+                      node_type: str = "mean") -> EventTable:
+    """Solve every graha's events in ``[start_jd, end_jd)`` into a table."""
+    set_ayanamsa(ayanamsa)
+    events = []
+    for name in GRAHAS:
+        events.extend(iter_planet_events(name, start_jd, end_jd, node_type=node_type))
+    return EventTable.from_events(
+        events,
+        _initial_state(start_jd, node_type),
+        start_jd,
+        end_jd,
+        ayanamsa=ayanamsa.lower(),
+        node_type=node_type.lower(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_event_table() -> Optional[EventTable]:
+    """Load the precomputed table from ``$EVENT_TABLE_FILE`` or the default path."""
+    path = Path(os.getenv("EVENT_TABLE_FILE") or DEFAULT_TABLE_FILE)
+    if not path.exists():
+        logger.warning("Event table %s not found; transits will be computed per request", path)
+        return None
+    table = EventTable.load(path)
+    logger.info("Loaded %d events from %s", len(table), path)
+    return table
+
+
+@lru_cache(maxsize=16)
+def _window_table(first_block: int, last_block: int, ayanamsa: str, node_type: str) -> EventTable:
+    return build_event_table(
+        first_block * _WINDOW_BLOCK, (last_block + 1) * _WINDOW_BLOCK,
+        ayanamsa=ayanamsa, node_type=node_type,
+    )
+
+
+def event_table_for(start_jd: float, end_jd: float, *, ayanamsa: str = "lahiri",
+                    node_type: str = "mean") -> EventTable:
+    """Return a table covering the window, preferring the precomputed one."""
+    table = get_event_table()
+    if table is not None and table.covers(start_jd, end_jd, ayanamsa, node_type):
+        return table
+    return _window_table(
+        math.floor(start_jd / _WINDOW_BLOCK),
+        math.floor(end_jd / _WINDOW_BLOCK),
+        ayanamsa.lower(),
+        node_type.lower(),
+    )
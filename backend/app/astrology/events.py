@@ -0,0 +1,220 @@
+"""Ephemeris event solver: sign and nakshatra ingresses and stations.
+
+Events are bracketed by sampling sidereal longitude and speed on a coarse
+per-planet grid, then refined with a safeguarded secant (Illinois) search
+to well under a minute. Stations are solved first so that longitude is
+monotonic between the points used to bracket ingresses.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Optional
+
+import swisseph as swe
+
+from .birth_info import AYANAMSHA_MAP
+from .dasha import datetime_to_jd, jd_to_datetime
+
+SIGN_SPAN = 30.0
+NAKSHATRA_SPAN = 360 / 27
+
+GRAHAS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+
+EVENT_TYPES = ("sign_ingress", "nakshatra_ingress", "station_retrograde", "station_direct")
+
+# Sampling step in days: small enough that a planet cannot cross two
+# nakshatras, or station twice, between samples.
+GRID_STEP = {
+    "Moon": 0.5,
+    "Sun": 2.0,
+    "Mercury": 1.0,
+    "Venus": 1.0,
+    "Mars": 2.0,
+    "Jupiter": 4.0,
+    "Saturn": 4.0,
+    "Rahu": 4.0,
+    "Ketu": 4.0,
+}
+# The true node wobbles, turning direct for a few days about twice a
+# month; only flickers shorter than this step are passed over.
+TRUE_NODE_STEP = 0.5
+
+# Bodies whose apparent motion never reverses, so they have no stations.
+# The mean node always regresses too; the true node does station.
+_NO_STATIONS = {"Sun", "Moon"}
+_NODES = {"Rahu", "Ketu"}
+
+# Solver tolerance in days (about 0.1 seconds).
+TOLERANCE = 1e-6
+
+
+@dataclass(frozen=True)
+class Event:
+    planet: str
+    type: str
+    jd_ut: float
+    longitude: float
+    # Sign (1-12) or nakshatra (0-26) entered; ``None`` for stations.
+    index: Optional[int] = None
+    previous: Optional[int] = None
+
+    @property
+    def time(self) -> datetime:
+        return jd_to_datetime(self.jd_ut)
+
+    def to_dict(self) -> dict:
+        return {
+            "planet": self.planet,
+            "type": self.type,
+            "time": self.time,
+            "jd_ut": self.jd_ut,
+            "longitude": self.longitude,
+            "index": self.index,
+            "previous": self.previous,
+        }
+
+
+def _planet_id(name: str, node_type: str) -> int:
+    if name in ("Rahu", "Ketu"):
+        return swe.MEAN_NODE if node_type.lower() == "mean" else swe.TRUE_NODE
+    return getattr(swe, name.upper())
+
+
+def set_ayanamsa(ayanamsa: str = "lahiri") -> None:
+    swe.set_sid_mode(AYANAMSHA_MAP.get(ayanamsa.lower(), swe.SIDM_LAHIRI))
+
+
+def ephemeris(name: str, node_type: str = "mean") -> Callable[[float], tuple[float, float]]:
+    """Return ``f(jd) -> (sidereal longitude, speed)`` for a graha.
+
+    The sidereal mode must already be set (see :func:`set_ayanamsa`).
+    """
+    pid = _planet_id(name, node_type)
+    offset = 180.0 if name == "Ketu" else 0.0
+    flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+    def position(jd: float) -> tuple[float, float]:
+        values, _ = swe.calc_ut(jd, pid, flags)
+        return (values[0] + offset) % 360, values[3]
+
+    return position
+
+
+def wrap_angle(delta: float) -> float:
+    return (delta + 180.0) % 360.0 - 180.0
+
+
+def solve(f: Callable[[float], float], a: float, b: float, fa: float, fb: float,
+          tol: float = TOLERANCE) -> float:
+    """Find a root of ``f`` bracketed by ``[a, b]`` with the Illinois method."""
+    side = 0
+    for _ in range(100):
+        if b - a <= tol:
+            break
+        c = b - fb * (b - a) / (fb - fa) if fb != fa else (a + b) / 2
+        if not a < c < b:
+            c = (a + b) / 2
+        fc = f(c)
+        if fc == 0:
+            return c
+        if (fc > 0) == (fb > 0):
+            b, fb = c, fc
+            if side == -1:
+                fa /= 2
+            side = -1
+        else:
+            a, fa = c, fc
+            if side == 1:
+                fb /= 2
+            side = 1
+    return (a + b) / 2
+
+
+def _crossings(name, position, t1, lon1, t2, lon2):
+    """Yield ingress events while longitude moves monotonically from t1 to t2."""
+    delta = wrap_angle(lon2 - lon1)
+    if delta == 0:
+        return
+    end = lon1 + delta
+    events = []
+    for kind, span, to_index in (
+        ("sign_ingress", SIGN_SPAN, lambda k: k % 12 + 1),
+        ("nakshatra_ingress", NAKSHATRA_SPAN, lambda k: k % 27),
+    ):
+        k1 = math.floor(lon1 / span)
+        k2 = math.floor(end / span)
+        if delta > 0:
+            boundaries = [(k, k - 1, k) for k in range(k1 + 1, k2 + 1)]
+        else:
+            boundaries = [(k, k, k - 1) for k in range(k1, k2, -1)]
+        for b, before, after in boundaries:
+            target = (b * span) % 360
+
+            def offset(t, target=target):
+                return wrap_angle(position(t)[0] - target)
+
+            jd = solve(offset, t1, t2, wrap_angle(lon1 - target), wrap_angle(lon2 - target))
+            events.append(Event(name, kind, jd, target, to_index(after), to_index(before)))
+    events.sort(key=lambda e: e.jd_ut)
+    yield from events
+
+
+def iter_planet_events(name: str, start_jd: float, end_jd: float, *,
+                       node_type: str = "mean") -> Iterator[Event]:
+    """Yield ingress and station events of one graha in time order."""
+    position = ephemeris(name, node_type)
+    step = GRID_STEP.get(name, 1.0)
+    stations = name not in _NO_STATIONS
+    if name in _NODES:
+        stations = node_type.lower() != "mean"
+        step = TRUE_NODE_STEP if stations else step
+    t1 = start_jd
+    lon1, speed1 = position(t1)
+    while t1 < end_jd:
+        t2 = min(t1 + step, end_jd)
+        lon2, speed2 = position(t2)
+        if stations and (speed1 < 0) != (speed2 < 0):
+            ts = solve(lambda t: position(t)[1], t1, t2, speed1, speed2)
+            lons, _ = position(ts)
+            yield from _crossings(name, position, t1, lon1, ts, lons)
+            kind = "station_retrograde" if speed1 > 0 else "station_direct"
+            yield Event(name, kind, ts, lons)
+            yield from _crossings(name, position, ts, lons, t2, lon2)
+        else:
+            yield from _crossings(name, position, t1, lon1, t2, lon2)
+        t1, lon1, speed1 = t2, lon2, speed2
+
+
+def iter_events(
+    start: datetime | float,
+    end: datetime | float,
+    planets: Optional[Iterable[str]] = None,
+    types: Optional[Iterable[str]] = None,
+    *,
+    ayanamsa: str = "lahiri",
+    node_type: str = "mean",
+) -> Iterator[Event]:
+    """Stream events for ``planets`` between ``start`` and ``end`` in time order.
+
+    ``start``/``end`` are naive UTC datetimes or Julian days. ``types``
+    restricts the output to a subset of :data:`EVENT_TYPES`.
+    """
+    start_jd = start if isinstance(start, (int, float)) else datetime_to_jd(start)
+    end_jd = end if isinstance(end, (int, float)) else datetime_to_jd(end)
+    names = list(planets) if planets is not None else GRAHAS
+    unknown = [n for n in names if n not in GRAHAS]
+    if unknown:
+        raise ValueError(f"Unknown planets: {', '.join(unknown)}")
+    wanted = set(types) if types is not None else set(EVENT_TYPES)
+    if wanted - set(EVENT_TYPES):
+        raise ValueError(f"Unknown event types: {', '.join(sorted(wanted - set(EVENT_TYPES)))}")
+
+    set_ayanamsa(ayanamsa)
+    streams = [iter_planet_events(n, start_jd, end_jd, node_type=node_type) for n in names]
+    for event in heapq.merge(*streams, key=lambda e: e.jd_ut):
+        if event.type in wanted and start_jd <= event.jd_ut < end_jd:
+            yield event
@@ -0,0 +1,126 @@
+"""Planetary horas and the day divisions of the Vedic day.
+
+Every Vedic day (sunrise to next sunrise) is split into twelve day and
+twelve night horas, eight day and eight night choghadiyas, and eight day
+parts that place Rahu Kalam, Yamaganda and Gulika Kalam. All of it
+follows from three times per day, so a range of days needs only the
+batched sunrises of :mod:`.sun_data`.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pytz
+
+from .panchanga import VAARA_NAMES
+from .panchanga_calendar import local_time
+from .shadbala import HORA_ORDER, WEEKDAY_LORDS
+from .sun_data import day_number, sun_times_range
+
+# Choghadiya named after the lord it belongs to, in hora order.
+CHOGHADIYA = {
+    "Sun": ("Udveg", "bad"),
+    "Venus": ("Char", "neutral"),
+    "Mercury": ("Labh", "good"),
+    "Moon": ("Amrit", "good"),
+    "Saturn": ("Kaal", "bad"),
+    "Jupiter": ("Shubh", "good"),
+    "Mars": ("Rog", "bad"),
+}
+# Eighth of the daytime (1-8) holding each period, by weekday from Sunday.
+RAHU_KALAM = [8, 2, 7, 5, 6, 4, 3]
+YAMAGANDA = [5, 4, 3, 2, 1, 7, 6]
+GULIKA_KALAM = [7, 6, 5, 4, 3, 2, 1]
+
+
+def _lord(weekday: int) -> int:
+    """Index into :data:`HORA_ORDER` of the lord of a weekday (0 = Sunday)."""
+    return HORA_ORDER.index(WEEKDAY_LORDS[weekday])
+
+
+def divide_day(sunrise: float, sunset: float, next_sunrise: float, weekday: int) -> dict:
+    """Return horas, choghadiyas and inauspicious periods for one Vedic day.
+
+    Times are Julian days; ``weekday`` counts from Sunday (0).
+    """
+    day_hours = np.linspace(sunrise, sunset, 13)
+    night_hours = np.linspace(sunset, next_sunrise, 13)
+    day_eighths = np.linspace(sunrise, sunset, 9)
+    night_eighths = np.linspace(sunset, next_sunrise, 9)
+
+    first = _lord(weekday)
+    horas = [
+        {"lord": HORA_ORDER[(first + i) % 7], "period": "day" if i < 12 else "night",
+         "start": float(t[i % 12]), "end": float(t[i % 12 + 1])}
+        for i, t in ((i, day_hours if i < 12 else night_hours) for i in range(24))
+    ]
+
+    choghadiya = []
+    night_first = _lord((weekday + 4) % 7)
+    for period, edges, start, step in (("day", day_eighths, first, 1),
+                                       ("night", night_eighths, night_first, -2)):
+        for i in range(8):
+            lord = HORA_ORDER[(start + step * i) % 7]
+            name, quality = CHOGHADIYA[lord]
+            choghadiya.append({"name": name, "lord": lord, "quality": quality, "period": period,
+                               "start": float(edges[i]), "end": float(edges[i + 1])})
+
+    def eighth(table):
+        part = table[weekday] - 1
+        return {"start": float(day_eighths[part]), "end": float(day_eighths[part + 1])}
+
+    return {
+        "horas": horas,
+        "choghadiya": choghadiya,
+        "rahu_kalam": eighth(RAHU_KALAM),
+        "yamaganda": eighth(YAMAGANDA),
+        "gulika_kalam": eighth(GULIKA_KALAM),
+    }
+
+
+def _localize(value, tz):
+    """Replace every ``start``/``end`` Julian day in a nested result by local ISO time."""
+    if isinstance(value, list):
+        return [_localize(v, tz) for v in value]
+    if isinstance(value, dict):
+        return {
+            k: local_time(v, tz).isoformat(timespec="seconds") if k in ("start", "end") else _localize(v, tz)
+            for k, v in value.items()
+        }
+    return value
+
+
+def hora_timetable(start: date, end: date, latitude: float, longitude: float,
+                   timezone: str) -> list[dict]:
+    """Return the day divisions for every date in ``[start, end]``.
+
+    Sunrises for the whole range come from one batched lookup. Times are
+    ISO strings local to ``timezone``. Raises ``ValueError`` for an unknown
+    timezone or when the Sun does not rise or set on some day.
+    """
+    try:
+        tz = pytz.timezone(timezone)
+    except pytz.UnknownTimeZoneError as exc:
+        raise ValueError(f"Invalid timezone '{timezone}'") from exc
+
+    first, last = day_number(start), day_number(end)
+    sun = sun_times_range(latitude, longitude, first, last + 1)
+    rises, sets = sun["sunrise"], sun["sunset"]
+    if np.isnan(rises).any() or np.isnan(sets[:-1]).any():
+        raise ValueError("The Sun does not rise or set at this location on some day of the range")
+
+    result = []
+    for i, day in enumerate(range(first, last + 1)):
+        weekday = (day + 1) % 7
+        divisions = divide_day(rises[i], sets[i], rises[i + 1], weekday)
+        result.append({
+            "date": date.fromordinal(day - 1721425).isoformat(),
+            "vaara": VAARA_NAMES[(weekday - 1) % 7],
+            "sunrise": local_time(rises[i], tz).isoformat(timespec="seconds"),
+            "sunset": local_time(sets[i], tz).isoformat(timespec="seconds"),
+            "next_sunrise": local_time(rises[i + 1], tz).isoformat(timespec="seconds"),
+            **_localize(divisions, tz),
+        })
+    return result
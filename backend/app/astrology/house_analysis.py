@@ -1,13 +1,8 @@
+import numpy as np
 import swisseph as swe
+from .aspects import build_aspect_matrix
 from .birth_info import HOUSE_MAP
 
-# Relative houses each planet aspects by graha drishti
-_ASPECT_PATTERNS = {
-    "Mars": [4, 7, 8],
-    "Jupiter": [5, 7, 9],
-    "Saturn": [3, 7, 10],
-}
-
 
 def _normalize_house_system(house_system):
     """Return SwissEph house system code from a friendly name or byte."""
@@ -51,23 +46,17 @@ def _planet_house(lon, cusps):
     return 12
 
 
-def _aspected_houses(name, house):
-    rel = _ASPECT_PATTERNS.get(name, [7])
-    return [((house + r - 2) % 12) + 1 for r in rel]
-
-
 def _calculate_aspects(placements):
-    aspects = {n: _aspected_houses(n, info["house"]) for n, info in placements.items()}
-    mutual = []
-    names = list(placements)
-    for i, n1 in enumerate(names):
-        for n2 in names[i + 1 :]:
-            if (
-                placements[n2]["house"] in aspects[n1]
-                and placements[n1]["house"] in aspects[n2]
-            ):
-                pair = tuple(sorted((n1, n2)))
-                mutual.append(pair)
+    planets = [{"name": n, "sign": info["sign"]} for n, info in placements.items()]
+    matrix = build_aspect_matrix(planets, {"placements": placements})
+    aspects = {
+        n: (np.flatnonzero(matrix.to_house[i]) + 1).tolist()
+        for i, n in enumerate(matrix.planets)
+    }
+    mutual = [
+        tuple(sorted((matrix.planets[i], matrix.planets[j])))
+        for i, j in zip(*np.nonzero(np.triu(matrix.to_planet * matrix.to_planet.T)))
+    ]
     return {"planet_aspects": aspects, "mutual_aspects": mutual}
 
 
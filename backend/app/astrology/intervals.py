@@ -0,0 +1,89 @@
+"""Sets of time intervals as sorted, disjoint ``(n, 2)`` arrays of Julian days.
+
+Searches such as muhurta turn every condition into an interval set and
+combine the sets here, so a window edge is always a solved event time
+rather than a sample.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def normalize(intervals) -> np.ndarray:
+    """Sort intervals, drop empty ones and merge those that overlap or touch."""
+    arr = np.asarray(intervals, dtype=np.float64).reshape(-1, 2)
+    arr = arr[arr[:, 1] > arr[:, 0]]
+    if len(arr) == 0:
+        return arr
+    arr = arr[np.argsort(arr[:, 0], kind="stable")]
+    # A new run starts where an interval begins after every earlier one ended.
+    reach = np.maximum.accumulate(arr[:, 1])
+    starts = np.flatnonzero(np.r_[True, arr[1:, 0] > reach[:-1]])
+    ends = np.r_[starts[1:] - 1, len(arr) - 1]
+    return np.column_stack([arr[starts, 0], reach[ends]])
+
+
+def intersect(a, b) -> np.ndarray:
+    """Return the intervals covered by both ``a`` and ``b``."""
+    a, b = normalize(a), normalize(b)
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start, end = max(a[i, 0], b[j, 0]), min(a[i, 1], b[j, 1])
+        if start < end:
+            result.append((start, end))
+        if a[i, 1] < b[j, 1]:
+            i += 1
+        else:
+            j += 1
+    return np.array(result, dtype=np.float64).reshape(-1, 2)
+
+
+def union(*sets) -> np.ndarray:
+    """Return the intervals covered by any of ``sets``."""
+    return normalize(np.concatenate([np.asarray(s, dtype=np.float64).reshape(-1, 2) for s in sets]))
+
+
+def complement(a, start: float, end: float) -> np.ndarray:
+    """Return the parts of ``[start, end)`` not covered by ``a``."""
+    a = intersect(a, [(start, end)])
+    edges = np.concatenate([[start], a.ravel(), [end]])
+    return normalize(edges.reshape(-1, 2))
+
+
+def subtract(a, b) -> np.ndarray:
+    """Return the parts of ``a`` not covered by ``b``."""
+    a = normalize(a)
+    if len(a) == 0:
+        return a
+    return intersect(a, complement(b, a[0, 0], a[-1, 1]))
+
+
+def labelled_spans(start: float, end: float, boundaries: np.ndarray, indices: np.ndarray):
+    """Split ``[start, end)`` at ``boundaries`` and label each piece.
+
+    ``boundaries`` are sorted end times of a cyclic quantity and
+    ``indices[k]`` the value that ends at ``boundaries[k]``; they must
+    extend past ``end``. Returns ``(edges, labels)`` where piece ``i`` is
+    ``[edges[i], edges[i + 1])`` with value ``labels[i]``.
+    """
+    first = int(np.searchsorted(boundaries, start, side="right"))
+    last = int(np.searchsorted(boundaries, end, side="left"))
+    if last >= len(boundaries):
+        raise ValueError("Boundaries do not cover the requested span")
+    edges = np.concatenate([[start], boundaries[first:last], [end]])
+    return edges, np.asarray(indices[first:last + 1])
+
+
+def select(edges: np.ndarray, labels: np.ndarray, allowed) -> np.ndarray:
+    """Return the pieces of labelled spans whose label is in ``allowed``."""
+    mask = np.isin(labels, list(allowed))
+    return normalize(np.column_stack([edges[:-1][mask], edges[1:][mask]]))
+
+
+def labels_between(edges: np.ndarray, labels: np.ndarray, start: float, end: float) -> list:
+    """Return the distinct labels of the pieces overlapping ``[start, end)`` in order."""
+    first = max(int(np.searchsorted(edges, start, side="right")) - 1, 0)
+    last = int(np.searchsorted(edges, end, side="left"))
+    return list(dict.fromkeys(labels[first:last].tolist()))
@@ -0,0 +1,198 @@
+# backend/kp.py - KRISHNAMURTI PADDHATI
+"""
+KP (Krishnamurti Paddhati) star, sub and sub-sub lords.
+
+Each nakshatra is divided among the nine Vimshottari lords in proportion
+to their dasha years, starting with the nakshatra's own lord; every sub is
+divided again the same way for sub-subs. Splitting the subs that straddle
+a sign boundary gives the classic table of 249 subs.
+
+Both tables are built once with exact integer arithmetic (one unit is a
+third of an arcsecond, so every boundary is whole) and looked up with a
+single ``searchsorted`` per batch of longitudes.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import swisseph as swe
+
+from .dasha import DASHA_YEARS, ORDER, VIMSHOTTARI
+from .events import set_ayanamsa
+from app.utils.signs import get_sign_lord
+
+UNITS_PER_DEGREE = 3 * 3600
+_CIRCLE = 360 * UNITS_PER_DEGREE
+_NAKSHATRA = _CIRCLE // 27
+_SIGN = _CIRCLE // 12
+_CYCLE_YEARS = sum(DASHA_YEARS.values())
+
+_YEARS = np.array([DASHA_YEARS[lord] for lord in ORDER], dtype=np.int64)
+_SUB_LORDS = np.array(VIMSHOTTARI.sub_lords, dtype=np.intp)
+# Sign lords as indices into ORDER, for signs 1-12.
+_SIGN_LORDS = np.array([ORDER.index(get_sign_lord(sign)) for sign in range(1, 13)])
+
+LEVELS = ("star", "sub", "sub_sub")
+
+
+@dataclass(frozen=True)
+class KPTable:
+    """Contiguous zodiac divisions sorted by start.
+
+    ``starts`` are in table units (see :data:`UNITS_PER_DEGREE`) and
+    ``lords`` holds, per row, the index into :data:`ORDER` of the star
+    lord and of each deeper level. ``sub_number`` is the 1-based row of
+    the 249-sub table each division falls in.
+    """
+
+    starts: np.ndarray
+    signs: np.ndarray
+    lords: np.ndarray
+    sub_number: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def index(self, longitudes) -> np.ndarray:
+        """Return the row holding each sidereal longitude (degrees)."""
+        units = np.mod(np.asarray(longitudes, dtype=float), 360.0) * UNITS_PER_DEGREE
+        return np.searchsorted(self.starts, units, side="right") - 1
+
+    def rows(self) -> list[dict]:
+        """Return the table as a list of ``{number, start, end, sign, ...lords}`` dicts."""
+        ends = np.append(self.starts[1:], _CIRCLE)
+        result = []
+        for i in range(len(self)):
+            row = {
+                "number": int(self.sub_number[i]),
+                "start": float(self.starts[i] / UNITS_PER_DEGREE),
+                "end": float(ends[i] / UNITS_PER_DEGREE),
+                "sign": int(self.signs[i]),
+                "sign_lord": ORDER[_SIGN_LORDS[self.signs[i] - 1]],
+            }
+            row.update({level: ORDER[lord] for level, lord in zip(LEVELS, self.lords[i])})
+            result.append(row)
+        return result
+
+
+def _divisions(depth: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return starts and lord paths of the nakshatra divisions ``depth`` levels deep."""
+    starts = np.arange(27, dtype=np.int64) * _NAKSHATRA
+    widths = np.full(27, _NAKSHATRA, dtype=np.int64)
+    lords = (np.arange(27) % 9)[:, None]
+    for _ in range(depth - 1):
+        children = _SUB_LORDS[lords[:, -1]]
+        child_widths = widths[:, None] * _YEARS[children] // _CYCLE_YEARS
+        child_starts = starts[:, None] + np.cumsum(child_widths, axis=1) - child_widths
+        starts, widths = child_starts.ravel(), child_widths.ravel()
+        lords = np.hstack([np.repeat(lords, 9, axis=0), children.reshape(-1, 1)])
+    return starts, lords
+
+
+def _split_at_signs(starts: np.ndarray, lords: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Insert the twelve sign boundaries as division starts."""
+    merged = np.union1d(starts, np.arange(12, dtype=np.int64) * _SIGN)
+    return merged, lords[np.searchsorted(starts, merged, side="right") - 1]
+
+
+def _build(depth: int, subs=None) -> KPTable:
+    starts, lords = _split_at_signs(*_divisions(depth))
+    if subs is None:
+        numbers = np.arange(1, len(starts) + 1)
+    else:
+        numbers = np.searchsorted(subs.starts, starts, side="right")
+    return KPTable(starts, starts // _SIGN + 1, lords, numbers)
+
+
+KP_SUBS = _build(2)
+KP_SUB_SUBS = _build(3, KP_SUBS)
+
+
+def kp_lords(longitudes) -> dict:
+    """Return sign, star, sub and sub-sub lords for an array of longitudes.
+
+    The result maps ``sign``, ``sub_number`` and ``sign_lord`` plus each of
+    :data:`LEVELS` to arrays aligned with ``longitudes``; lords are indices
+    into :data:`ORDER`.
+    """
+    rows = KP_SUB_SUBS.index(longitudes)
+    signs = KP_SUB_SUBS.signs[rows]
+    result = {
+        "sign": signs,
+        "sub_number": KP_SUB_SUBS.sub_number[rows],
+        "sign_lord": _SIGN_LORDS[signs - 1],
+    }
+    for level, column in zip(LEVELS, KP_SUB_SUBS.lords[rows].T):
+        result[level] = column
+    return result
+
+
+def _named(lords: dict, i: int, longitude: float) -> dict:
+    entry = {
+        "longitude": float(longitude),
+        "sign": int(lords["sign"][i]),
+        "sub_number": int(lords["sub_number"][i]),
+    }
+    for key in ("sign_lord", *LEVELS):
+        entry[key] = ORDER[lords[key][i]]
+    return entry
+
+
+def kp_cusps(jd_ut: float, latitude: float, longitude: float,
+             sidereal_offset: float) -> tuple[list[float], str]:
+    """Return the twelve sidereal cusps KP uses and the house system they follow.
+
+    KP uses Placidus. Above the polar circles Placidus is undefined for part
+    of the day, and Porphyry cusps are returned instead.
+    """
+    try:
+        cusps, _ = swe.houses(jd_ut, latitude, longitude, b"P")
+        house_system = "placidus"
+    except swe.Error:
+        cusps, _ = swe.houses(jd_ut, latitude, longitude, b"O")
+        house_system = "porphyry"
+    return [(c - sidereal_offset) % 360 for c in cusps[:12]], house_system
+
+
+def calculate_kp(planets, birth_info) -> dict:
+    """Return KP lords of the planets and of the house cusps.
+
+    ``planets`` need ``name`` and sidereal ``longitude``; ``birth_info``
+    needs ``jd_ut``, ``latitude``, ``longitude`` and ``sidereal_offset``.
+    ``house_system`` names the cusps used (see :func:`kp_cusps`).
+    """
+    cusps, house_system = kp_cusps(
+        birth_info["jd_ut"],
+        birth_info["latitude"],
+        birth_info["longitude"],
+        birth_info["sidereal_offset"],
+    )
+    longitudes = [p["longitude"] for p in planets] + cusps
+    lords = kp_lords(longitudes)
+    n = len(planets)
+    return {
+        "house_system": house_system,
+        "planets": {p["name"]: _named(lords, i, p["longitude"]) for i, p in enumerate(planets)},
+        "cusps": {h + 1: _named(lords, n + h, cusps[h]) for h in range(12)},
+    }
+
+
+def kp_cusp_table(jd_values, latitude: float, longitude: float, ayanamsa: str = "kp") -> list[dict]:
+    """Return KP cusp lords for each Julian day in ``jd_values``.
+
+    All cusps of every instant are looked up in one batch. Each item has
+    the ``jd``, its ``house_system`` and a ``cusps`` mapping as in
+    :func:`calculate_kp`.
+    """
+    set_ayanamsa(ayanamsa)
+    results = [kp_cusps(jd, latitude, longitude, swe.get_ayanamsa(jd)) for jd in jd_values]
+    cusps = np.array([c for c, _ in results]).reshape(-1, 12)
+    lords = kp_lords(cusps.ravel())
+    return [
+        {
+            "jd": float(jd),
+            "house_system": results[t][1],
+            "cusps": {h + 1: _named(lords, 12 * t + h, cusps[t, h]) for h in range(12)},
+        }
+        for t, jd in enumerate(jd_values)
+    ]
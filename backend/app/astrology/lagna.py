@@ -0,0 +1,125 @@
+"""Rising-time tables: when the sidereal ascendant changes sign, nakshatra or navamsa.
+
+:func:`.birth_info.get_birth_info` finds the ascendant of one instant.
+Muhurta, rectification and "what is rising now" need the instants where
+it crosses a division boundary instead. The ascendant is sampled every
+:data:`STEP` days and each crossing is refined with the Illinois solver of
+:mod:`.events`. Boundaries are solved per local mean day (see
+:mod:`.sun_data`) and cached by ``(lat, lon, day)`` with coordinates
+rounded like the sunrise cache, so a day is solved once per city.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+
+import numpy as np
+import swisseph as swe
+
+from .constants import NAKSHATRA_METADATA, RASHI_METADATA
+from .events import NAKSHATRA_SPAN, set_ayanamsa, solve, wrap_angle
+from .sun_data import COORD_DECIMALS, local_day
+
+# Division: (span in degrees, names cycling through the zodiac).
+DIVISIONS = {
+    "sign": (30.0, [meta["name"] for meta in RASHI_METADATA]),
+    "nakshatra": (NAKSHATRA_SPAN, [meta["name"] for meta in NAKSHATRA_METADATA]),
+    # Navamsas run Mesha, Vrishabha, ... continuously from 0 degrees.
+    "navamsa": (10 / 3, [meta["name"] for meta in RASHI_METADATA]),
+}
+
+# Sampling step in days. Several boundaries in one step are solved
+# separately, so the step only has to keep the ascendant monotonic.
+STEP = 1 / 48
+
+
+def ascendant(jd_ut: float, latitude: float, longitude: float) -> float:
+    """Return the sidereal ascendant; the sidereal mode must already be set."""
+    return (swe.houses(jd_ut, latitude, longitude, b"W")[1][0] - swe.get_ayanamsa(jd_ut)) % 360
+
+
+def solve_boundaries(start_jd: float, end_jd: float, latitude: float, longitude: float,
+                     span: float = 30.0) -> tuple[np.ndarray, np.ndarray]:
+    """Return when the ascendant leaves a ``span``-degree division in the window.
+
+    The second array holds the 0-based division (counted from 0 degrees)
+    that ends at each time. The sidereal mode must already be set.
+    """
+    count = round(360 / span)
+
+    def offset(t: float, target: float) -> float:
+        return wrap_angle(ascendant(t, latitude, longitude) - target)
+
+    times = np.arange(start_jd, end_jd + STEP, STEP)
+    unwrapped = np.unwrap([ascendant(t, latitude, longitude) for t in times], period=360.0)
+    counts = np.floor(unwrapped / span).astype(int)
+    ends, indices = [], []
+    for i in np.flatnonzero(np.diff(counts) > 0):
+        for k in range(counts[i] + 1, counts[i + 1] + 1):
+            boundary = k * span
+            target = boundary % 360
+            t = solve(lambda x: offset(x, target), times[i], times[i + 1],
+                      unwrapped[i] - boundary, unwrapped[i + 1] - boundary)
+            if start_jd <= t < end_jd:
+                ends.append(t)
+                indices.append((k - 1) % count)
+    return np.array(ends), np.array(indices, dtype=np.intp)
+
+
+@lru_cache(maxsize=4096)
+def _day_boundaries(latitude: float, longitude: float, day: int, ayanamsa: str,
+                    division: str) -> tuple[np.ndarray, np.ndarray]:
+    midnight = day - 0.5 - longitude / 360
+    set_ayanamsa(ayanamsa)
+    ends, indices = solve_boundaries(midnight, midnight + 1, latitude, longitude,
+                                     DIVISIONS[division][0])
+    ends.flags.writeable = False
+    indices.flags.writeable = False
+    return ends, indices
+
+
+def lagna_boundaries(start_jd: float, end_jd: float, latitude: float, longitude: float, *,
+                     division: str = "sign", ayanamsa: str = "lahiri") -> tuple[np.ndarray, np.ndarray]:
+    """Return cached boundaries for every local day touching ``[start_jd, end_jd]``.
+
+    One day either side is included, so the division running at
+    ``start_jd`` and the one after ``end_jd`` have their end times. Leaves
+    the sidereal mode set to ``ayanamsa``.
+    """
+    if division not in DIVISIONS:
+        raise ValueError(f"Unknown division '{division}'")
+    lat, lon = round(latitude, COORD_DECIMALS), round(longitude, COORD_DECIMALS)
+    first, last = local_day(start_jd, lon) - 1, local_day(end_jd, lon) + 1
+    parts = [_day_boundaries(lat, lon, day, ayanamsa.lower(), division)
+             for day in range(first, last + 1)]
+    set_ayanamsa(ayanamsa)
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def lagna_table(day: int, latitude: float, longitude: float, *, divisions=("sign",),
+                ayanamsa: str = "lahiri") -> dict[str, list[dict]]:
+    """Return the rising divisions of a local mean day (see :func:`.sun_data.local_day`).
+
+    For each name in ``divisions`` the rows list every division risen
+    during the day with its full ``start``/``end`` Julian days, so the
+    first row may start the day before.
+    """
+    midnight = day - 0.5 - longitude / 360
+    table = {}
+    for division in divisions:
+        ends, indices = lagna_boundaries(midnight, midnight + 1, latitude, longitude,
+                                         division=division, ayanamsa=ayanamsa)
+        names = DIVISIONS[division][1]
+        first = int(np.searchsorted(ends, midnight, side="right"))
+        last = int(np.searchsorted(ends, midnight + 1, side="left"))
+        table[division] = [
+            {
+                "index": int(indices[j]) + 1,
+                "name": names[indices[j] % len(names)],
+                "start": float(ends[j - 1]) if j > 0 else math.nan,
+                "end": float(ends[j]),
+            }
+            for j in range(first, last + 1)
+        ]
+    return table
@@ -0,0 +1,215 @@
+"""Lunar months (masa): new and full moons and amanta/purnimanta naming.
+
+New and full moons are roots of the Moon-Sun elongation at 0 and 180
+degrees, bracketed from daily samples and refined with the Illinois solver
+of :mod:`.events`. An amanta month runs from one new moon to the next and
+takes its name from the Sun's sidereal sign at the new moon that starts
+it (Sun in Meena gives Chaitra). A month with no solar ingress (sankranti)
+is adhika and shares the name of the month after it; a month with two
+ingresses is kshaya and also covers (``merged``) the next name.
+
+Like the ingress table (:mod:`.event_table`), lunations for 1900-2100 are
+solved once (see ``backend/build_lunation_table.py``) and loaded from
+disk; other windows or ayanamsas are solved on demand.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .dasha import jd_to_datetime
+from .events import ephemeris, set_ayanamsa, solve, wrap_angle
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLE_FILE = Path(__file__).resolve().parent.parent / "data" / "lunation_table.npz"
+TABLE_VERSION = 1
+
+MASA_NAMES = [
+    "Chaitra",
+    "Vaishakha",
+    "Jyeshtha",
+    "Ashadha",
+    "Shravana",
+    "Bhadrapada",
+    "Ashwin",
+    "Kartika",
+    "Margashirsha",
+    "Pausha",
+    "Magha",
+    "Phalguna",
+]
+
+# Sampling step in days; elongation grows about 12 degrees a day, so a
+# step never holds two of the 180-degree boundaries.
+GRID_STEP = 1.0
+# Two of the longest lunations in days: a month overlapping a window may
+# start a lunation before it and needs the full moon before that.
+_LUNATION_PAD = 62.0
+_WINDOW_BLOCK = 366
+
+
+def solve_lunations(start_jd: float, end_jd: float) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(jd, phase)`` of new (0) and full (1) moons in the window.
+
+    The sidereal mode must already be set (see :func:`.events.set_ayanamsa`).
+    """
+    sun, moon = ephemeris("Sun"), ephemeris("Moon")
+
+    def elongation(t: float) -> float:
+        return (moon(t)[0] - sun(t)[0]) % 360
+
+    times = np.arange(start_jd, end_jd + GRID_STEP, GRID_STEP)
+    unwrapped = np.unwrap([elongation(t) for t in times], period=360.0)
+    halves = np.floor(unwrapped / 180.0)
+    roots, phases = [], []
+    for i in np.flatnonzero(np.diff(halves) > 0):
+        boundary = (halves[i] + 1) * 180.0
+        target = boundary % 360
+        t = solve(lambda x: wrap_angle(elongation(x) - target), times[i], times[i + 1],
+                  unwrapped[i] - boundary, unwrapped[i + 1] - boundary)
+        if start_jd <= t < end_jd:
+            roots.append(t)
+            phases.append(int(target == 180.0))
+    return np.array(roots), np.array(phases, dtype=np.int8)
+
+
+class LunationTable:
+    """New moons, full moons and the Sun's sign (1-12) at each new moon."""
+
+    def __init__(self, new_moons, full_moons, sun_signs, start_jd: float, end_jd: float,
+                 ayanamsa: str = "lahiri"):
+        self.new_moons = np.asarray(new_moons, dtype=np.float64)
+        self.full_moons = np.asarray(full_moons, dtype=np.float64)
+        self.sun_signs = np.asarray(sun_signs, dtype=np.int8)
+        self.start_jd = float(start_jd)
+        self.end_jd = float(end_jd)
+        self.ayanamsa = ayanamsa
+
+    def __len__(self) -> int:
+        return len(self.new_moons)
+
+    def save(self, path: str | Path) -> None:
+        np.savez_compressed(
+            path,
+            version=TABLE_VERSION,
+            new_moons=self.new_moons,
+            full_moons=self.full_moons,
+            sun_signs=self.sun_signs,
+            start_jd=self.start_jd,
+            end_jd=self.end_jd,
+            ayanamsa=self.ayanamsa,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LunationTable":
+        with np.load(path) as data:
+            if int(data["version"]) != TABLE_VERSION:
+                raise ValueError(f"Unsupported lunation table version in {path}")
+            return cls(
+                data["new_moons"],
+                data["full_moons"],
+                data["sun_signs"],
+                float(data["start_jd"]),
+                float(data["end_jd"]),
+                ayanamsa=str(data["ayanamsa"]),
+            )
+
+    def covers(self, start_jd: float, end_jd: float, ayanamsa: str = "lahiri") -> bool:
+        """True when every month overlapping the window is complete in the table."""
+        return (
+            self.start_jd + _LUNATION_PAD <= start_jd
+            and end_jd + _LUNATION_PAD <= self.end_jd
+            and self.ayanamsa == ayanamsa.lower()
+        )
+
+    def months(self, start_jd: float, end_jd: float) -> list[dict]:
+        """Return the amanta months overlapping ``[start_jd, end_jd)``."""
+        first = max(int(np.searchsorted(self.new_moons, start_jd, side="right")) - 1, 0)
+        last = int(np.searchsorted(self.new_moons, end_jd, side="left"))
+        result = []
+        for i in range(first, min(last, len(self) - 1)):
+            begin, finish = self.new_moons[i], self.new_moons[i + 1]
+            sign, next_sign = int(self.sun_signs[i]), int(self.sun_signs[i + 1])
+            full = self.full_moons[np.searchsorted(self.full_moons, begin)]
+            previous_full = self.full_moons[np.searchsorted(self.full_moons, begin) - 1]
+            ingresses = (next_sign - sign) % 12
+            result.append({
+                "index": sign % 12 + 1,
+                "name": MASA_NAMES[sign % 12],
+                "adhika": ingresses == 0,
+                "kshaya": ingresses == 2,
+                "merged": MASA_NAMES[(sign + 1) % 12] if ingresses == 2 else None,
+                "start": jd_to_datetime(begin),
+                "end": jd_to_datetime(finish),
+                "full_moon": jd_to_datetime(full),
+                "purnimanta_start": jd_to_datetime(previous_full),
+                "start_jd": float(begin),
+                "end_jd": float(finish),
+            })
+        return result
+
+    def month_at(self, jd: float) -> dict:
+        """Return the amanta month running at ``jd``."""
+        return self.months(jd, jd)[0]
+
+
+def build_lunation_table(start_jd: float, end_jd: float, *, ayanamsa: str = "lahiri") -> LunationTable:
+    """Solve every new and full moon in ``[start_jd, end_jd)`` into a table."""
+    set_ayanamsa(ayanamsa)
+    roots, phases = solve_lunations(start_jd, end_jd)
+    new_moons = roots[phases == 0]
+    sun = ephemeris("Sun")
+    signs = np.array([int(sun(t)[0] // 30) + 1 for t in new_moons], dtype=np.int8)
+    return LunationTable(new_moons, roots[phases == 1], signs, start_jd, end_jd,
+                         ayanamsa=ayanamsa.lower())
+
+
+@lru_cache(maxsize=1)
+def get_lunation_table() -> Optional[LunationTable]:
+    """Load the precomputed table from ``$LUNATION_TABLE_FILE`` or the default path."""
+    path = Path(os.getenv("LUNATION_TABLE_FILE") or DEFAULT_TABLE_FILE)
+    if not path.exists():
+        logger.warning("Lunation table %s not found; months will be solved per request", path)
+        return None
+    table = LunationTable.load(path)
+    logger.info("Loaded %d new moons from %s", len(table), path)
+    return table
+
+
+@lru_cache(maxsize=16)
+def _window_table(first_block: int, last_block: int, ayanamsa: str) -> LunationTable:
+    return build_lunation_table(
+        first_block * _WINDOW_BLOCK - _LUNATION_PAD,
+        (last_block + 1) * _WINDOW_BLOCK + _LUNATION_PAD,
+        ayanamsa=ayanamsa,
+    )
+
+
+def lunation_table_for(start_jd: float, end_jd: float, *, ayanamsa: str = "lahiri") -> LunationTable:
+    """Return a table covering the window, preferring the precomputed one."""
+    table = get_lunation_table()
+    if table is not None and table.covers(start_jd, end_jd, ayanamsa):
+        return table
+    return _window_table(
+        math.floor(start_jd / _WINDOW_BLOCK),
+        math.floor(end_jd / _WINDOW_BLOCK),
+        ayanamsa.lower(),
+    )
+
+
+def lunar_months(start_jd: float, end_jd: float, *, ayanamsa: str = "lahiri") -> list[dict]:
+    """Return the amanta months overlapping a window, with adhika/kshaya flags."""
+    return lunation_table_for(start_jd, end_jd, ayanamsa=ayanamsa).months(start_jd, end_jd)
+
+
+def masa_at(jd: float, *, ayanamsa: str = "lahiri") -> dict:
+    """Return the amanta month running at ``jd``."""
+    return lunation_table_for(jd, jd, ayanamsa=ayanamsa).month_at(jd)
@@ -0,0 +1,160 @@
+"""Muhurta search: the windows of a date range where a rule set holds.
+
+Every rule becomes an interval set and the sets are intersected
+(:mod:`.intervals`). Tithi, nakshatra and karana spans come from the
+element solver of :mod:`.panchanga_calendar`, Vedic weekdays and Rahu
+Kalam from the batched sunrises of :mod:`.sun_data`, and the rising sign
+from the cached lagna table of :mod:`.lagna`. No rule is sampled minute by minute, so
+every window edge is an event time.
+
+The range is searched in blocks of :data:`BLOCK_DAYS` days and windows
+are yielded as each block finishes.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterator, Optional
+
+import numpy as np
+import pytz
+
+from .constants import RASHI_METADATA
+from .events import ephemeris, set_ayanamsa
+from .hora import divide_day
+from .intervals import intersect, labelled_spans, labels_between, normalize, select, subtract
+from .lagna import lagna_boundaries
+from .panchanga import VAARA_NAMES
+from .panchanga_calendar import ELEMENTS, GRID_STEP, MARGIN_DAYS, element_ends, local_time
+from .sun_data import day_number, sun_times_range
+
+BLOCK_DAYS = 30
+
+WEEKDAY_NAMES = [VAARA_NAMES[(d - 1) % 7] for d in range(7)]  # from Sunday
+LAGNA_NAMES = [meta["name"] for meta in RASHI_METADATA]
+
+
+@dataclass(frozen=True)
+class MuhurtaRules:
+    """Allowed values (``None`` allows any) and exclusions for a search.
+
+    Tithis are numbered 1-30 from Shukla Pratipada, nakshatras 1-27 from
+    Ashwini, weekdays 0-6 from Sunday and lagnas 1-12 from Mesha.
+    """
+
+    tithis: Optional[frozenset] = None
+    nakshatras: Optional[frozenset] = None
+    weekdays: Optional[frozenset] = None
+    lagnas: Optional[frozenset] = None
+    exclude_rahu_kalam: bool = True
+    exclude_vishti: bool = True
+    min_minutes: float = 0.0
+
+
+def _search_block(first_day: int, last_day: int, latitude: float, longitude: float,
+                  rules: MuhurtaRules, ayanamsa: str) -> list[tuple[float, float, dict]]:
+    """Return ``(start, end, labels)`` windows for local days ``first_day..last_day``."""
+    sun_times = sun_times_range(latitude, longitude, first_day, last_day + 1)
+    rises, sets = sun_times["sunrise"], sun_times["sunset"]
+    if np.isnan(rises).any() or np.isnan(sets[:-1]).any():
+        raise ValueError("The Sun does not rise or set at this location on some day of the range")
+    start, end = float(rises[0]), float(rises[-1])
+
+    sun_position, moon_position = ephemeris("Sun"), ephemeris("Moon")
+    sun_at = lambda t: sun_position(t)[0]
+    moon_at = lambda t: moon_position(t)[0]
+    times = np.arange(start - GRID_STEP, end + MARGIN_DAYS, GRID_STEP)
+    sun = np.array([sun_at(t) for t in times])
+    moon = np.array([moon_at(t) for t in times])
+
+    spans = {
+        name: labelled_spans(start, end, *element_ends(name, times, sun, moon, sun_at, moon_at))
+        for name in ("tithi", "nakshatra", "karana")
+    }
+    weekdays = (np.arange(first_day, last_day + 1) + 1) % 7
+    spans["vaara"] = (rises, weekdays)
+    if rules.lagnas is not None:
+        spans["lagna"] = labelled_spans(start, end, *lagna_boundaries(start, end, latitude, longitude,
+                                                                      ayanamsa=ayanamsa))
+
+    windows = normalize([(start, end)])
+    for name, allowed, offset in (("tithi", rules.tithis, 1), ("nakshatra", rules.nakshatras, 1),
+                                  ("vaara", rules.weekdays, 0), ("lagna", rules.lagnas, 1)):
+        if allowed is not None:
+            edges, labels = spans[name]
+            windows = intersect(windows, select(edges, labels + offset, allowed))
+    if rules.exclude_vishti:
+        edges, labels = spans["karana"]
+        vishti = [i for i, n in enumerate(ELEMENTS["karana"][1]) if n == "Vishti"]
+        windows = subtract(windows, select(edges, labels, vishti))
+    if rules.exclude_rahu_kalam:
+        rahu = [divide_day(rises[i], sets[i], rises[i + 1], weekdays[i])["rahu_kalam"]
+                for i in range(len(weekdays))]
+        windows = subtract(windows, [(r["start"], r["end"]) for r in rahu])
+
+    names = {"tithi": ELEMENTS["tithi"][1], "nakshatra": ELEMENTS["nakshatra"][1],
+             "vaara": WEEKDAY_NAMES, "lagna": LAGNA_NAMES}
+    return [
+        (float(s), float(e), {
+            name: [names[name][k] for k in labels_between(*spans[name], s, e)]
+            for name in names if name in spans
+        })
+        for s, e in windows
+    ]
+
+
+def iter_muhurtas(start: date, end: date, latitude: float, longitude: float, timezone: str,
+                  rules: MuhurtaRules, *, ayanamsa: str = "lahiri") -> Iterator[dict]:
+    """Yield the windows between the sunrises of ``start`` and the day after ``end``.
+
+    Windows come in time order, one block of days at a time. Times are ISO
+    strings local to ``timezone``. Raises ``ValueError`` for an unknown
+    timezone or when the Sun does not rise or set on some day.
+    """
+    try:
+        tz = pytz.timezone(timezone)
+    except pytz.UnknownTimeZoneError as exc:
+        raise ValueError(f"Invalid timezone '{timezone}'") from exc
+
+    def emit(window):
+        s, e, labels = window
+        minutes = (e - s) * 1440
+        if minutes < rules.min_minutes:
+            return None
+        return {
+            "start": local_time(s, tz).isoformat(timespec="seconds"),
+            "end": local_time(e, tz).isoformat(timespec="seconds"),
+            "minutes": round(minutes, 1),
+            **labels,
+        }
+
+    set_ayanamsa(ayanamsa)
+    first, last = day_number(start), day_number(end)
+    pending = None
+    for block in range(first, last + 1, BLOCK_DAYS):
+        windows = _search_block(block, min(block + BLOCK_DAYS - 1, last), latitude, longitude, rules,
+                                ayanamsa)
+        # A window running into the next block is held back and joined up.
+        if pending is not None and windows and windows[0][0] <= pending[1]:
+            s, e, labels = windows.pop(0)
+            merged = {k: list(dict.fromkeys(pending[2][k] + labels[k])) for k in labels}
+            windows.insert(0, (pending[0], e, merged))
+        elif pending is not None and (item := emit(pending)):
+            yield item
+        pending = windows.pop() if windows else None
+        for window in windows:
+            if item := emit(window):
+                yield item
+    if pending is not None and (item := emit(pending)):
+        yield item
+
+
+def search_muhurtas(start: date, end: date, latitude: float, longitude: float, timezone: str,
+                    rules: MuhurtaRules, *, ayanamsa: str = "lahiri", limit: int = 20) -> list[dict]:
+    """Return the ``limit`` longest windows, best first, each with its ``rank``."""
+    best = heapq.nlargest(limit, iter_muhurtas(start, end, latitude, longitude, timezone, rules,
+                                               ayanamsa=ayanamsa),
+                          key=lambda w: w["minutes"])
+    return [{"rank": i + 1, **w} for i, w in enumerate(best)]
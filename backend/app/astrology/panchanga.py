@@ -72,10 +72,13 @@ YOGA_NAMES = [
     "Vaidhriti",
 ]
 
-# Sequence of 60 karanas within a lunar month
-_KARANA_SEQUENCE = (
-    ["Bava", "Balava", "Kaulava", "Taitila", "Garaja", "Vanija", "Vishti"] * 8
-    + ["Shakuni", "Chatushpada", "Naga", "Kimstughna"]
+# Sequence of 60 karanas within a lunar month: the fixed Kimstughna takes
+# the first half of Shukla Pratipada, the seven movable karanas repeat
+# eight times and the other fixed ones close Krishna Chaturdashi and Amavasya.
+KARANA_SEQUENCE = (
+    ["Kimstughna"]
+    + ["Bava", "Balava", "Kaulava", "Taitila", "Garaja", "Vanija", "Vishti"] * 8
+    + ["Shakuni", "Chatushpada", "Naga"]
 )
 
 VAARA_NAMES = [
@@ -122,7 +125,7 @@ def get_karana(sun_lon: float, moon_lon: float) -> Dict:
     diff = (moon_lon - sun_lon) % 360
     index = int(diff // 6)
     frac = (diff % 6) / 6
-    name = _KARANA_SEQUENCE[index]
+    name = KARANA_SEQUENCE[index]
     return {"index": index + 1, "name": name, "fraction": frac}
 
 
@@ -0,0 +1,133 @@
+"""Panchanga month calendar anchored to sunrise.
+
+For every civil day of a month the calendar gives the udaya panchanga --
+the amanta masa and the tithi, nakshatra, yoga and karana running at local
+sunrise -- with the time each element ends, followed by any element that
+begins before the next sunrise.
+
+Sunrises come from the batch sunrise cache (:mod:`.sun_data`), and Sun
+and Moon are sampled once on a grid covering the whole month. Every
+element is a monotonic function of their longitudes, so its boundaries are
+bracketed from the samples and refined with the Illinois solver of
+:mod:`.events`.
+"""
+
+from __future__ import annotations
+
+import calendar
+from datetime import date, datetime
+
+import numpy as np
+import pytz
+
+from .constants import NAKSHATRA_METADATA
+from .dasha import jd_to_datetime
+from .events import NAKSHATRA_SPAN, ephemeris, set_ayanamsa, solve, wrap_angle
+from .masa import lunar_months
+from .panchanga import KARANA_SEQUENCE, TITHI_NAMES, YOGA_NAMES, get_vaara
+from .sun_data import day_number, sun_times_range
+
+# Element: (span in degrees, names).
+ELEMENTS = {
+    "tithi": (12.0, TITHI_NAMES),
+    "nakshatra": (NAKSHATRA_SPAN, [meta["name"] for meta in NAKSHATRA_METADATA]),
+    "yoga": (NAKSHATRA_SPAN, YOGA_NAMES),
+    "karana": (6.0, KARANA_SEQUENCE),
+}
+
+# Sampling step in days. The fastest element (a karana, 6 degrees of
+# elongation) lasts well over half a day, so no step holds two boundaries.
+GRID_STEP = 0.25
+# Days sampled past the month so the last day's elements have end times.
+MARGIN_DAYS = 3
+
+
+def element_angle(element: str, sun, moon):
+    """Return the angle (degrees) whose ``span`` divisions number ``element``."""
+    if element in ("tithi", "karana"):
+        return np.mod(np.subtract(moon, sun), 360.0)
+    if element == "nakshatra":
+        return np.mod(moon, 360.0)
+    return np.mod(np.add(sun, moon), 360.0)
+
+
+def local_time(jd: float, tz) -> datetime:
+    return pytz.utc.localize(jd_to_datetime(jd)).astimezone(tz)
+
+
+def element_ends(element: str, times: np.ndarray, sun: np.ndarray, moon: np.ndarray,
+                 sun_at, moon_at) -> tuple[np.ndarray, np.ndarray]:
+    """Return the end times of ``element`` over a sample grid.
+
+    ``sun``/``moon`` are sidereal longitudes at ``times``; ``sun_at`` and
+    ``moon_at`` evaluate a longitude at any Julian day. The second array
+    holds the 0-based index of the element that ends at each time.
+    """
+    span, names = ELEMENTS[element]
+    unwrapped = np.unwrap(element_angle(element, sun, moon), period=360.0)
+    counts = np.floor(unwrapped / span)
+    ends, indices = [], []
+    for i in np.flatnonzero(np.diff(counts) > 0):
+        boundary = (counts[i] + 1) * span
+        target = boundary % 360
+
+        def offset(t):
+            return wrap_angle(float(element_angle(element, sun_at(t), moon_at(t))) - target)
+
+        ends.append(solve(offset, times[i], times[i + 1],
+                          unwrapped[i] - boundary, unwrapped[i + 1] - boundary))
+        indices.append(int(counts[i]) % len(names))
+    return np.array(ends), np.array(indices, dtype=np.intp)
+
+
+def month_calendar(year: int, month: int, latitude: float, longitude: float, timezone: str,
+                   *, ayanamsa: str = "lahiri") -> list[dict]:
+    """Return the udaya panchanga and element end times for each day of a month.
+
+    Times are ISO strings local to ``timezone``. Raises ``ValueError`` for
+    an unknown timezone or when the Sun does not rise on some day.
+    """
+    try:
+        tz = pytz.timezone(timezone)
+    except pytz.UnknownTimeZoneError as exc:
+        raise ValueError(f"Invalid timezone '{timezone}'") from exc
+
+    days = [date(year, month, d) for d in range(1, calendar.monthrange(year, month)[1] + 1)]
+    first = day_number(days[0])
+    sunrises = sun_times_range(latitude, longitude, first, first + len(days))["sunrise"]
+    if np.isnan(sunrises).any():
+        raise ValueError("The Sun does not rise at this location on some day of the month")
+
+    set_ayanamsa(ayanamsa)
+    sun_position, moon_position = ephemeris("Sun"), ephemeris("Moon")
+    sun_at = lambda t: sun_position(t)[0]
+    moon_at = lambda t: moon_position(t)[0]
+    times = np.arange(sunrises[0] - GRID_STEP, sunrises[-1] + MARGIN_DAYS, GRID_STEP)
+    sun = np.array([sun_at(t) for t in times])
+    moon = np.array([moon_at(t) for t in times])
+
+    ends = {name: element_ends(name, times, sun, moon, sun_at, moon_at) for name in ELEMENTS}
+    months = lunar_months(sunrises[0], sunrises[-1], ayanamsa=ayanamsa)
+    month_starts = np.array([m["start_jd"] for m in months])
+
+    result = []
+    for d, rise, next_rise in zip(days, sunrises, sunrises[1:]):
+        local_rise = local_time(rise, tz)
+        masa = months[int(np.searchsorted(month_starts, rise, side="right")) - 1]
+        entry = {"date": d.isoformat(), "vaara": get_vaara(local_rise),
+                 "sunrise": local_rise.isoformat(timespec="seconds"),
+                 "masa": {"name": masa["name"], "adhika": masa["adhika"]}}
+        for name, (_, names) in ELEMENTS.items():
+            end_times, indices = ends[name]
+            first = int(np.searchsorted(end_times, rise, side="right"))
+            last = int(np.searchsorted(end_times, next_rise, side="left"))
+            entry[name] = [
+                {
+                    "index": int(indices[j]) + 1,
+                    "name": names[indices[j]],
+                    "end": local_time(end_times[j], tz).isoformat(timespec="seconds"),
+                }
+                for j in range(first, min(last + 1, len(end_times)))
+            ]
+        result.append(entry)
+    return result
@@ -0,0 +1,133 @@
+"""Birth-time rectification: the spans of a time window with the same chart keys.
+
+Within a window the lagna, the navamsa (D9) lagna, the Moon's nakshatra
+and pada and the Vimshottari dasha running at birth (mahadasha and
+antardasha) only change at boundary crossings. Ascendant crossings come
+from the cached navamsa table of :mod:`.lagna` -- every ninth navamsa
+boundary is also a sign boundary -- and the Moon's pada and antardasha
+boundaries are solved directly, so a window is split at a few dozen
+solved instants instead of being sampled minute by minute.
+
+The mahadasha and its balance come from :class:`.dasha.VimshottariDasha`,
+as in the profile. The antardasha is the one running at birth within the
+full mahadasha, found from the part of the nakshatra the Moon has
+traversed: the classical balance of dasha that rectification compares
+against known events.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+
+import numpy as np
+
+from .constants import NAKSHATRA_METADATA, RASHI_METADATA
+from .dasha import DASHA_YEARS, DAYS_PER_YEAR, NAKSHATRA_SPAN, ORDER, VIMSHOTTARI, VimshottariDasha
+from .events import ephemeris, set_ayanamsa, solve, wrap_angle
+from .lagna import ascendant, lagna_boundaries
+
+PADA_SPAN = NAKSHATRA_SPAN / 4
+_SIGN_NAMES = [meta["name"] for meta in RASHI_METADATA]
+
+# Moon longitudes where a pada or the birth antardasha changes.
+_MOON_CUTS = np.unique(np.concatenate([
+    np.arange(108) * PADA_SPAN,
+    *[(n + np.array(VIMSHOTTARI.offsets[n % len(ORDER)][1:-1])) * NAKSHATRA_SPAN
+      for n in range(27)],
+]))
+
+
+def _moon_boundaries(start_jd: float, end_jd: float) -> list[float]:
+    """Return when the Moon crosses a pada or antardasha boundary in the window."""
+    moon = ephemeris("Moon")
+    first = moon(start_jd)[0]
+    # The Moon never stations, so its longitude grows through the window.
+    last = first + wrap_angle(moon(end_jd)[0] - first) % 360
+    crossings = np.concatenate([_MOON_CUTS, _MOON_CUTS + 360])
+    crossings = crossings[(crossings > first) & (crossings < last)]
+
+    def offset(t: float, target: float) -> float:
+        return wrap_angle(moon(t)[0] - target)
+
+    return [
+        solve(lambda t: offset(t, target % 360), start_jd, end_jd, first - target, last - target)
+        for target in crossings
+    ]
+
+
+def birth_dasha(moon: float, jd: float) -> dict:
+    """Return the Vimshottari maha/antardasha at birth and the years of the mahadasha left.
+
+    The antardasha is the one running after the elapsed part of the full
+    mahadasha, i.e. the part of the nakshatra the Moon has traversed.
+    """
+    (maha,) = VimshottariDasha(moon, jd).active_at(jd, depth=1)
+    balance = (maha.end_jd - jd) / DAYS_PER_YEAR
+    lord = ORDER.index(maha.lord)
+    elapsed = 1 - balance / DASHA_YEARS[maha.lord]
+    k = min(bisect_right(VIMSHOTTARI.offsets[lord], elapsed), len(ORDER)) - 1
+    return {
+        "mahadasha": maha.lord,
+        "antardasha": ORDER[VIMSHOTTARI.sub_lords[lord][k]],
+        "balance_years": balance,
+    }
+
+
+def _keys(asc: float, moon: float, jd: float) -> dict:
+    """Return the rectification keys for an ascendant and Moon longitude at ``jd``."""
+    navamsa = int(asc // (10 / 3)) % 108
+    nakshatra = int(moon // NAKSHATRA_SPAN) % 27
+    dasha = birth_dasha(moon, jd)
+    return {
+        "lagna": _SIGN_NAMES[navamsa // 9],
+        "navamsa_lagna": _SIGN_NAMES[navamsa % 12],
+        "nakshatra": NAKSHATRA_METADATA[nakshatra]["name"],
+        "pada": int((moon % NAKSHATRA_SPAN) // PADA_SPAN) + 1,
+        "mahadasha": dasha["mahadasha"],
+        "antardasha": dasha["antardasha"],
+    }
+
+
+def rectification_intervals(start_jd: float, end_jd: float, latitude: float, longitude: float, *,
+                            ayanamsa: str = "lahiri") -> list[dict]:
+    """Split ``[start_jd, end_jd)`` where any rectification key changes.
+
+    Each interval has ``start``/``end`` Julian days, the keys holding
+    throughout it, the dasha balance in years at both ends and
+    ``changed``: the keys that differ from the previous interval.
+    """
+    asc_ends, _ = lagna_boundaries(start_jd, end_jd, latitude, longitude,
+                                   division="navamsa", ayanamsa=ayanamsa)
+    set_ayanamsa(ayanamsa)
+    moon = ephemeris("Moon")
+    cuts = np.concatenate([asc_ends, _moon_boundaries(start_jd, end_jd)])
+    edges = np.unique(np.concatenate([[start_jd], cuts[(cuts > start_jd) & (cuts < end_jd)], [end_jd]]))
+
+    def balance(jd: float, mahadasha: str, at_start: bool) -> float:
+        # On a nakshatra boundary the Moon may sit just across it: the
+        # mahadasha is then whole at the start of a span and spent at its end.
+        dasha = birth_dasha(moon(jd)[0], jd)
+        if dasha["mahadasha"] == mahadasha:
+            return dasha["balance_years"]
+        return float(DASHA_YEARS[mahadasha]) if at_start else 0.0
+
+    result = []
+    previous = None
+    for begin, finish in zip(edges[:-1], edges[1:]):
+        middle = (begin + finish) / 2
+        keys = _keys(ascendant(middle, latitude, longitude), moon(middle)[0], middle)
+        if previous == keys:
+            # Boundaries of a key not reported (e.g. a Moon sign change) split nothing.
+            result[-1]["end"] = float(finish)
+            result[-1]["balance_years"][1] = balance(finish, keys["mahadasha"], False)
+            continue
+        result.append({
+            "start": float(begin),
+            "end": float(finish),
+            **keys,
+            "balance_years": [balance(begin, keys["mahadasha"], True),
+                              balance(finish, keys["mahadasha"], False)],
+            "changed": [] if previous is None else [k for k in keys if keys[k] != previous[k]],
+        })
+        previous = keys
+    return result
@@ -2,15 +2,84 @@
 """
 Calculate Shadbala (six-fold strength) of planets.
 This is crucial for determining which planets will give strong results.
+
+Every component is computed as an array over the seven grahas present in
+the chart, and sunrise/sunset are looked up once per chart.
 """
 
 import math
-from datetime import datetime
+
+import numpy as np
 import swisseph as swe
 
 from app.utils.signs import get_sign_lord
 
-def calculate_shadbala(planets, birth_info, houses):
+from .aspects import sphuta_drishti
+
+SHADBALA_PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+_INDEX = {name: i for i, name in enumerate(SHADBALA_PLANETS)}
+_PLANET_IDS = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN]
+
+# Exaltation sign and degree.
+EXALTATION_SIGN = np.array([1, 2, 10, 6, 4, 12, 7])
+EXALTATION_DEGREE = np.array([10, 3, 28, 15, 5, 27, 20])
+
+OWN_SIGNS = {
+    'Sun': [5],
+    'Moon': [4],
+    'Mars': [1, 8],
+    'Mercury': [3, 6],
+    'Jupiter': [9, 12],
+    'Venus': [2, 7],
+    'Saturn': [10, 11],
+}
+FRIENDS = {
+    'Sun': ['Moon', 'Mars', 'Jupiter'],
+    'Moon': ['Sun', 'Mercury'],
+    'Mars': ['Sun', 'Moon', 'Jupiter'],
+    'Mercury': ['Sun', 'Venus'],
+    'Jupiter': ['Sun', 'Moon', 'Mars'],
+    'Venus': ['Mercury', 'Saturn'],
+    'Saturn': ['Mercury', 'Venus'],
+}
+# (7, 12) masks indexed by sign - 1.
+_OWN = np.zeros((7, 12), dtype=bool)
+_FRIEND = np.zeros((7, 12), dtype=bool)
+for _name, _i in _INDEX.items():
+    _OWN[_i, np.array(OWN_SIGNS[_name]) - 1] = True
+    for _friend in FRIENDS[_name]:
+        _FRIEND[_i, np.array(OWN_SIGNS[_friend]) - 1] = True
+
+DIG_BALA_HOUSE = np.array([10, 4, 10, 1, 1, 4, 7])
+NAISARGIKA_BALA = np.array([60, 51.43, 17.14, 25.71, 34.29, 42.86, 8.57])
+REQUIRED_STRENGTH = np.array([340, 360, 300, 420, 390, 330, 300])
+
+DAY_STRONG = np.array([True, False, False, False, True, True, False])
+NIGHT_STRONG = np.array([False, True, True, False, False, False, True])
+NATURAL_BENEFIC = np.array([False, True, False, True, True, True, False])
+
+# Vedic weekday lords, 0 = Sunday.
+WEEKDAY_LORDS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+# Each hora is ruled by the next planet in this (Chaldean) order.
+HORA_ORDER = ["Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon"]
+# Rulers of the thirds of the day and of the night; Jupiter always gains.
+DAY_THIRDS = ["Mercury", "Sun", "Saturn"]
+NIGHT_THIRDS = ["Moon", "Venus", "Mars"]
+
+# Ahargana epoch: day number (JD at noon) of the Kali Yuga sunrise.
+KALI_EPOCH_DAY = 588466
+OBLIQUITY = 23.44
+
+# Extremes of daily motion (degrees/day) used to scale Chesta Bala.
+SPEED_RANGE = {
+    'Mars': (-0.40, 0.79),
+    'Mercury': (-1.40, 2.20),
+    'Jupiter': (-0.14, 0.25),
+    'Venus': (-0.65, 1.27),
+    'Saturn': (-0.08, 0.13),
+}
+
+def calculate_shadbala(planets, birth_info, houses, aspects=None):
     """
     Calculate six types of planetary strength:
     1. Sthana Bala (Positional Strength)
@@ -19,300 +88,315 @@ def calculate_shadbala(planets, birth_info, houses):
     4. Chesta Bala (Motional Strength)
     5. Naisargika Bala (Natural Strength)
     6. Drik Bala (Aspectual Strength)
+
+    ``aspects`` may be a degree-based :class:`~.aspects.AspectMatrix`
+    already built for the chart.
     """
-    
+    grahas = [p for p in planets if p['name'] in _INDEX]
+    if not grahas:
+        return {}
+    bala = shadbala_arrays(grahas, birth_info, houses, planets, aspects)
+
     shadbala = {}
-    
-    for planet in planets:
-        if planet['name'] in ['Rahu', 'Ketu']:
-            continue  # Nodes don't have Shadbala
-            
-        strength = {
-            'sthana_bala': calculate_sthana_bala(planet, planets),
-            'dig_bala': calculate_dig_bala(planet, houses),
-            'kala_bala': calculate_kala_bala(planet, birth_info, planets),
-            'chesta_bala': calculate_chesta_bala(planet),
-            'naisargika_bala': get_naisargika_bala(planet['name']),
-            'drik_bala': 0  # Would need aspect calculations
-        }
-        
-        # Total strength in Rupas
-        strength['total'] = sum(strength.values())
-        
-        # Required strength for planet to give good results
-        strength['required'] = get_required_strength(planet['name'])
-        strength['is_strong'] = strength['total'] >= strength['required']
-        
+    for i, planet in enumerate(grahas):
+        strength = {key: float(bala[key][i]) for key in (
+            'sthana_bala', 'dig_bala', 'kala_bala', 'chesta_bala',
+            'naisargika_bala', 'drik_bala',
+        )}
+        strength['total'] = float(bala['total'][i])
+        strength['required'] = int(bala['required'][i])
+        strength['is_strong'] = bool(bala['is_strong'][i])
         shadbala[planet['name']] = strength
-    
     return shadbala
 
-def calculate_sthana_bala(planet, all_planets):
+
+def shadbala_arrays(grahas, birth_info, houses, planets=None, aspects=None):
+    """Return every Shadbala component as an array aligned with ``grahas``.
+
+    ``grahas`` must only contain the seven planets; ``planets`` (defaulting
+    to ``grahas``) is searched for the Sun and Moon.
+    """
+    idx = np.array([_INDEX[p['name']] for p in grahas])
+    sun_times = _sun_times(birth_info)
+    elongation = _moon_elongation(planets or grahas, birth_info)
+
+    kala = _kala_bala(idx, birth_info, sun_times)
+    ayana = _ayana_bala(idx, grahas, birth_info)
+    paksha = _paksha_bala(idx, elongation)
+    bala = {
+        'sthana_bala': _sthana_bala(idx, grahas),
+        'dig_bala': _dig_bala(idx, grahas, houses),
+        'kala_bala': kala + paksha + ayana,
+        'chesta_bala': _chesta_bala(idx, grahas, birth_info, ayana, paksha),
+        'naisargika_bala': NAISARGIKA_BALA[idx],
+        'drik_bala': _drik_bala(grahas, elongation, aspects),
+    }
+    bala['total'] = sum(bala.values())
+    bala['required'] = REQUIRED_STRENGTH[idx]
+    bala['is_strong'] = bala['total'] >= bala['required']
+    return bala
+
+
+def _longitude(planet):
+    if 'longitude' in planet:
+        return planet['longitude']
+    return (planet['sign'] - 1) * 30 + planet.get('degree', 0)
+
+
+def _ephemeris_longitude(jd, pid, birth_info):
+    values, _ = swe.calc_ut(jd, pid)
+    return (values[0] - birth_info.get('sidereal_offset', 0)) % 360
+
+
+def _moon_elongation(planets, birth_info):
+    """Angle of the Moon ahead of the Sun (0-360)."""
+    found = {p['name']: _longitude(p) for p in planets if p['name'] in ('Sun', 'Moon')}
+    jd = birth_info.get('jd_ut', 0)
+    sun = found.get('Sun')
+    moon = found.get('Moon')
+    if sun is None:
+        sun = _ephemeris_longitude(jd, swe.SUN, birth_info)
+    if moon is None:
+        moon = _ephemeris_longitude(jd, swe.MOON, birth_info)
+    return (moon - sun) % 360
+
+
+def _sun_times(birth_info):
+    """Sunrise data for the chart, or ``None`` when it cannot be found."""
+    from .sun_data import get_sun_times
+
+    try:
+        return get_sun_times(
+            birth_info.get('jd_ut', 0),
+            birth_info.get('latitude', 0),
+            birth_info.get('longitude', 0),
+        )
+    except Exception:
+        return None
+
+
+def _sthana_bala(idx, grahas):
     """
     Positional Strength based on:
     - Exaltation/Debilitation
     - Own sign/Friendly sign
-    - Placement in divisions
-    """
-    points = 0
-    sign = planet['sign']
-    name = planet['name']
-    
-    # Exaltation points (max 60)
-    exaltation_data = {
-        'Sun': {'sign': 1, 'degree': 10},      # Aries 10°
-        'Moon': {'sign': 2, 'degree': 3},      # Taurus 3°
-        'Mars': {'sign': 10, 'degree': 28},    # Capricorn 28°
-        'Mercury': {'sign': 6, 'degree': 15},  # Virgo 15°
-        'Jupiter': {'sign': 4, 'degree': 5},   # Cancer 5°
-        'Venus': {'sign': 12, 'degree': 27},   # Pisces 27°
-        'Saturn': {'sign': 7, 'degree': 20}    # Libra 20°
-    }
-    
-    if name in exaltation_data:
-        exalt = exaltation_data[name]
-        if sign == exalt['sign']:
-            # Calculate based on proximity to exact exaltation degree
-            deg_diff = abs(planet['degree'] - exalt['degree'])
-            points += max(0, 60 - (deg_diff * 2))
-        elif sign == ((exalt['sign'] + 5) % 12) + 1:  # Debilitation
-            deg_diff = abs(planet['degree'] - exalt['degree'])
-            points -= max(0, 60 - (deg_diff * 2))
-    
-    # Own sign strength (30 points)
-    own_signs = {
-        'Sun': [5],           # Leo
-        'Moon': [4],          # Cancer
-        'Mars': [1, 8],       # Aries, Scorpio
-        'Mercury': [3, 6],    # Gemini, Virgo
-        'Jupiter': [9, 12],   # Sagittarius, Pisces
-        'Venus': [2, 7],      # Taurus, Libra
-        'Saturn': [10, 11]    # Capricorn, Aquarius
-    }
-    
-    if sign in own_signs.get(name, []):
-        points += 30
-    
-    # Friendly sign (15 points) - simplified
-    friends = {
-        'Sun': ['Moon', 'Mars', 'Jupiter'],
-        'Moon': ['Sun', 'Mercury'],
-        'Mars': ['Sun', 'Moon', 'Jupiter'],
-        'Mercury': ['Sun', 'Venus'],
-        'Jupiter': ['Sun', 'Moon', 'Mars'],
-        'Venus': ['Mercury', 'Saturn'],
-        'Saturn': ['Mercury', 'Venus']
-    }
-    
-    # Check if in friend's sign
-    for friend in friends.get(name, []):
-        friend_signs = own_signs.get(friend, [])
-        if sign in friend_signs:
-            points += 15
-            break
-    
-    return max(0, points)  # Don't go below 0
-
-def calculate_dig_bala(planet, houses):
     """
-    Directional Strength based on house placement.
-    Planets gain strength in certain houses.
-    """
-    dig_bala_houses = {
-        'Sun': 10,      # 10th house (Zenith)
-        'Moon': 4,      # 4th house (Nadir)
-        'Mars': 10,     # 10th house
-        'Mercury': 1,   # 1st house (Ascendant)
-        'Jupiter': 1,   # 1st house
-        'Venus': 4,     # 4th house
-        'Saturn': 7     # 7th house (Descendant)
-    }
-    
-    # Find planet's house
-    planet_house = None
-    for house_num, occupants in houses['houses'].items():
-        if planet['name'] in occupants:
-            planet_house = house_num
-            break
-    
-    if not planet_house:
-        return 0
-    
-    # Maximum dig bala when in ideal house
-    ideal_house = dig_bala_houses.get(planet['name'])
-    if planet_house == ideal_house:
-        return 60
-    
-    # Calculate based on distance from ideal house
-    distance = min(
-        abs(planet_house - ideal_house),
-        12 - abs(planet_house - ideal_house)
-    )
-    
-    return max(0, 60 - (distance * 10))
+    signs = np.array([p['sign'] for p in grahas])
+    degrees = np.array([p.get('degree', 0) for p in grahas])
 
-def calculate_kala_bala(planet, birth_info, planets=None):
-    """Return temporal strength for a planet.
+    closeness = np.maximum(0, 60 - np.abs(degrees - EXALTATION_DEGREE[idx]) * 2)
+    exalted = signs == EXALTATION_SIGN[idx]
+    debilitated = signs == (EXALTATION_SIGN[idx] + 5) % 12 + 1
+    points = np.where(exalted, closeness, 0) - np.where(debilitated, closeness, 0)
+    points = points + 30 * _OWN[idx, signs - 1] + 15 * _FRIEND[idx, signs - 1]
+    return np.maximum(0, points)
+
+
+def _occupants(house):
+    """Occupants of a house given as a list or as an ``analyze_houses`` entry."""
+    return house.get('occupants', []) if isinstance(house, dict) else house
+
+
+def _dig_bala(idx, grahas, houses):
+    """Directional strength: 60 in the planet's best house, 10 less per house away."""
+    house_of = {}
+    for house_num, house in houses['houses'].items():
+        for occupant in _occupants(house):
+            house_of.setdefault(occupant, int(house_num))
+    placed = np.array([house_of.get(p['name'], 0) for p in grahas])
+
+    distance = np.abs(placed - DIG_BALA_HOUSE[idx])
+    distance = np.minimum(distance, 12 - distance)
+    return np.where(placed > 0, np.maximum(0, 60 - distance * 10), 0)
 
-    Combines day/night preference, Paksha Bala from the Moon's distance to the
-    Sun and weekday strength derived via accurate Vedic sunrise calculations.
+
+def _weekday(day_number):
+    """Vedic weekday (0 = Sunday) of a Julian day number."""
+    return (day_number + 1) % 7
+
+
+def _lord_points(idx, lord, points):
+    return np.where(idx == _INDEX[lord], points, 0)
+
+
+def _kala_bala(idx, birth_info, sun_times):
+    """Temporal strength except Paksha and Ayana Bala.
+
+    Covers Nathonnatha (day/night), Tribhaga, and the lords of the year,
+    month, weekday and hora. The year (360 days) and month (30 days) are
+    counted from the Kali Yuga epoch by the Ahargana, and horas are equal
+    hours from the Vedic sunrise.
     """
-    # Import locally to avoid circular imports if any
-    try:
-        from .sun_data import get_sun_times
-    except ImportError:
-        # Fallback if module not found in some test environments
-        pass
-
-    points = 0
-    name = planet['name']
-    
-    # Get accurate sun data
     jd = birth_info.get('jd_ut', 0)
-    lat = birth_info.get('latitude', 0)
-    lon = birth_info.get('longitude', 0)
-    
-    try:
-        sun_data = get_sun_times(jd, lat, lon)
-        is_day = sun_data['is_day_birth']
-        vedic_weekday = sun_data['vedic_weekday']
-    except Exception:
-        # Fallback to simple logic if sun data fails
-        birth_hour = birth_info.get('birth_time', datetime.min.time()).hour
-        is_day = 6 <= birth_hour < 18
-        vedic_weekday = int(swe.day_of_week(jd))  # This is wrong (Mon=0) but fallback
-    
-    # Day/Night strength (Nathonnatha Bala)
-    day_strong = ['Sun', 'Jupiter', 'Venus']
-    night_strong = ['Moon', 'Mars', 'Saturn']
-    
-    if name in day_strong and is_day:
-        points += 30
-    elif name in night_strong and not is_day:
-        points += 30
-    elif name == 'Mercury':  # Mercury strong day and night
-        points += 30
-    
-    # Paksha Bala (Moon phase strength) - for Moon
-    # NOTE: Standard Shadbala calculates Paksha Bala for ALL planets based on benefic/malefic nature
-    # Benefics get logic similar to Moon, Malefics get inverse.
-    # However, to avoid larger refactors, we stick to existing scope but upgrade Moon scale.
-    if name == 'Moon':
-        sun_lon = None
-        if planets:
-            for p in planets:
-                if p.get('name') == 'Sun':
-                    if 'longitude' in p:
-                        sun_lon = p['longitude']
-                    elif 'sign' in p and 'degree' in p:
-                        sun_lon = (p['sign'] - 1) * 30 + p['degree']
-                    break
-        if sun_lon is None:
-            try:
-                sun_lon = swe.calc_ut(jd, swe.SUN)[0][0]
-            except Exception:
-                sun_lon = 0.0
-        moon_lon = planet.get('longitude')
-        if moon_lon is None:
-            moon_lon = (planet['sign'] - 1) * 30 + planet.get('degree', 0)
-            
-        phase = (moon_lon - sun_lon) % 360
-        if phase > 180:
-            phase = 360 - phase
-            
-        # Moon gets 60 Shashtiamsas at Full Moon
-        points += 60 * (phase / 180)
-    
-    # Weekday strength (Vara Bala)
-    # Vedic Weekday 0=Sun, 1=Mon, 2=Tue, 3=Wed, 4=Thu, 5=Fri, 6=Sat
-    weekday_rulers = {
-        0: 'Sun',
-        1: 'Moon',
-        2: 'Mars',
-        3: 'Mercury',
-        4: 'Jupiter',
-        5: 'Venus',
-        6: 'Saturn',
-    }
-    
-    if weekday_rulers.get(vedic_weekday) == name:
-        points += 45  # Standard strength for Day Lord
-        
+    if sun_times is not None:
+        is_day = sun_times['is_day_birth']
+        sunrise = sun_times['sunrise']
+        weekday = sun_times['vedic_weekday']
+        day = math.floor(sunrise + 0.5 + birth_info.get('longitude', 0) / 360)
+    else:
+        birth_time = birth_info.get('birth_time')
+        is_day = birth_time is not None and 6 <= birth_time.hour < 18
+        sunrise = None
+        day = math.floor(jd + 0.5)
+        weekday = _weekday(day)
+
+    points = np.where(DAY_STRONG if is_day else NIGHT_STRONG, 30, 0)[idx]
+    points = points + _lord_points(idx, 'Mercury', 30)
+
+    ahargana = day - KALI_EPOCH_DAY
+    abda = WEEKDAY_LORDS[_weekday(KALI_EPOCH_DAY + ahargana // 360 * 360)]
+    masa = WEEKDAY_LORDS[_weekday(KALI_EPOCH_DAY + ahargana // 30 * 30)]
+    points = points + _lord_points(idx, abda, 15) + _lord_points(idx, masa, 30)
+    points = points + _lord_points(idx, WEEKDAY_LORDS[weekday], 45)
+
+    points = points + _lord_points(idx, 'Jupiter', 60)
+    if sunrise is not None:
+        hour = int((jd - sunrise) * 24) % 24
+        start = HORA_ORDER.index(WEEKDAY_LORDS[weekday])
+        points = points + _lord_points(idx, HORA_ORDER[(start + hour) % 7], 60)
+
+        if is_day:
+            part = (jd - sunrise) / (sun_times['sunset'] - sunrise)
+            thirds = DAY_THIRDS
+        else:
+            sunset = sun_times['sunset']
+            part = (jd - sunset) / (sun_times['next_sunrise'] - sunset)
+            thirds = NIGHT_THIRDS
+        points = points + _lord_points(idx, thirds[min(int(part * 3), 2)], 60)
     return points
 
-def calculate_chesta_bala(planet):
+
+def _paksha_bala(idx, elongation):
+    """Benefics gain as the Moon waxes and malefics as it wanes."""
+    phase = min(elongation, 360 - elongation)
+    waxing = 60 * phase / 180
+    return np.where(NATURAL_BENEFIC[idx], waxing, 60 - waxing)
+
+
+def _ayana_bala(idx, grahas, birth_info):
+    """Strength from declination; the Sun's Ayana Bala counts double."""
+    offset = birth_info.get('sidereal_offset', 0)
+    tropical = np.array([p.get('tropical_longitude', _longitude(p) + offset) for p in grahas])
+    declination = np.degrees(np.arcsin(
+        math.sin(math.radians(OBLIQUITY)) * np.sin(np.radians(tropical))
+    ))
+    names = np.array(SHADBALA_PLANETS)[idx]
+    kranti = np.where(np.isin(names, ['Moon', 'Saturn']), -declination, declination)
+    kranti = np.where(names == 'Mercury', np.abs(declination), kranti)
+    bala = 60 * (OBLIQUITY + kranti) / (2 * OBLIQUITY)
+    return np.where(names == 'Sun', 2 * bala, bala)
+
+
+def _speeds(idx, grahas, birth_info):
+    jd = birth_info.get('jd_ut', 0)
+    speeds = []
+    for i, planet in zip(idx, grahas):
+        speed = planet.get('speed')
+        if speed is None:
+            try:
+                values, _ = swe.calc_ut(jd, _PLANET_IDS[i], swe.FLG_SWIEPH | swe.FLG_SPEED)
+                speed = values[3]
+            except (swe.Error, IndexError, TypeError):
+                speed = math.nan
+        speeds.append(speed)
+    return np.array(speeds, dtype=float)
+
+
+def _chesta_bala(idx, grahas, birth_info, ayana, paksha):
+    """
+    Motional Strength.
+    The Sun takes its Ayana Bala and the Moon its Paksha Bala. Other
+    planets score 60 at their fastest retrograde motion falling to 0 at
+    their fastest direct motion.
     """
-    Motional Strength based on speed and retrogression.
-    Maximum when retrograde (for superior planets).
+    speeds = _speeds(idx, grahas, birth_info)
+    names = np.array(SHADBALA_PLANETS)[idx]
+    low = np.array([SPEED_RANGE.get(n, (0, 1))[0] for n in names])
+    high = np.array([SPEED_RANGE.get(n, (0, 1))[1] for n in names])
+    bala = np.clip(60 * (high - speeds) / (high - low), 0, 60)
+
+    retrograde = np.array([p.get('retrograde', False) for p in grahas])
+    bala = np.where(np.isnan(speeds), np.where(retrograde, 60, 30), bala)
+    bala = np.where(names == 'Sun', ayana, bala)
+    return np.where(names == 'Moon', paksha, bala)
+
+
+def _drik_bala(grahas, elongation, aspects=None):
+    """A quarter of the aspects received from benefics less those from malefics.
+
+    A degree-based ``aspects`` matrix is reused when it covers every
+    planet; otherwise, e.g. when a planet has no house, the sphuta drishti
+    is computed from the longitudes.
     """
-    if planet['name'] in ['Sun', 'Moon']:
-        return 30  # Luminaries get fixed Chesta Bala
-    
-    # Retrograde planets get maximum Chesta Bala
-    if planet.get('retrograde', False):
-        return 60
-    
-    # Otherwise based on speed (simplified)
-    return 30
+    names = [p['name'] for p in grahas]
+    if aspects is not None and aspects.virupa and all(aspects.index(n) is not None for n in names):
+        virupas = aspects.submatrix(names)
+    else:
+        virupas = sphuta_drishti(grahas)
+
+    idx = np.array([_INDEX[n] for n in names])
+    benefic = NATURAL_BENEFIC[idx].copy()
+    benefic[np.array(names) == 'Moon'] = elongation < 180
+    sign = np.where(benefic, 1, -1)
+    return (sign[:, None] * virupas).sum(axis=0) / 4
+
 
 def get_naisargika_bala(planet_name):
     """Natural strength of planets in descending order."""
-    natural_strength = {
-        'Sun': 60,
-        'Moon': 51.43,
-        'Venus': 42.86,
-        'Jupiter': 34.29,
-        'Mercury': 25.71,
-        'Mars': 17.14,
-        'Saturn': 8.57
-    }
-    return natural_strength.get(planet_name, 0)
+    i = _INDEX.get(planet_name)
+    return float(NAISARGIKA_BALA[i]) if i is not None else 0
+
 
 def get_required_strength(planet_name):
     """Minimum required strength for planet to give good results."""
-    requirements = {
-        'Sun': 340,
-        'Moon': 360,
-        'Mars': 300,
-        'Mercury': 420,
-        'Jupiter': 390,
-        'Venus': 330,
-        'Saturn': 300
-    }
-    return requirements.get(planet_name, 300)
+    i = _INDEX.get(planet_name)
+    return int(REQUIRED_STRENGTH[i]) if i is not None else 300
 
-def calculate_bhava_bala(houses, planets, birth_info):
+
+def calculate_kala_bala(planet, birth_info, planets=None):
+    """Return temporal strength (Kala Bala) for a single planet."""
+    idx = np.array([_INDEX[planet['name']]])
+    elongation = _moon_elongation([planet, *(planets or [])], birth_info)
+    kala = _kala_bala(idx, birth_info, _sun_times(birth_info))
+    total = kala + _paksha_bala(idx, elongation) + _ayana_bala(idx, [planet], birth_info)
+    return float(total[0])
+
+
+def calculate_bhava_bala(houses, planets, birth_info, shadbala=None):
     """
     Calculate house strengths based on:
     - Occupants' strength
     - Lord's strength
     - Aspects received
+
+    Pass an already computed ``shadbala`` to avoid recomputing it.
     """
     house_strengths = {}
-    
+
     # Get planetary strengths first
-    shadbala = calculate_shadbala(planets, birth_info, houses)
-    
+    if shadbala is None:
+        shadbala = calculate_shadbala(planets, birth_info, houses)
+
     for house_num in range(1, 13):
         strength = 0
-        
+
         # Strength from occupants
-        occupants = houses['houses'].get(house_num, [])
+        occupants = _occupants(houses['houses'].get(house_num, []))
         for occupant in occupants:
             if occupant in shadbala:
                 strength += shadbala[occupant]['total'] * 0.25
-        
+
         # Strength from house lord
         house_sign = house_num  # In whole sign system
         house_lord = get_sign_lord(house_sign)
         if house_lord and house_lord in shadbala:
             strength += shadbala[house_lord]['total'] * 0.5
-        
+
         house_strengths[house_num] = {
             'strength': strength,
             'occupants': occupants,
             'lord': house_lord,
             'is_strong': strength > 300
         }
-    
+
     return house_strengths
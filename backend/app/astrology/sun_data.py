@@ -1,135 +1,235 @@
+"""Sunrise and sunset per location-day, cached in memory and on disk.
+
+A day is the local mean solar date at the location, numbered like Julian
+day numbers, so no timezone is needed to find "the sunrise of this day".
+Coordinates are rounded to :data:`COORD_DECIMALS` places (about a
+kilometre, a few seconds of sunrise) and ``(lat, lon, day)`` is the cache
+key: every chart, hora or panchanga request for the same city and day
+shares one solution.
+
+Lookups go through an in-process LRU, then an SQLite file
+(``$SUN_CACHE_FILE``, default ``app/data/sun_cache.sqlite3``), and only
+then to ``swe.rise_trans``. :func:`sun_times_range` solves a whole span
+(e.g. a year) for one location in a single call and stores it in both.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+
+import numpy as np
 import swisseph as swe
-from datetime import datetime, timedelta
-import pytz
+
+logger = logging.getLogger(__name__)
+
+COORD_DECIMALS = 2
+LRU_SIZE = 50_000
+DEFAULT_CACHE_FILE = Path(__file__).resolve().parent.parent / "data" / "sun_cache.sqlite3"
+
+_FLAGS = swe.BIT_DISC_CENTER
+
+
+def sunrise_after(jd_ut, lat, lon):
+    """Return the JD of the first sunrise (disc centre) after ``jd_ut``.
+
+    Raises ``ValueError`` when the Sun does not rise, e.g. in polar night.
+    """
+    flag, times = swe.rise_trans(jd_ut, swe.SUN, swe.CALC_RISE | _FLAGS, (lon, lat, 0))
+    if flag != 0:
+        raise ValueError("The Sun does not rise at this location on the requested date")
+    return times[0]
+
+
+def _sunset_after(jd_ut, lat, lon):
+    flag, times = swe.rise_trans(jd_ut, swe.SUN, swe.CALC_SET | _FLAGS, (lon, lat, 0))
+    return times[0] if flag == 0 else math.nan
+
+
+def local_day(jd_ut: float, lon: float) -> int:
+    """Return the local mean solar day number of an instant at longitude ``lon``."""
+    return math.floor(jd_ut + 0.5 + lon / 360)
+
+
+def day_number(day) -> int:
+    """Return the day number of a calendar ``date`` (its Julian day number)."""
+    return day.toordinal() + 1721425
+
+
+def _key(lat: float, lon: float) -> tuple[float, float]:
+    return round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS)
+
+
+def _solve_days(lat: float, lon: float, days) -> np.ndarray:
+    """Return ``(n, 2)`` sunrise and sunset JDs; NaN where the Sun does not rise."""
+    result = np.full((len(days), 2), math.nan)
+    for i, day in enumerate(days):
+        midnight = day - 0.5 - lon / 360
+        try:
+            rise = sunrise_after(midnight, lat, lon)
+        except ValueError:
+            continue
+        if rise < midnight + 1:
+            result[i] = rise, _sunset_after(rise, lat, lon)
+    return result
+
+
+class SunTimesCache:
+    """LRU of ``(lat, lon, day) -> (sunrise, sunset)`` over an optional SQLite file."""
+
+    def __init__(self, path: str | Path | None = None, maxsize: int = LRU_SIZE):
+        self.maxsize = maxsize
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(path), check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS sun_times (lat REAL, lon REAL, day INTEGER, "
+                    "sunrise REAL, sunset REAL, PRIMARY KEY (lat, lon, day))"
+                )
+            except (OSError, sqlite3.Error) as ex:
+                logger.warning("Sun times disk cache %s unavailable: %s", path, ex)
+                self._db = None
+
+    def _remember(self, key, value) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get_range(self, lat: float, lon: float, first: int, last: int) -> np.ndarray:
+        """Return sunrise/sunset rows for days ``first..last`` (inclusive)."""
+        lat, lon = _key(lat, lon)
+        days = range(first, last + 1)
+        rows = np.full((len(days), 2), math.nan)
+        with self._lock:
+            missing = []
+            for i, day in enumerate(days):
+                value = self._memory.get((lat, lon, day))
+                if value is None:
+                    missing.append(i)
+                else:
+                    self._memory.move_to_end((lat, lon, day))
+                    rows[i] = value
+            if missing and self._db is not None:
+                stored = dict(
+                    (day, (rise, set_))
+                    for day, rise, set_ in self._db.execute(
+                        "SELECT day, sunrise, sunset FROM sun_times "
+                        "WHERE lat = ? AND lon = ? AND day BETWEEN ? AND ?",
+                        (lat, lon, first + missing[0], first + missing[-1]),
+                    )
+                )
+                still = []
+                for i in missing:
+                    value = stored.get(first + i)
+                    if value is None:
+                        still.append(i)
+                    else:
+                        rows[i] = [math.nan if v is None else v for v in value]
+                        self._remember((lat, lon, first + i), tuple(rows[i]))
+                missing = still
+        if missing:
+            solved = _solve_days(lat, lon, [first + i for i in missing])
+            with self._lock:
+                for i, value in zip(missing, solved):
+                    rows[i] = value
+                    self._remember((lat, lon, first + i), tuple(value))
+                if self._db is not None:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO sun_times VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (lat, lon, first + i, *(None if math.isnan(v) else float(v) for v in value))
+                            for i, value in zip(missing, solved)
+                        ],
+                    )
+                    self._db.commit()
+        return rows
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+
+_CACHE: SunTimesCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_sun_cache() -> SunTimesCache:
+    """Return the process-wide cache, opening ``$SUN_CACHE_FILE`` on first use.
+
+    Set ``SUN_CACHE_FILE`` to an empty string to keep the cache in memory only.
+    """
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            path = os.getenv("SUN_CACHE_FILE", str(DEFAULT_CACHE_FILE))
+            _CACHE = SunTimesCache(path or None)
+        return _CACHE
+
+
+def sun_times_range(lat: float, lon: float, first_day: int, last_day: int) -> dict:
+    """Return sunrise and sunset JDs for local days ``first_day..last_day`` at once.
+
+    ``days`` are local mean day numbers (see :func:`local_day`); missing
+    values are NaN on days the Sun does not rise or set.
+    """
+    rows = get_sun_cache().get_range(lat, lon, first_day, last_day)
+    return {"days": np.arange(first_day, last_day + 1), "sunrise": rows[:, 0], "sunset": rows[:, 1]}
+
+
+def sun_times_for_year(lat: float, lon: float, year: int) -> dict:
+    """Return a year's sunrises and sunsets for one location (batch mode)."""
+    return sun_times_range(lat, lon, day_number(date(year, 1, 1)), day_number(date(year, 12, 31)))
+
 
 def get_sun_times(jd_ut, lat, lon):
     """
     Calculate Vedic day details: Sunrise, Sunset, and Vedic Weekday.
-    
+
+    The Vedic day runs from one sunrise to the next, so an instant before
+    sunrise belongs to the previous day.
+
     Args:
         jd_ut (float): Julian Day in UTC
         lat (float): Latitude
         lon (float): Longitude
-        
+
     Returns:
         dict: {
-            'sunrise': float (JD),
-            'sunset': float (JD),
+            'sunrise': float (JD) of the sunrise starting the Vedic day,
+            'sunset': float (JD) following that sunrise,
             'is_day_birth': bool,
-            'vedic_weekday': int (0=Sunday, 1=Monday, ... 6=Saturday)
+            'vedic_weekday': int (0=Sunday, 1=Monday, ... 6=Saturday),
+            'next_sunrise': float (JD) of the first sunrise after jd_ut,
         }
+
+    Raises ``ValueError`` when the Sun does not rise around ``jd_ut``.
     """
-    # 1. Calculate Sunrise/Sunset for the given location and day
-    # We first look for the sunrise "today" relative to the input time.
-    # Note: swe.rise_trans finds the *next* rise/set after the given JD.
-    # So to find the relevant sunrise that defined the start of this Vedic day,
-    # we might need to search backwards if the birth is before sunrise.
-    
-    # Flags for rise/trans: bit 0=0 (rise), bit 0=1 (set), planet=swe.SUN
-    # We use center of disc for Vedic (usually) or tip? 
-    # Standard computations often use center (swe.CALC_RISE | swe.BIT_DISC_CENTER) 
-    # or just swe.CALC_RISE (which defaults to limb). 
-    # Lahiri Ephemeris usage varies, but center is safer for generic "Day/Night" distinction.
-    # Let's use default (limb) which is standard for "Visual Sunrise".
-    
-    flags = swe.CALC_RISE | swe.BIT_DISC_CENTER
-    
-    # Search for sunrise on the current civil day (approx)
-    # Start searching 24 hours back to ensure we capture the sunrise preceding the event
-    result_rise = swe.rise_trans(jd_ut - 1, swe.SUN, flags, (lon, lat, 0))
-    rise_jd = result_rise[1][0] # tuple: ((jd_rise, ...), (jd_set, ...)) -> structure is complex
-    # wait, rise_trans returns: ((time, ...), (error)) in older versions or just tuple.
-    # checking pyswisseph docs or common usage:
-    # it returns a tuple/list of times.
-    # Actually swe.rise_trans returns `(double[2], char[256])` in C.
-    # In python it returns `((rise_jd, ...), ...)`? 
-    # Let's rely on documentation or careful usage. 
-    # Correct signature: swe.rise_trans(jd_ut, planet, starname, flags, geolon, geolat, altitude, pressure, temp)
-    # Returns ( (rise_jd, ...), (msg) ) ? No, just the tuple of floats usually.
-    # Actually, simpler method:
-    
-    # Let's refine the search.
-    # We want the sunrise strictly BEFORE or AT `jd_ut`. 
-    # But wait, if birth is 3 AM, and sunrise 6 AM. The previous sunrise was yesterday 6AM.
-    # That means it is "Night" of Yesterday.
-    
-    # Step 1: Find next sunrise and previous sunrise.
-    
-    # Look for sunrise AFTER input time
-    res_next_rise = swe.rise_trans(jd_ut, swe.SUN, swe.CALC_RISE | swe.BIT_DISC_CENTER, (lon, lat, 0))
-    next_rise = res_next_rise[1][0]
-    
-    # Look for sunrise BEFORE input time (go back 1.2 days to be safe and find next after that)
-    res_prev_rise = swe.rise_trans(jd_ut - 1.2, swe.SUN, swe.CALC_RISE | swe.BIT_DISC_CENTER, (lon, lat, 0))
-    # Logic: rise_trans finds the *next* event after start_jd.
-    # So if we start 30h back, the "next" rise should be the one yesterday (or today if morning).
-    
-    # To properly identify the "Vedic Day", we need the sunrise that started the current period.
-    # This is the sunrise with the largest JD that is <= jd_ut.
-    # Actually, iterate finding rises.
-    
-    # Robust approach:
-    # 1. Start search from 'jd_ut - 1.5' (36 hours ago).
-    # 2. Find next rise.
-    # 3. If that rise is <= jd_ut, keep it and look for next.
-    # 4. Stop when rise > jd_ut. The last one <= jd_ut is our "Vedic Sunrise".
-    
-    search_start = jd_ut - 1.5
-    vedic_rise = None
-    
-    for _ in range(3): # Check a few days window
-        res = swe.rise_trans(search_start, swe.SUN, swe.CALC_RISE | swe.BIT_DISC_CENTER, (lon, lat, 0))
-        t = res[1][0]
-        if t <= jd_ut:
-            vedic_rise = t
-            search_start = t + 0.1 # Move slightly forward
-        else:
-            break
-            
-    if vedic_rise is None:
-        # Should not happen if we go back far enough
-        vedic_rise = next_rise # Fallback (weird)
-        
-    # Now find the Sunset following that specific Sunrise
-    res_set = swe.rise_trans(vedic_rise, swe.SUN, swe.CALC_SET | swe.BIT_DISC_CENTER, (lon, lat, 0))
-    sunset_jd = res_set[1][0]
-    
-    # Is Day Birth?
-    # If Birth JD is between Vedic Sunrise and that day's Sunset
-    is_day_birth = (jd_ut >= vedic_rise) and (jd_ut <= sunset_jd)
-    
-    # Vedic Weekday (Vaara)
-    # The weekday is determined by the Vedic Sunrise.
-    # swe.day_of_week(0) = Monday, 1=Tuesday... NO.
-    # swe.day_of_week returns 0=Monday, 1=Tuesday... 6=Sunday.
-    # Wait, lets check standard `date.weekday()`: 0=Mon, 6=Sun.
-    # Vedic uses: 0=Sunday, 1=Monday ... 6=Saturday (Ravivara, Somavara...)
-    # We need to map correctly.
-    
-    # Let's use Python's datetime from the JD to be sure, or swe.day_of_week.
-    # swe.day_of_week(jd): 0=Monday, ... 6=Sunday.
-    # Vedic mapping:
-    # Sun (Ravi) = 0 -> SWE 6
-    # Mon (Soma) = 1 -> SWE 0
-    # Tue (Mangala) = 2 -> SWE 1
-    # Wed (Budha) = 3 -> SWE 2
-    # Thu (Guru) = 4 -> SWE 3
-    # Fri (Shukra) = 5 -> SWE 4
-    # Sat (Shani) = 6 -> SWE 5
-    
-    swe_dow = swe.day_of_week(vedic_rise)
-    # Map SWE (0=Mon) to Vedic (0=Sun, 1=Mon)
-    # Mon(0) -> 1
-    # Tue(1) -> 2
-    # ...
-    # Sun(6) -> 0
-    
-    vedic_weekday = (swe_dow + 1) % 7
-    
+    day = local_day(jd_ut, lon)
+    rows = get_sun_cache().get_range(lat, lon, day - 1, day + 1)
+    rises, sets = rows[:, 0], rows[:, 1]
+    i = 1 if rises[1] <= jd_ut else 0
+    vedic_rise, sunset_jd, next_rise = rises[i], sets[i], rises[i + 1]
+    if math.isnan(vedic_rise) or math.isnan(next_rise):
+        raise ValueError("The Sun does not rise at this location on the requested date")
+
+    # Day numbers count from a Monday (0); the Vedic vaara from Sunday.
+    vedic_weekday = (day - 1 + i + 1) % 7
+
     return {
-        "sunrise": vedic_rise,
-        "sunset": sunset_jd,
-        "is_day_birth": is_day_birth,
+        "sunrise": float(vedic_rise),
+        "sunset": float(sunset_jd),
+        "is_day_birth": bool(vedic_rise <= jd_ut <= sunset_jd),
         "vedic_weekday": vedic_weekday,
-        "next_sunrise": next_rise # might be useful
+        "next_sunrise": float(next_rise),
     }
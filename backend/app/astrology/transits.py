@@ -0,0 +1,179 @@
+"""Gochara: transits over a date range relative to a natal chart.
+
+Transiting signs come from the shared ingress table
+(:mod:`.event_table`), so a range of any length is one array search per
+planet. Houses are counted whole-sign from the natal Moon and lagna and
+aspects follow sign-based graha drishti, which keeps every result an
+interval bounded by ingresses rather than a per-day snapshot.
+
+:func:`ashtakavarga_timeline` samples the same intervals on a daily or
+hourly grid and scores each transit against the natal bindus.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Iterable, Mapping, Optional
+
+import numpy as np
+
+from .dasha import jd_to_datetime
+from .event_table import event_table_for
+from .events import GRAHAS
+
+# Signs counted from the transiting planet (1 = same sign) that it aspects.
+GRAHA_DRISHTI = {
+    "Mars": (4, 7, 8),
+    "Jupiter": (5, 7, 9),
+    "Saturn": (3, 7, 10),
+    "Rahu": (5, 7, 9),
+    "Ketu": (5, 7, 9),
+}
+DEFAULT_DRISHTI = (7,)
+
+_ORDINALS = {1: "conjunction", 3: "3rd aspect", 4: "4th aspect", 5: "5th aspect",
+             7: "7th aspect", 8: "8th aspect", 9: "9th aspect", 10: "10th aspect"}
+
+
+def _sign(longitude: float) -> int:
+    return int(longitude % 360 // 30) + 1
+
+
+def _interval(start_jd: float, end_jd: float, **fields) -> dict:
+    return {"start": jd_to_datetime(start_jd), "end": jd_to_datetime(end_jd), **fields}
+
+
+def transit_timeline(
+    natal_planets: list[dict],
+    natal_ascendant: float,
+    start_jd: float,
+    end_jd: float,
+    planets: Optional[Iterable[str]] = None,
+    *,
+    ayanamsa: str = "lahiri",
+    node_type: str = "mean",
+) -> dict:
+    """Return sign, aspect and retrograde intervals of transiting grahas.
+
+    ``natal_planets`` need ``name`` and sidereal ``longitude``; the natal
+    Moon is required for houses counted from the Moon.
+    """
+    names = list(planets) if planets is not None else GRAHAS
+    unknown = [n for n in names if n not in GRAHAS]
+    if unknown:
+        raise ValueError(f"Unknown planets: {', '.join(unknown)}")
+    moon = next((p for p in natal_planets if p["name"] == "Moon"), None)
+    if moon is None:
+        raise ValueError("Natal chart must include the Moon")
+    moon_sign = _sign(moon["longitude"])
+    lagna_sign = _sign(natal_ascendant)
+    natal_signs = {p["name"]: _sign(p["longitude"]) for p in natal_planets}
+
+    table = event_table_for(start_jd, end_jd, ayanamsa=ayanamsa, node_type=node_type)
+
+    positions, aspects, retrograde = [], [], []
+    for name in names:
+        starts, ends, signs = table.intervals(name, start_jd, end_jd)
+        from_moon = (signs - moon_sign) % 12 + 1
+        from_lagna = (signs - lagna_sign) % 12 + 1
+        for s, e, sign, hm, hl in zip(starts, ends, signs, from_moon, from_lagna):
+            positions.append(_interval(
+                s, e, planet=name, sign=int(sign),
+                house_from_moon=int(hm), house_from_lagna=int(hl),
+            ))
+
+        for offset in (1, *GRAHA_DRISHTI.get(name, DEFAULT_DRISHTI)):
+            targets = (signs + offset - 2) % 12 + 1
+            for natal_name, natal_sign in natal_signs.items():
+                for i in np.flatnonzero(targets == natal_sign):
+                    aspects.append(_interval(
+                        starts[i], ends[i], planet=name, natal_planet=natal_name,
+                        type=_ORDINALS[offset], sign=int(signs[i]),
+                    ))
+
+        for s, e in zip(*table.retrograde_intervals(name, start_jd, end_jd)):
+            retrograde.append(_interval(s, e, planet=name))
+
+    key = lambda item: (item["start"], item["planet"])
+    return {
+        "natal": {"moon_sign": moon_sign, "lagna_sign": lagna_sign},
+        "positions": sorted(positions, key=key),
+        "aspects": sorted(aspects, key=key),
+        "retrograde": sorted(retrograde, key=key),
+    }
+
+
+RESOLUTIONS = {"day": 1.0, "hour": 1 / 24}
+
+
+def _sign_table(points: Mapping) -> np.ndarray:
+    """Turn a ``{sign: points}`` mapping (keys may be strings) into a 12-vector."""
+    table = np.zeros(12, dtype=np.int64)
+    for sign, value in points.items():
+        table[int(sign) - 1] = value
+    return table
+
+
+def ashtakavarga_timeline(
+    bav: Mapping[str, Mapping],
+    sav: Mapping,
+    natal_ascendant: float,
+    start_jd: float,
+    end_jd: float,
+    planets: Optional[Iterable[str]] = None,
+    *,
+    resolution: str = "day",
+    ayanamsa: str = "lahiri",
+    node_type: str = "mean",
+) -> dict:
+    """Score transits against natal Ashtakavarga on a regular time grid.
+
+    ``bav`` maps each planet to its bindus per sign and ``sav`` holds the
+    summed bindus per sign. For every sample the result gives each
+    transiting planet's sign, its own BAV bindus there and the SAV of that
+    sign, plus per-house (whole sign from lagna) totals of transit bindus.
+    By default every graha with a BAV is scored; requesting one without a
+    BAV (e.g. Rahu or Ketu) raises ``ValueError``.
+    """
+    if planets is None:
+        names = [n for n in GRAHAS if n in bav]
+    else:
+        names = list(planets)
+        unknown = [n for n in names if n not in GRAHAS]
+        if unknown:
+            raise ValueError(f"Unknown planets: {', '.join(unknown)}")
+        missing = [n for n in names if n not in bav]
+        if missing:
+            raise ValueError(f"No Ashtakavarga for: {', '.join(missing)}")
+    step = RESOLUTIONS[resolution]
+    times = start_jd + step * np.arange(math.ceil((end_jd - start_jd) / step))
+    table = event_table_for(start_jd, end_jd, ayanamsa=ayanamsa, node_type=node_type)
+
+    bav_matrix = np.array([_sign_table(bav[n]) for n in names]).reshape(len(names), 12)
+    sav_vector = _sign_table(sav)
+    signs = np.empty((len(names), len(times)), dtype=np.int64)
+    for i, name in enumerate(names):
+        starts, _, values = table.intervals(name, start_jd, end_jd)
+        signs[i] = values[np.searchsorted(starts, times, side="right") - 1]
+
+    bindus = np.take_along_axis(bav_matrix, signs - 1, axis=1)
+    sav_scores = sav_vector[signs - 1]
+    houses = (signs - _sign(natal_ascendant)) % 12
+    house_scores = np.zeros((12, len(times)), dtype=np.int64)
+    columns = np.arange(len(times))
+    for i in range(len(names)):
+        np.add.at(house_scores, (houses[i], columns), bindus[i])
+
+    return {
+        "resolution": resolution,
+        "times": [jd_to_datetime(t) for t in times],
+        "planets": {
+            name: {
+                "sign": signs[i].tolist(),
+                "bindus": bindus[i].tolist(),
+                "sav": sav_scores[i].tolist(),
+            }
+            for i, name in enumerate(names)
+        },
+        "houses": {h + 1: house_scores[h].tolist() for h in range(12)},
+    }
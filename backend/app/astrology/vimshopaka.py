@@ -0,0 +1,105 @@
+# backend/vimshopaka.py - VARGA STRENGTH
+"""
+Vimshopaka Bala: a 20-point strength from a planet's dignity across a set
+of divisional charts (BPHS).
+
+Every scheme is evaluated from one planet x varga sign matrix. Dignity in
+each varga comes from lookup tables: own or exaltation sign, else the
+compound (natural + temporal) relationship with the sign lord.
+"""
+
+import numpy as np
+
+from .divisional_charts import varga_signs
+from app.utils.signs import get_sign_lord
+
+VIMSHOPAKA_PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+_INDEX = {name: i for i, name in enumerate(VIMSHOPAKA_PLANETS)}
+
+# Varga weights of each scheme; every scheme sums to 20.
+VIMSHOPAKA_SCHEMES = {
+    "shadvarga": {1: 6, 2: 2, 3: 4, 9: 5, 12: 2, 30: 1},
+    "saptavarga": {1: 5, 2: 2, 3: 3, 7: 2.5, 9: 4.5, 12: 2, 30: 1},
+    "dashavarga": {1: 3, 2: 1.5, 3: 1.5, 7: 1.5, 9: 1.5, 10: 1.5, 12: 1.5, 16: 1.5, 30: 1.5, 60: 5},
+    "shodashavarga": {
+        1: 3.5, 2: 1, 3: 1, 4: 0.5, 7: 0.5, 9: 3, 10: 0.5, 12: 0.5,
+        16: 2, 20: 0.5, 24: 0.5, 27: 0.5, 30: 1, 40: 0.5, 45: 0.5, 60: 4,
+    },
+}
+# Every varga used by any scheme, so all schemes share one sign lookup.
+VIMSHOPAKA_VARGAS = sorted({d for weights in VIMSHOPAKA_SCHEMES.values() for d in weights})
+_WEIGHTS = {
+    name: np.array([weights.get(d, 0) for d in VIMSHOPAKA_VARGAS], dtype=float)
+    for name, weights in VIMSHOPAKA_SCHEMES.items()
+}
+
+# Natural relationship: 1 friend, 0 neutral, -1 enemy (row towards column).
+NATURAL_RELATIONS = np.array([
+    # Sun Moon Mars Merc Jup  Ven  Sat
+    [0,   1,   1,   0,   1,  -1,  -1],   # Sun
+    [1,   0,   0,   1,   0,   0,   0],   # Moon
+    [1,   1,   0,  -1,   1,   0,   0],   # Mars
+    [1,  -1,   0,   0,   0,   1,   0],   # Mercury
+    [1,   1,   1,  -1,   0,  -1,   0],   # Jupiter
+    [-1, -1,   0,   1,   0,   0,   1],   # Venus
+    [-1, -1,  -1,   1,   0,   1,   0],   # Saturn
+])
+
+# Points for a compound relationship of -2 (great enemy) .. 2 (great friend).
+COMPOUND_POINTS = np.array([5, 7, 10, 15, 18], dtype=float)
+OWN_POINTS = 20.0
+
+SIGN_LORDS = np.array([_INDEX[get_sign_lord(sign)] for sign in range(1, 13)])
+_EXALTATION = [1, 2, 10, 6, 4, 12, 7]
+# (7, 12): the planet owns or is exalted in the sign.
+_DIGNIFIED = SIGN_LORDS[None, :] == np.arange(7)[:, None]
+_DIGNIFIED[np.arange(7), np.array(_EXALTATION) - 1] = True
+
+# Houses counted from a planet (0 = same sign) that make a temporal friend.
+_TEMPORAL_FRIEND = np.zeros(12, dtype=bool)
+_TEMPORAL_FRIEND[[1, 2, 3, 9, 10, 11]] = True
+
+
+def dignity_points(signs):
+    """Return dignity points (5-20) for a (7, V) matrix of varga signs (1-12).
+
+    Rows follow :data:`VIMSHOPAKA_PLANETS`; a row of zeros marks a missing
+    planet, which scores zero and counts as neither friend nor enemy.
+    """
+    signs = np.asarray(signs, dtype=np.intp)
+    present = signs > 0
+    sign_idx = np.where(present, signs - 1, 0)
+    lords = SIGN_LORDS[sign_idx]
+
+    natural = NATURAL_RELATIONS[np.arange(7)[:, None], lords]
+    lord_signs = np.take_along_axis(signs, lords, axis=0)
+    temporal = np.where(_TEMPORAL_FRIEND[(lord_signs - signs) % 12], 1, -1)
+    temporal = np.where(lord_signs > 0, temporal, 0)
+    points = COMPOUND_POINTS[np.clip(natural + temporal, -2, 2) + 2]
+
+    points = np.where(_DIGNIFIED[np.arange(7)[:, None], sign_idx], OWN_POINTS, points)
+    return np.where(present, points, 0.0)
+
+
+def calculate_vimshopaka(planets, schemes=None):
+    """Return Vimshopaka Bala (0-20) of the seven planets for each scheme.
+
+    ``planets`` need ``name`` and sidereal ``longitude``. The result maps
+    each scheme to ``{planet: points}``.
+    """
+    names = [p["name"] for p in planets if p["name"] in _INDEX]
+    longitudes = np.zeros(7)
+    present = np.zeros(7, dtype=bool)
+    for planet in planets:
+        i = _INDEX.get(planet["name"])
+        if i is not None:
+            longitudes[i] = planet["longitude"]
+            present[i] = True
+
+    signs = np.where(present[:, None], varga_signs(longitudes, VIMSHOPAKA_VARGAS).T, 0)
+    points = dignity_points(signs)
+    result = {}
+    for scheme in schemes or VIMSHOPAKA_SCHEMES:
+        scores = points @ _WEIGHTS[scheme] / OWN_POINTS
+        result[scheme] = {name: round(float(scores[_INDEX[name]]), 2) for name in names}
+    return result
@@ -0,0 +1,182 @@
+# backend/yoga_rules.py - DECLARATIVE YOGA DEFINITIONS
+"""
+Yoga definitions as data. :mod:`.yogas` compiles them into bitmask tests.
+
+Each rule has a ``name``, the result ``family`` and ``type``, a list of
+``when`` conditions that must all hold, and an ``output`` template copied
+into the result.
+
+Terms name the planets a condition talks about:
+
+* ``"Mars"`` - a planet
+* ``("lord", 9)`` - the lord of the 9th house from the lagna
+* ``("any", [...])`` / ``("all", [...])`` - at least one / every planet listed
+
+Conditions:
+
+* ``{"present": "Moon"}`` - the planet is in the chart
+* ``{"who": term, "in_house": [1, 4], "from": "Moon"}`` - placed in one of
+  the houses, counted from the lagna or, with ``from``, by sign from a planet
+* ``{"who": term, "in_sign": [1, 8]}``
+* ``{"conjunct": [a, b]}`` - same house
+* ``{"aspects": [a, b]}`` - ``a`` aspects the house ``b`` occupies
+* ``{"distinct": [a, b]}`` - two terms are different planets
+* ``{"not": condition}`` - also ``{"not": [conditions]}``, true unless all hold
+
+Output values may use ``("lord", h)``, ``("house_of", planet)``,
+``("sign_of", planet)`` and ``("matching", i)``, the planets of the
+``any``/``all`` term in condition ``i`` that satisfied it.
+"""
+
+KENDRAS = [1, 4, 7, 10]
+TRIKONAS = [1, 5, 9]
+WEALTH_HOUSES = [1, 2, 5, 9, 11]
+SEVEN_GRAHAS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+MOVABLE_SIGNS = [1, 4, 7, 10]
+FIXED_SIGNS = [2, 5, 8, 11]
+DUAL_SIGNS = [3, 6, 9, 12]
+
+FAMILIES = ["pancha_mahapurusha", "raj_yogas", "dhana_yogas", "chandra_yogas", "nabhasa_yogas"]
+
+# Planet, yoga, exaltation sign, own signs, effects.
+MAHAPURUSHA = [
+    ("Mars", "Ruchaka Yoga", 10, [1, 8],
+     "Courageous, commander-like qualities, athletic build, leadership"),
+    ("Mercury", "Bhadra Yoga", 6, [3, 6],
+     "Intelligent, good communication, scholarly, blessed with wealth"),
+    ("Jupiter", "Hamsa Yoga", 4, [9, 12],
+     "Spiritual, righteous, beautiful appearance, respected by all"),
+    ("Venus", "Malavya Yoga", 12, [2, 7],
+     "Luxurious life, artistic talents, attractive, wealthy"),
+    ("Saturn", "Sasa Yoga", 7, [10, 11],
+     "Disciplined, authoritative, long life, political success"),
+]
+
+
+def _mahapurusha_rules():
+    for planet, name, exalted, own, effects in MAHAPURUSHA:
+        # Mercury's exaltation sign is also its own sign; it counts once, as Strong.
+        own_only = [sign for sign in own if sign != exalted]
+        for signs, strength in (([exalted], "Strong"), (own_only, "Medium")):
+            yield {
+                "name": name,
+                "family": "pancha_mahapurusha",
+                "type": "Pancha Mahapurusha Yoga",
+                "when": [
+                    {"who": planet, "in_house": KENDRAS},
+                    {"who": planet, "in_sign": signs},
+                ],
+                "output": {
+                    "planet": planet,
+                    "house": ("house_of", planet),
+                    "sign": ("sign_of", planet),
+                    "strength": strength,
+                    "effects": effects,
+                },
+            }
+
+
+def _raja_rules():
+    for kendra in KENDRAS:
+        for trikona in TRIKONAS:
+            if kendra == trikona:
+                continue
+            k, t = ("lord", kendra), ("lord", trikona)
+            exchange = [{"who": k, "in_house": [trikona]}, {"who": t, "in_house": [kendra]}]
+            output = {"planets": [k, t], "houses": [kendra, trikona]}
+            yield {
+                "name": "Raja Yoga", "family": "raj_yogas", "type": "Conjunction",
+                "when": [{"distinct": [k, t]}, {"conjunct": [k, t]}],
+                "output": {**output, "strength": "Very Strong",
+                           "effects": "Power, authority, success, high position in life"},
+            }
+            yield {
+                "name": "Raja Yoga", "family": "raj_yogas", "type": "Parivartana",
+                "when": [{"distinct": [k, t]}, *exchange],
+                "output": {**output, "strength": "Very Strong",
+                           "effects": "Mutual strengthening, power, destiny connection"},
+            }
+            yield {
+                "name": "Raja Yoga", "family": "raj_yogas", "type": "Mutual Aspect",
+                "when": [
+                    {"distinct": [k, t]},
+                    {"aspects": [k, t]},
+                    {"aspects": [t, k]},
+                    {"not": exchange},
+                ],
+                "output": {**output, "strength": "Strong",
+                           "effects": "Public success, partnership strength"},
+            }
+
+
+def _dhana_rules():
+    for i, first in enumerate(WEALTH_HOUSES):
+        for second in WEALTH_HOUSES[i + 1:]:
+            a, b = ("lord", first), ("lord", second)
+            yield {
+                "name": "Dhana Yoga", "family": "dhana_yogas", "type": "Wealth Combination",
+                "when": [{"distinct": [a, b]}, {"conjunct": [a, b]}],
+                "output": {"planets": [a, b], "houses": [first, second],
+                           "effects": "Wealth, prosperity, financial gains"},
+            }
+
+
+# Planets that form Sunafa/Anafa around the Moon.
+_MOON_FLANKERS = ("any", ["Mars", "Mercury", "Jupiter", "Venus", "Saturn"])
+_SECOND = {"who": _MOON_FLANKERS, "in_house": [2], "from": "Moon"}
+_TWELFTH = {"who": _MOON_FLANKERS, "in_house": [12], "from": "Moon"}
+_MOON = {"present": "Moon"}
+
+CHANDRA_RULES = [
+    {
+        "name": "Sunafa Yoga", "family": "chandra_yogas", "type": "Chandra Yoga",
+        "when": [_MOON, _SECOND],
+        "output": {"planets": ["Moon", ("matching", 1)],
+                   "effects": "Self-earned wealth, intelligent, good reputation"},
+    },
+    {
+        "name": "Anafa Yoga", "family": "chandra_yogas", "type": "Chandra Yoga",
+        "when": [_MOON, _TWELFTH],
+        "output": {"planets": ["Moon", ("matching", 1)],
+                   "effects": "Well-mannered, charitable, spiritual inclination"},
+    },
+    {
+        "name": "Durudhara Yoga", "family": "chandra_yogas", "type": "Chandra Yoga",
+        "when": [_MOON, _SECOND, _TWELFTH],
+        "output": {"planets": ["Moon", ("matching", 1), ("matching", 2)],
+                   "effects": "Wealthy, charitable, famous, enjoys all comforts"},
+    },
+    {
+        "name": "Kemadruma Yoga", "family": "chandra_yogas", "type": "Chandra Yoga (Negative)",
+        "when": [_MOON, {"not": _SECOND}, {"not": _TWELFTH}],
+        "output": {"planets": ["Moon"],
+                   "effects": "Struggles in life, poverty, obstacles (can be cancelled by other factors)"},
+    },
+    {
+        "name": "Gaja Kesari Yoga", "family": "chandra_yogas", "type": "Chandra Yoga",
+        "when": [_MOON, {"who": "Jupiter", "in_house": KENDRAS, "from": "Moon"}],
+        "output": {"planets": ["Moon", "Jupiter"],
+                   "effects": "Wisdom, wealth, fame, respected like an elephant"},
+    },
+]
+
+NABHASA_RULES = [
+    {
+        "name": name, "family": "nabhasa_yogas", "type": "Nabhasa Yoga",
+        "when": [{"who": ("all", SEVEN_GRAHAS), "in_sign": signs}],
+        "output": {"effects": effects},
+    }
+    for name, signs, effects in (
+        ("Rajju Yoga", MOVABLE_SIGNS, "Always traveling, unstable life but gains through travel"),
+        ("Musala Yoga", FIXED_SIGNS, "Stable, determined, proud, prosperous"),
+        ("Nala Yoga", DUAL_SIGNS, "Intelligent, skilled in many arts, adaptable"),
+    )
+]
+
+YOGA_RULES = [
+    *_mahapurusha_rules(),
+    *_raja_rules(),
+    *_dhana_rules(),
+    *CHANDRA_RULES,
+    *NABHASA_RULES,
+]
@@ -2,352 +2,335 @@
 """
 Calculate important Vedic astrological yogas (planetary combinations).
 These are crucial for prediction in Vedic astrology.
+
+Yogas are defined declaratively in :mod:`.yoga_rules` and compiled once
+into NumPy tests on bitmasks. A chart is reduced to each planet's sign,
+house and aspected houses (as 12-bit masks) plus the lord of every house,
+so every rule runs over a whole batch of charts at a time.
+:func:`varga_yogas` uses this to evaluate any set of divisional charts as
+one batch of whole-sign charts.
 """
 
-from .constants import RASHI_METADATA
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from .aspects import ASPECT_TABLE, GRAHAS, AspectMatrix, planet_houses
+from .divisional_charts import parse_chart_keys, varga_signs
+from .yoga_rules import FAMILIES, YOGA_RULES, MAHAPURUSHA
 from app.utils.signs import get_sign_lord
 
-def calculate_pancha_mahapurusha_yogas(planets, houses):
-    """
-    Calculate the five great personality yogas.
-    Formed when Mars, Mercury, Jupiter, Venus, or Saturn
-    are in own sign or exaltation in a kendra (1,4,7,10).
+_INDEX = {name: i for i, name in enumerate(GRAHAS)}
+# Planet index of the lord of each sign (Aries first).
+SIGN_LORDS = np.array([_INDEX[get_sign_lord(sign)] for sign in range(1, 13)])
+# Houses (bit 0 = own house) aspected by each planet from the 1st.
+_ASPECT_BITS = (ASPECT_TABLE > 0).astype(np.int64) @ (1 << np.arange(12))
+_FULL = (1 << 12) - 1
+
+
+@dataclass(frozen=True)
+class ChartState:
+    """Planet placements of N charts as arrays (-1 where unknown)."""
+
+    sign: np.ndarray      # (N, 9) sign index 0-11
+    house: np.ndarray     # (N, 9) house index 0-11 from the lagna
+    lord: np.ndarray      # (N, 12) planet index of each house lord
+    aspect: np.ndarray    # (N, 9) bitmask of aspected houses
+    house_bit: np.ndarray  # (N, 9) 1 << house, 0 when unknown
+    sign_bit: np.ndarray   # (N, 9) 1 << sign, 0 when unknown
+    rows: np.ndarray       # (N,) chart index, for gathering one planet per chart
+
+
+def chart_state(signs, houses, lagna_signs, aspect_bits=None) -> ChartState:
+    """Build a :class:`ChartState` from (N, 9) sign/house arrays (1-12, 0 unknown).
+
+    ``lagna_signs`` gives the sign (1-12) of the first house of each chart.
+    Aspects default to the graha drishti table applied to the houses.
     """
-    yogas = []
-    kendra_houses = [1, 4, 7, 10]
-    
-    # Exaltation signs
-    exaltation = {
-        'Mars': 10,      # Capricorn
-        'Mercury': 6,    # Virgo
-        'Jupiter': 4,    # Cancer
-        'Venus': 12,     # Pisces
-        'Saturn': 7      # Libra
-    }
-    
-    # Own signs
-    own_signs = {
-        'Mars': [1, 8],         # Aries, Scorpio
-        'Mercury': [3, 6],      # Gemini, Virgo
-        'Jupiter': [9, 12],     # Sagittarius, Pisces
-        'Venus': [2, 7],        # Taurus, Libra
-        'Saturn': [10, 11]      # Capricorn, Aquarius
-    }
-    
-    yoga_names = {
-        'Mars': 'Ruchaka Yoga',
-        'Mercury': 'Bhadra Yoga',
-        'Jupiter': 'Hamsa Yoga',
-        'Venus': 'Malavya Yoga',
-        'Saturn': 'Sasa Yoga'
-    }
-    
+    sign = np.asarray(signs, dtype=np.int64).reshape(-1, len(GRAHAS)) - 1
+    house = np.asarray(houses, dtype=np.int64).reshape(-1, len(GRAHAS)) - 1
+    lagna = np.asarray(lagna_signs, dtype=np.int64).reshape(-1, 1) - 1
+    lord = SIGN_LORDS[(lagna + np.arange(12)) % 12]
+    if aspect_bits is None:
+        shift = np.maximum(house, 0)
+        rotated = ((_ASPECT_BITS << shift) | (_ASPECT_BITS >> (12 - shift))) & _FULL
+        aspect_bits = np.where(house >= 0, rotated, 0)
+    return ChartState(
+        sign, house, lord, np.asarray(aspect_bits, dtype=np.int64).reshape(-1, len(GRAHAS)),
+        np.where(house >= 0, 1 << np.maximum(house, 0), 0),
+        np.where(sign >= 0, 1 << np.maximum(sign, 0), 0),
+        np.arange(len(sign)),
+    )
+
+
+def _lagna_sign(houses) -> int:
+    """Sign of the first house; house N is sign N when it is not known."""
+    first = houses.get('houses', {}).get(1)
+    if isinstance(first, dict) and first.get('sign_id'):
+        return first['sign_id']
+    return 1
+
+
+def chart_state_from(planets, houses, aspects=None) -> ChartState:
+    """Build the state of a single chart from planet dicts and houses."""
+    placed = planet_houses(houses)
+    signs = np.zeros(len(GRAHAS), dtype=np.int64)
+    chart_houses = np.zeros(len(GRAHAS), dtype=np.int64)
     for planet in planets:
-        name = planet['name']
-        if name not in yoga_names:
-            continue
-            
-        # Find planet's house
-        planet_house = None
-        for house_num, occupants in houses['houses'].items():
-            if name in occupants:
-                planet_house = house_num
-                break
-        
-        if planet_house in kendra_houses:
-            planet_sign = planet['sign']
-            
-            # Check if in own sign or exaltation
-            if (planet_sign == exaltation.get(name) or 
-                planet_sign in own_signs.get(name, [])):
-                
-                yogas.append({
-                    'name': yoga_names[name],
-                    'type': 'Pancha Mahapurusha Yoga',
-                    'planet': name,
-                    'house': planet_house,
-                    'sign': planet_sign,
-                    'strength': 'Strong' if planet_sign == exaltation.get(name) else 'Medium',
-                    'effects': get_mahapurusha_effects(yoga_names[name])
-                })
-    
-    return yogas
+        i = _INDEX.get(planet['name'])
+        if i is not None:
+            signs[i] = planet['sign']
+            chart_houses[i] = placed.get(planet['name'], 0)
+
+    aspect_bits = None
+    if isinstance(aspects, AspectMatrix):
+        aspect_bits = np.zeros(len(GRAHAS), dtype=np.int64)
+        for name, row in zip(aspects.planets, aspects.to_house):
+            aspect_bits[_INDEX[name]] = int((row > 0) @ (1 << np.arange(12)))
+    return chart_state(signs, chart_houses, [_lagna_sign(houses)], aspect_bits)
+
+
+# --- Rule compiler ---------------------------------------------------------
+
+def _mask(numbers) -> int:
+    return sum(1 << (n - 1) for n in numbers)
+
+
+def _take(s, name, idx):
+    return getattr(s, name)[s.rows, idx]
+
+
+def _compile_term(term):
+    """Return ``(mode, [state -> (N,) planet indices])`` for a term."""
+    if isinstance(term, str):
+        i = _INDEX[term]
+        return 'one', [lambda s, i=i: np.full(len(s.rows), i)]
+    kind, value = term
+    if kind == 'lord':
+        return 'one', [lambda s, h=value - 1: s.lord[:, h]]
+    if kind in ('any', 'all'):
+        return kind, [lambda s, i=_INDEX[n]: np.full(len(s.rows), i) for n in value]
+    raise ValueError(f"Unknown yoga term: {term!r}")
+
+
+def _single(term):
+    mode, (column,) = _compile_term(term)
+    if mode != 'one':
+        raise ValueError(f"Expected a single planet, got {term!r}")
+    return column
+
+
+def _placement(cond):
+    """Compile ``in_house``/``in_sign`` into a per-planet bit lookup."""
+    if 'in_sign' in cond:
+        mask = _mask(cond['in_sign'])
+        return lambda s, idx: (_take(s, 'sign_bit', idx) & mask) != 0
+    mask = _mask(cond['in_house'])
+    origin = cond.get('from')
+    if origin is None:
+        return lambda s, idx: (_take(s, 'house_bit', idx) & mask) != 0
+    ref = _INDEX[origin]
+
+    def relative(s, idx):
+        planet, base = _take(s, 'sign', idx), s.sign[:, ref]
+        valid = (planet >= 0) & (base >= 0) & (idx != ref)
+        return valid & (((1 << ((planet - base) % 12)) & mask) != 0)
+    return relative
+
+
+def _compile_condition(cond) -> Callable:
+    """Return ``state -> (ok (N,), members (N, k) or None)``."""
+    if 'not' in cond:
+        inner = [_compile_condition(c) for c in (cond['not'] if isinstance(cond['not'], list) else [cond['not']])]
+        return lambda s: (~np.logical_and.reduce([f(s)[0] for f in inner]), None)
+    if 'present' in cond:
+        i = _INDEX[cond['present']]
+        return lambda s: (s.sign[:, i] >= 0, None)
+    if 'who' in cond:
+        mode, columns = _compile_term(cond['who'])
+        test = _placement(cond)
+
+        def placement(s):
+            members = np.stack([test(s, column(s)) for column in columns], axis=1)
+            if mode == 'one':
+                return members[:, 0], None
+            combine = np.any if mode == 'any' else np.all
+            return combine(members, axis=1), members
+        return placement
+
+    for kind in ('conjunct', 'aspects', 'distinct'):
+        if kind in cond:
+            a, b = (_single(t) for t in cond[kind])
+            break
+    else:
+        raise ValueError(f"Unknown yoga condition: {cond!r}")
+    if kind == 'distinct':
+        return lambda s: (a(s) != b(s), None)
+    if kind == 'conjunct':
+        def conjunct(s):
+            first, second = _take(s, 'house', a(s)), _take(s, 'house', b(s))
+            return (first >= 0) & (first == second), None
+        return conjunct
+
+    def aspects(s):
+        return (_take(s, 'aspect', a(s)) & _take(s, 'house_bit', b(s))) != 0, None
+    return aspects
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    name: str
+    family: str
+    type: str
+    output: dict
+    conditions: tuple
+    terms: tuple  # planets of each condition's any/all term, for ("matching", i)
+
+    def evaluate(self, state: ChartState):
+        """Return ``(ok (N,), members per condition)``."""
+        ok = np.ones(len(state.rows), dtype=bool)
+        members = []
+        for condition in self.conditions:
+            result, matched = condition(state)
+            ok &= result
+            members.append(matched)
+        return ok, members
+
+
+def compile_rule(rule: dict) -> CompiledRule:
+    terms = []
+    for cond in rule['when']:
+        who = cond.get('who')
+        terms.append(tuple(who[1]) if isinstance(who, tuple) and who[0] in ('any', 'all') else ())
+    return CompiledRule(
+        rule['name'], rule['family'], rule['type'], rule.get('output', {}),
+        tuple(_compile_condition(c) for c in rule['when']), tuple(terms),
+    )
+
+
+COMPILED_RULES = [compile_rule(rule) for rule in YOGA_RULES]
+
+
+def evaluate_rules(state: ChartState, rules=None) -> np.ndarray:
+    """Return an (N, R) matrix of which rules hold in which chart."""
+    rules = COMPILED_RULES if rules is None else rules
+    return np.stack([rule.evaluate(state)[0] for rule in rules], axis=1)
 
-def get_mahapurusha_effects(yoga_name):
-    """Get the effects of Pancha Mahapurusha Yogas."""
-    effects = {
-        'Ruchaka Yoga': 'Courageous, commander-like qualities, athletic build, leadership',
-        'Bhadra Yoga': 'Intelligent, good communication, scholarly, blessed with wealth',
-        'Hamsa Yoga': 'Spiritual, righteous, beautiful appearance, respected by all',
-        'Malavya Yoga': 'Luxurious life, artistic talents, attractive, wealthy',
-        'Sasa Yoga': 'Disciplined, authoritative, long life, political success'
-    }
-    return effects.get(yoga_name, '')
 
-def calculate_raj_yogas(planets, houses, aspects=None):
+def _resolve(value, rule, state, n, members):
+    if isinstance(value, list):
+        out = []
+        for item in value:
+            resolved = _resolve(item, rule, state, n, members)
+            out.extend(resolved if isinstance(item, tuple) and item[0] == 'matching' else [resolved])
+        return out
+    if not isinstance(value, tuple):
+        return value
+    kind, arg = value
+    if kind == 'lord':
+        return GRAHAS[state.lord[n, arg - 1]]
+    if kind == 'house_of':
+        return int(state.house[n, _INDEX[arg]]) + 1
+    if kind == 'sign_of':
+        return int(state.sign[n, _INDEX[arg]]) + 1
+    if kind == 'matching':
+        return [p for p, hit in zip(rule.terms[arg], members[arg][n]) if hit]
+    raise ValueError(f"Unknown yoga output: {value!r}")
+
+
+def find_yogas(state: ChartState, rules=None) -> list:
+    """Evaluate rules over every chart in ``state``.
+
+    Returns one ``{family: [yoga, ...]}`` mapping per chart.
     """
-    Calculate Raja Yogas (combinations for power and success).
-    Formed by connections (Sambandha) between kendra (1,4,7,10) and trikona (1,5,9) lords.
-    Connection types accepted:
-    1. Conjunction
-    2. Parivartana (Exchange of Signs)
-    3. Mutual Aspect
+    rules = COMPILED_RULES if rules is None else rules
+    charts = [{family: [] for family in FAMILIES} for _ in range(len(state.sign))]
+    for rule in rules:
+        ok, members = rule.evaluate(state)
+        for n in np.flatnonzero(ok):
+            yoga = {'name': rule.name, 'type': rule.type}
+            for key, value in rule.output.items():
+                yoga[key] = _resolve(value, rule, state, n, members)
+            charts[n].setdefault(rule.family, []).append(yoga)
+    return charts
+
+
+# Families whose planets count towards the cross-varga strength summary.
+STRENGTH_FAMILIES = ('pancha_mahapurusha', 'raj_yogas', 'dhana_yogas')
+
+
+def _yoga_planets(yoga) -> list:
+    return yoga.get('planets') or ([yoga['planet']] if 'planet' in yoga else [])
+
+
+def varga_yogas(planets, ascendant, charts=None) -> dict:
+    """Evaluate yoga rules in several divisional charts in one batch.
+
+    Each varga is treated as a whole-sign chart from its own lagna (the
+    varga sign of ``ascendant``). ``charts`` selects vargas as accepted by
+    :func:`parse_chart_keys` (default all of D1-D60).
+
+    Returns ``charts`` (yoga families per varga) and a ``summary`` giving,
+    for each yoga the vargas it appears in, for each planet the vargas in
+    which it forms a Mahapurusha, Raja or Dhana yoga, and as
+    ``strong_planets`` those doing so in at least half of the vargas.
     """
-    yogas = []
-    kendra_houses = [1, 4, 7, 10]
-    trikona_houses = [1, 5, 9]
-    
-    # Get house lords
-    house_lords = {}
-    for house_num in range(1, 13):
-        # Find the sign in this house
-        house_sign = house_num  # In whole sign system
-        house_lords[house_num] = get_sign_lord(house_sign)
-    
-    # Find planets and their positions
-    planet_positions = {}
+    keys = parse_chart_keys(charts)
+    longitudes = np.full(len(GRAHAS) + 1, np.nan)
     for planet in planets:
-        planet_positions[planet['name']] = {
-            'sign': planet['sign'],
-            'house': None
-        }
-    
-    # Assign houses to planets
-    for house_num, occupants in houses['houses'].items():
-        for planet_name in occupants:
-            if planet_name in planet_positions:
-                planet_positions[planet_name]['house'] = house_num
-
-    # Helper to check aspects
-    def check_aspect(p_from, p_to):
-        if not aspects: return False
-        
-        # Find house of p_to
-        to_house = planet_positions.get(p_to, {}).get('house')
-        if not to_house: return False
-        
-        # Check if p_from aspects that house
-        for aspect_data in aspects:
-            if aspect_data['planet'] == p_from:
-                for target in aspect_data['aspects_to']:
-                    if target['house'] == to_house:
-                        return True
-        return False
-    
-    # Check for Raja Yoga combinations
-    for kendra in kendra_houses:
-        for trikona in trikona_houses:
-            if kendra == trikona:  # Skip 1st house (both kendra and trikona)
-                continue
-                
-            kendra_lord = house_lords.get(kendra)
-            trikona_lord = house_lords.get(trikona)
-            
-            if kendra_lord and trikona_lord and kendra_lord != trikona_lord:
-                
-                h1 = planet_positions.get(kendra_lord, {}).get('house')
-                h2 = planet_positions.get(trikona_lord, {}).get('house')
-                
-                # 1. Conjunction
-                if h1 and h2 and h1 == h2:
-                    yogas.append({
-                        'name': 'Raja Yoga',
-                        'type': 'Conjunction',
-                        'planets': [kendra_lord, trikona_lord],
-                        'houses': [kendra, trikona],
-                        'strength': 'Very Strong',
-                        'effects': 'Power, authority, success, high position in life'
-                    })
+        i = _INDEX.get(planet['name'])
+        if i is not None:
+            longitudes[i] = planet['longitude']
+    longitudes[-1] = ascendant
+    known = ~np.isnan(longitudes)
+
+    signs = np.zeros((len(keys), len(longitudes)), dtype=np.int64)
+    signs[:, known] = varga_signs(longitudes[known], [int(k[1:]) for k in keys])
+    planet_signs, lagna = signs[:, :-1], signs[:, -1]
+    houses = np.where(planet_signs > 0, (planet_signs - lagna[:, None]) % 12 + 1, 0)
+    found = find_yogas(chart_state(planet_signs, houses, lagna))
+
+    by_yoga, by_planet = {}, {}
+    for key, families in zip(keys, found):
+        for family, yogas in families.items():
+            for yoga in yogas:
+                seen = by_yoga.setdefault(yoga['name'], [])
+                if key not in seen:
+                    seen.append(key)
+                if family not in STRENGTH_FAMILIES:
                     continue
-                
-                # 2. Parivartana (Exchange of Signs)
-                # Kendra Lord in Trikona House AND Trikona Lord in Kendra House
-                # (Assuming Whole Sign: House N == Sign N roughly, but strict logic is Lord A in Sign B...)
-                # Actually we have house positions. If h1 (Kendra Lord's house) == trikona 
-                # AND h2 (Trikona Lord's house) == kendra
-                if h1 == trikona and h2 == kendra:
-                     yogas.append({
-                        'name': 'Raja Yoga',
-                        'type': 'Parivartana',
-                        'planets': [kendra_lord, trikona_lord],
-                        'houses': [kendra, trikona],
-                        'strength': 'Very Strong',
-                        'effects': 'Mutual strengthening, power, destiny connection'
-                    })
-                     continue
-
-                # 3. Mutual Aspect
-                if check_aspect(kendra_lord, trikona_lord) and check_aspect(trikona_lord, kendra_lord):
-                    yogas.append({
-                        'name': 'Raja Yoga',
-                        'type': 'Mutual Aspect',
-                        'planets': [kendra_lord, trikona_lord],
-                        'houses': [kendra, trikona],
-                        'strength': 'Strong',
-                        'effects': 'Public success, partnership strength'
-                    })
-    
-    return yogas
+                for name in _yoga_planets(yoga):
+                    seen = by_planet.setdefault(name, [])
+                    if key not in seen:
+                        seen.append(key)
+    strong = sorted(
+        (name for name, vargas in by_planet.items() if 2 * len(vargas) >= len(keys)),
+        key=lambda name: (-len(by_planet[name]), _INDEX[name]),
+    )
+    return {
+        'charts': dict(zip(keys, found)),
+        'summary': {
+            'yogas': by_yoga,
+            'planets': by_planet,
+            'strong_planets': strong,
+        },
+    }
 
-def calculate_dhana_yogas(planets, houses):
-    """
-    Calculate Dhana Yogas (wealth combinations).
-    Connections between 1st, 2nd, 5th, 9th, and 11th house lords.
-    """
-    yogas = []
-    wealth_houses = [1, 2, 5, 9, 11]
-    
-    # Get house lords and positions (similar to raj yoga calculation)
-    house_lords = {}
-    for house_num in range(1, 13):
-        house_lords[house_num] = get_sign_lord(house_num)
-    
-    # Check combinations
-    for i, house1 in enumerate(wealth_houses):
-        for house2 in wealth_houses[i+1:]:
-            lord1 = house_lords[house1]
-            lord2 = house_lords[house2]
-            
-            if lord1 and lord2:
-                # Find if they're connected (simplified - just checking conjunction)
-                # In real implementation, would check aspects too
-                for house_num, occupants in houses['houses'].items():
-                    if lord1 in occupants and lord2 in occupants:
-                        yogas.append({
-                            'name': 'Dhana Yoga',
-                            'type': 'Wealth Combination',
-                            'planets': [lord1, lord2],
-                            'houses': [house1, house2],
-                            'effects': 'Wealth, prosperity, financial gains'
-                        })
-                        break
-    
-    return yogas
 
-def calculate_chandra_yogas(planets):
-    """
-    Calculate Moon-based yogas (Chandra Yogas).
-    These are very important in Vedic astrology.
-    """
-    yogas = []
-    
-    # Find Moon
-    moon = next((p for p in planets if p['name'] == 'Moon'), None)
-    if not moon:
-        return yogas
-    
-    moon_sign = moon['sign']
-    
-    # Find other planets' positions relative to Moon
-    planets_from_moon = {}
-    for planet in planets:
-        if planet['name'] == 'Moon':
-            continue
-        houses_from_moon = ((planet['sign'] - moon_sign) % 12) or 12
-        planets_from_moon[planet['name']] = houses_from_moon
-    
-    # Sunafa Yoga - planet in 2nd from Moon
-    planets_in_2nd = [p for p, h in planets_from_moon.items() if h == 2 and p not in ['Sun', 'Rahu', 'Ketu']]
-    if planets_in_2nd:
-        yogas.append({
-            'name': 'Sunafa Yoga',
-            'type': 'Chandra Yoga',
-            'planets': ['Moon'] + planets_in_2nd,
-            'effects': 'Self-earned wealth, intelligent, good reputation'
-        })
-    
-    # Anafa Yoga - planet in 12th from Moon
-    planets_in_12th = [p for p, h in planets_from_moon.items() if h == 12 and p not in ['Sun', 'Rahu', 'Ketu']]
-    if planets_in_12th:
-        yogas.append({
-            'name': 'Anafa Yoga',
-            'type': 'Chandra Yoga',
-            'planets': ['Moon'] + planets_in_12th,
-            'effects': 'Well-mannered, charitable, spiritual inclination'
-        })
-    
-    # Durudhara Yoga - planets in both 2nd and 12th from Moon
-    if planets_in_2nd and planets_in_12th:
-        yogas.append({
-            'name': 'Durudhara Yoga',
-            'type': 'Chandra Yoga',
-            'planets': ['Moon'] + planets_in_2nd + planets_in_12th,
-            'effects': 'Wealthy, charitable, famous, enjoys all comforts'
-        })
-    
-    # Kemadruma Yoga - no planets in 2nd/12th from Moon (poverty yoga)
-    if not planets_in_2nd and not planets_in_12th:
-        yogas.append({
-            'name': 'Kemadruma Yoga',
-            'type': 'Chandra Yoga (Negative)',
-            'planets': ['Moon'],
-            'effects': 'Struggles in life, poverty, obstacles (can be cancelled by other factors)'
-        })
-    
-    # Gaja Kesari Yoga - Jupiter in kendra from Moon
-    jupiter_from_moon = planets_from_moon.get('Jupiter')
-    if jupiter_from_moon in [1, 4, 7, 10]:
-        yogas.append({
-            'name': 'Gaja Kesari Yoga',
-            'type': 'Chandra Yoga',
-            'planets': ['Moon', 'Jupiter'],
-            'effects': 'Wisdom, wealth, fame, respected like an elephant'
-        })
-    
-    return yogas
+def get_mahapurusha_effects(yoga_name):
+    """Get the effects of Pancha Mahapurusha Yogas."""
+    return next((effects for _, name, _, _, effects in MAHAPURUSHA if name == yoga_name), '')
 
-def calculate_nabhasa_yogas(planets):
-    """
-    Calculate Nabhasa Yogas based on planetary distribution patterns.
-    These yogas are based on how planets are distributed in the chart.
-    """
-    yogas = []
-    
-    # Count planets in different sign types
-    movable_signs = [1, 4, 7, 10]
-    fixed_signs = [2, 5, 8, 11]
-    dual_signs = [3, 6, 9, 12]
-    
-    planets_in_movable = sum(1 for p in planets if p['sign'] in movable_signs and p['name'] not in ['Rahu', 'Ketu'])
-    planets_in_fixed = sum(1 for p in planets if p['sign'] in fixed_signs and p['name'] not in ['Rahu', 'Ketu'])
-    planets_in_dual = sum(1 for p in planets if p['sign'] in dual_signs and p['name'] not in ['Rahu', 'Ketu'])
-    
-    # Rajju Yoga - all planets in movable signs
-    if planets_in_movable == 7:
-        yogas.append({
-            'name': 'Rajju Yoga',
-            'type': 'Nabhasa Yoga',
-            'effects': 'Always traveling, unstable life but gains through travel'
-        })
-    
-    # Musala Yoga - all planets in fixed signs
-    if planets_in_fixed == 7:
-        yogas.append({
-            'name': 'Musala Yoga',
-            'type': 'Nabhasa Yoga',
-            'effects': 'Stable, determined, proud, prosperous'
-        })
-    
-    # Nala Yoga - all planets in dual signs
-    if planets_in_dual == 7:
-        yogas.append({
-            'name': 'Nala Yoga',
-            'type': 'Nabhasa Yoga',
-            'effects': 'Intelligent, skilled in many arts, adaptable'
-        })
-    
-    return yogas
 
 def calculate_all_yogas(planets, houses, aspects=None):
-    """Calculate all major yogas in the chart."""
-    all_yogas = {
-        'pancha_mahapurusha': calculate_pancha_mahapurusha_yogas(planets, houses),
-        'raj_yogas': calculate_raj_yogas(planets, houses, aspects=aspects),
-        'dhana_yogas': calculate_dhana_yogas(planets, houses),
-        'chandra_yogas': calculate_chandra_yogas(planets),
-        'nabhasa_yogas': calculate_nabhasa_yogas(planets)
-    }
-    
+    """Calculate all major yogas in the chart.
+
+    ``aspects`` may be an :class:`AspectMatrix`; otherwise aspects follow
+    the graha drishti table.
+    """
+    all_yogas = find_yogas(chart_state_from(planets, houses, aspects))[0]
+
     # Count total yogas
     total = sum(len(yogas) for yogas in all_yogas.values())
     
@@ -93,6 +93,11 @@ async def _async_geocode_once(query: str, locale: str | None = None):
     return lat, lon, tz
 
 
+def timezone_at(lat: float, lon: float) -> str:
+    """Return the IANA timezone for a coordinate pair, falling back to UTC."""
+    return _tzfinder.timezone_at(lat=lat, lng=lon) or 'UTC'
+
+
 @lru_cache(maxsize=128)
 def geocode_location(query: str, locale: str | None = None):
     """Return (lat, lon, timezone) for a place string."""
@@ -111,7 +116,7 @@ def geocode_location(query: str, locale: str | None = None):
         raise ValueError(f"Could not resolve location '{query}'")
 
     if not tz:
-        tz = _tzfinder.timezone_at(lat=lat, lng=lon) or 'UTC'
+        tz = timezone_at(lat, lon)
     return lat, lon, tz
 
 
@@ -132,5 +137,5 @@ async def geocode_location_async(query: str, locale: str | None = None):
         raise ValueError(f"Could not resolve location '{query}'")
 
     if not tz:
-        tz = _tzfinder.timezone_at(lat=lat, lng=lon) or 'UTC'
+        tz = timezone_at(lat, lon)
     return lat, lon, tz
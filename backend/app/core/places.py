@@ -0,0 +1,176 @@
+"""In-memory prefix index over a local place list.
+
+Used for location autocomplete so that clients can resolve coordinates
+without a remote geocoder round trip. The bundled ``data/places.csv``
+covers major cities; set ``PLACES_FILE`` to a GeoNames ``cities*.txt``
+dump (or a CSV with the same columns) for a larger index.
+"""
+
+from __future__ import annotations
+
+import csv
+import heapq
+import logging
+import os
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PLACES_FILE = Path(__file__).resolve().parent.parent / "data" / "places.csv"
+
+# Prefixes up to this length match a large share of a full GeoNames index,
+# so their best MAX_SUGGESTIONS places are stored instead of scanned.
+SHORT_PREFIX = 3
+MAX_SUGGESTIONS = 20
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    admin: str
+    country: str
+    latitude: float
+    longitude: float
+    timezone: str
+    population: int
+
+    @property
+    def label(self) -> str:
+        parts = [self.name]
+        if self.admin and self.admin != self.name:
+            parts.append(self.admin)
+        parts.append(self.country)
+        return ", ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "label": self.label,
+            "admin": self.admin,
+            "country": self.country,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "timezone": self.timezone,
+            "population": self.population,
+        }
+
+
+def normalize(text: str) -> str:
+    """Lower-case, accent-fold and collapse whitespace for index keys."""
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return " ".join(folded.lower().replace(",", " ").split())
+
+
+class PlaceIndex:
+    """Sorted-key prefix index answering top-k queries with ``bisect``.
+
+    Every place is indexed under its name and under ``"name admin country"``
+    so both "pun" and "pune maharashtra" match. Keys are kept in one sorted
+    list; a prefix query is the slice between two bisections, ranked by
+    population. Prefixes of up to :data:`SHORT_PREFIX` characters are
+    answered from precomputed top lists.
+    """
+
+    def __init__(self, places: list[Place]):
+        self.places = places
+        entries = []
+        self._top: dict[str, list[int]] = {}
+        # Places come best-ranked first, so each top list fills in rank order.
+        for idx, place in enumerate(places):
+            keys = {normalize(place.name), normalize(place.label)}
+            for key in keys:
+                if not key:
+                    continue
+                entries.append((key, idx))
+                for n in range(1, min(len(key), SHORT_PREFIX) + 1):
+                    top = self._top.setdefault(key[:n], [])
+                    if len(top) < MAX_SUGGESTIONS and (not top or top[-1] != idx):
+                        top.append(idx)
+        entries.sort()
+        self._keys = [k for k, _ in entries]
+        self._ids = [i for _, i in entries]
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def suggest(self, query: str, limit: int = 5) -> list[Place]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX and limit <= MAX_SUGGESTIONS:
+            return [self.places[i] for i in self._top.get(prefix, [])[:limit]]
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\uffff", lo)
+        # ``places`` is sorted by descending population, so the lowest ids
+        # are the best-ranked matches.
+        best = heapq.nsmallest(limit, set(self._ids[lo:hi]))
+        return [self.places[i] for i in best]
+
+
+def _read_csv(path: Path) -> list[Place]:
+    places = []
+    with path.open(newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            places.append(
+                Place(
+                    name=row["name"],
+                    admin=row.get("admin", ""),
+                    country=row.get("country", ""),
+                    latitude=float(row["latitude"]),
+                    longitude=float(row["longitude"]),
+                    timezone=row["timezone"],
+                    population=int(row.get("population") or 0),
+                )
+            )
+    return places
+
+
+def _read_geonames(path: Path) -> list[Place]:
+    """Parse a tab-separated GeoNames ``cities*.txt`` dump."""
+    places = []
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 18:
+                continue
+            places.append(
+                Place(
+                    name=cols[1],
+                    admin=cols[10],
+                    country=cols[8],
+                    latitude=float(cols[4]),
+                    longitude=float(cols[5]),
+                    timezone=cols[17] or "UTC",
+                    population=int(cols[14] or 0),
+                )
+            )
+    return places
+
+
+def load_places(path: str | Path | None = None) -> list[Place]:
+    """Load places from ``path``, ``$PLACES_FILE`` or the bundled CSV."""
+    path = Path(path or os.getenv("PLACES_FILE") or DEFAULT_PLACES_FILE)
+    if path.suffix == ".txt":
+        places = _read_geonames(path)
+    else:
+        places = _read_csv(path)
+    places.sort(key=lambda p: -p.population)
+    logger.info("Loaded %d places from %s", len(places), path)
+    return places
+
+
+@lru_cache(maxsize=1)
+def get_place_index() -> PlaceIndex:
+    """Return the process-wide place index, building it on first use."""
+    return PlaceIndex(load_places())
+
+
+@lru_cache(maxsize=4096)
+def suggest_places(query: str, limit: int = 5) -> tuple[dict, ...]:
+    """Return the ``limit`` most populous places whose name starts with ``query``."""
+    return tuple(p.to_dict() for p in get_place_index().suggest(query, limit))
@@ -0,0 +1,48 @@
+from datetime import date, datetime, time
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from ..astrology.events import iter_events
+
+router = APIRouter()
+
+# Keep a single response bounded; the Moon alone has ~500 ingresses a year.
+MAX_RANGE_DAYS = 366 * 20
+
+
+def _split(value: Optional[str]) -> Optional[list[str]]:
+    if not value:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+@router.get("/events")
+def list_events(
+    start: date = Query(..., description="First day (UTC) of the range"),
+    end: date = Query(..., description="Day (UTC) after the last day of the range"),
+    planets: Optional[str] = Query(None, description="Comma-separated grahas, e.g. Sun,Mars"),
+    types: Optional[str] = Query(None, description="Comma-separated event types"),
+    ayanamsa: Literal["lahiri", "raman", "kp", "fagan_bradley"] = "lahiri",
+    node_type: Literal["mean", "true"] = "mean",
+):
+    """List sign/nakshatra ingresses and retrograde stations in a date range."""
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+    try:
+        events = [
+            e.to_dict()
+            for e in iter_events(
+                datetime.combine(start, time()),
+                datetime.combine(end, time()),
+                _split(planets),
+                _split(types),
+                ayanamsa=ayanamsa,
+                node_type=node_type,
+            )
+        ]
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    return {"events": events, "count": len(events)}
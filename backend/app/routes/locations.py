@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Query
+from pydantic import BaseModel
+
+from ..core.places import MAX_SUGGESTIONS, suggest_places
+
+router = APIRouter()
+
+
+class PlaceSuggestion(BaseModel):
+    name: str
+    label: str
+    admin: str
+    country: str
+    latitude: float
+    longitude: float
+    timezone: str
+    population: int
+
+
+@router.get("/locations/suggest", response_model=list[PlaceSuggestion])
+def suggest_locations(
+    q: str = Query(..., min_length=1, max_length=100, description="Place name prefix"),
+    limit: int = Query(5, ge=1, le=MAX_SUGGESTIONS),
+):
+    """Autocomplete places from the local prefix index, most populous first."""
+    return list(suggest_places(q, limit))
@@ -1,20 +1,45 @@
 # backend/routes/profile.py - ENHANCED VERSION
 # at the very top of backend/routes/profile.py
 import logging
-from datetime import date, time as dt_time
+from datetime import date, datetime, time as dt_time
 from typing import Optional, Dict, Any
 import time as pytime  # <-- use module as pytime
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from fastapi.responses import StreamingResponse
+from pydantic import AliasChoices, BaseModel, Field, field_validator, model_validator, ConfigDict
 
 from ..services.astro import (
     ProfileRequest,
     ProfileResponse,
     compute_vedic_profile,
+    compute_divisional_charts,
+    compute_dasha,
+    compute_transits,
+    compute_transit_scores,
+    TransitRequest,
+    TransitScoreRequest,
     compute_panchanga,
+    compute_panchanga_month,
+    compute_lunar_months,
+    compute_hora,
+    HoraRequest,
+    compute_lagna_table,
+    LagnaRequest,
+    compute_rectification,
+    RectificationRequest,
+    compute_chart_search,
+    ChartSearchRequest,
+    compute_muhurta,
+    stream_muhurta,
+    MuhurtaRequest,
+    LunarMonthRequest,
+    PanchangaMonthRequest,
+    compute_kp_cusps,
+    KPCuspRequest,
     enqueue_profile_job,
     get_job,
+    check_location_fields,
 )
 
 router = APIRouter()
@@ -40,7 +65,10 @@ class QuickProfileRequest(BaseModel):
 
     birth_date: date   = Field(..., alias="date",  description="Birth date in YYYY-MM-DD")
     birth_time: dt_time = Field(..., alias="time",  description="Birth time in HH:MM")
-    location: str      = Field(..., min_length=2,  description="Birth location")
+    location: str      = Field("",  description="Birth location")
+    latitude: Optional[float] = Field(None, ge=-90, le=90, validation_alias=AliasChoices("latitude", "lat"))
+    longitude: Optional[float] = Field(None, ge=-180, le=180, validation_alias=AliasChoices("longitude", "lon"))
+    timezone: Optional[str] = Field(None, description="IANA timezone; looked up from coordinates if omitted")
 
     @field_validator('birth_date')
     @classmethod
@@ -51,6 +79,21 @@ class QuickProfileRequest(BaseModel):
             raise ValueError("Birth date must be after 1800")
         return v
 
+    @model_validator(mode="after")
+    def validate_location(self):
+        check_location_fields(self.location, self.latitude, self.longitude)
+        return self
+
+    def to_profile_request(self) -> ProfileRequest:
+        return ProfileRequest(
+            birth_date=self.birth_date,
+            birth_time=self.birth_time,
+            location=self.location,
+            latitude=self.latitude,
+            longitude=self.longitude,
+            timezone=self.timezone,
+        )
+
 
 
 # Enhanced profile endpoint with better error handling
@@ -61,7 +104,7 @@ async def get_profile(request: ProfileRequest):
     
     try:
         # Validate request data
-        if not request.location.strip():
+        if not request.location.strip() and not request.has_coordinates:
             raise HTTPException(status_code=400, detail="Location cannot be empty")
             
         # Log computation start
@@ -100,11 +143,7 @@ async def get_quick_profile(request: QuickProfileRequest):
     
     try:
         # Convert to full ProfileRequest
-        full_request = ProfileRequest(
-            birth_date=request.birth_date,
-            birth_time=request.birth_time,
-            location=request.location
-        )
+        full_request = request.to_profile_request()
         
         result = compute_vedic_profile(full_request)
         
@@ -185,27 +224,35 @@ async def get_job_result(job_id: str):
 
 # Specialized endpoints for specific calculations
 @router.post("/divisional-charts")
-async def get_divisional_charts(request: ProfileRequest):
-    """Return all divisional charts (D1-D60) with interpretations."""
-    logger.info(f"Divisional charts request for {request.location}")
+async def get_divisional_charts(
+    request: ProfileRequest,
+    charts: Optional[str] = Query(None, description="Comma separated charts, e.g. D1,D9,D60 (default: all)"),
+):
+    """Return the requested divisional charts (D1-D60) with interpretations and yogas."""
+    logger.info(f"Divisional charts request for {request.location} ({charts or 'all'})")
     
     try:
-        data = compute_vedic_profile(request)
-        charts = data.get("divisionalCharts", {})
+        data = compute_divisional_charts(request, charts)
         
         # Add chart interpretations
         result = {
-            "charts": charts,
-            "interpretations": data.get("analysis", {}).get("divisionalCharts", {}),
-            "vargottama_planets": data.get("vargottamaPlanets", []),
+            "charts": data["charts"],
+            "interpretations": data["interpretations"],
+            "vargottama_planets": data["vargottama_planets"],
+            "yogas": data["yogas"],
             "summary": {
-                "total_charts": len(charts),
-                "strong_planets": [],  # Could analyze strength across charts
+                "total_charts": len(data["charts"]),
+                "strong_planets": data["yoga_summary"]["strong_planets"],
+                "yogas": data["yoga_summary"]["yogas"],
+                "yoga_planets": data["yoga_summary"]["planets"],
+                "vimshopaka": data["vimshopaka"],
             }
         }
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Divisional charts computation failed")
         raise HTTPException(status_code=500, detail=str(e))
@@ -213,29 +260,70 @@ async def get_divisional_charts(request: ProfileRequest):
 @router.post("/dasha")
 async def get_dasha(
     request: ProfileRequest,
-    depth: int = Query(3, ge=1, le=5, description="Dasha depth (1-5 levels)")
+    depth: int = Query(3, ge=1, le=5, description="Dasha depth (1-5 levels)"),
+    cursor: Optional[str] = Query(None, description="Resume after this period path"),
+    limit: int = Query(200, ge=1, le=1000, description="Maximum periods per page"),
+    at: Optional[datetime] = Query(None, description="Instant for current_period (default now)"),
+    system: str = Query("vimshottari", description="vimshottari, yogini, ashtottari or chara"),
 ):
-    """Return Vimshottari dasha with configurable sub-periods depth."""
+    """Return a dasha system with configurable sub-periods depth."""
     logger.info(f"Dasha request for {request.location} with depth {depth}")
     
     try:
-        data = compute_vedic_profile(request)
-        dashas = data.get("vimshottariDasha", [])
-        
-        return {
-            "vimshottari_dasha": dashas,
-            "current_period": dashas[0] if dashas else None,
-            "interpretations": data.get("analysis", {}).get("vimshottariDasha", []),
-            "metadata": {
-                "depth": depth,
-                "total_periods": len(dashas)
-            }
+        data = compute_dasha(request, depth=depth, cursor=cursor, limit=limit, at=at, system=system)
+        data["metadata"] = {
+            "depth": depth,
+            "system": system,
+            "total_periods": data.pop("total_periods"),
+            "returned": len(data["periods"]),
         }
+        return data
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Dasha computation failed")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/transits")
+async def get_transits(request: TransitRequest):
+    """Return transit (gochara) intervals relative to a natal chart."""
+    logger.info(f"Transit request {request.start} - {request.end}")
+
+    try:
+        return compute_transits(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Transit computation failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/transits/scores")
+async def get_transit_scores(request: TransitScoreRequest):
+    """Return a daily or hourly Ashtakavarga transit strength timeline."""
+    logger.info(f"Transit score request {request.start} - {request.end} ({request.resolution})")
+
+    try:
+        return compute_transit_scores(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Transit scoring failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/kp/cusps")
+async def get_kp_cusps(request: KPCuspRequest):
+    """Return KP sign, star, sub and sub-sub lords of the cusps at many instants."""
+    logger.info(f"KP cusp request for {len(request.times)} instants")
+
+    try:
+        return compute_kp_cusps(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("KP cusp computation failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/panchanga")
 async def get_panchanga(request: ProfileRequest):
     """Return comprehensive panchanga (five-limb) calculations."""
@@ -261,6 +349,99 @@ async def get_panchanga(request: ProfileRequest):
         logger.exception("Panchanga computation failed")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/panchanga/calendar")
+async def get_panchanga_calendar(request: PanchangaMonthRequest):
+    """Return the sunrise panchanga of every day in a month with element end times."""
+    logger.info(f"Panchanga calendar request {request.year}-{request.month:02d}")
+
+    try:
+        return compute_panchanga_month(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Panchanga calendar computation failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/panchanga/months")
+async def get_lunar_months(request: LunarMonthRequest):
+    """Return lunar months (masa) with new/full moons and adhika/kshaya flags."""
+    logger.info(f"Lunar month request {request.start} - {request.end}")
+
+    try:
+        return compute_lunar_months(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Lunar month computation failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/hora")
+async def get_hora(request: HoraRequest):
+    """Return planetary horas, choghadiyas and inauspicious periods for a date range."""
+    logger.info(f"Hora request {request.start} - {request.end}")
+
+    try:
+        return compute_hora(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Hora computation failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/lagna")
+async def get_lagna_table(request: LagnaRequest):
+    """Return the rising times of signs, nakshatras or navamsas on a date."""
+    logger.info(f"Lagna table request {request.date}")
+
+    try:
+        return compute_lagna_table(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Lagna table computation failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/rectification")
+async def rectify_birth_time(request: RectificationRequest):
+    """Return the spans of a birth-time window where the key chart factors hold."""
+    logger.info(f"Rectification request {request.date} {request.window_start}-{request.window_end}")
+
+    try:
+        return compute_rectification(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Rectification failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/chart/search")
+async def search_charts(request: ChartSearchRequest):
+    """Return the time intervals where grahas and lagna meet every condition."""
+    logger.info(f"Chart search {request.start} - {request.end}: {len(request.conditions)} conditions")
+
+    try:
+        return compute_chart_search(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Chart search failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/muhurta")
+async def find_muhurta(request: MuhurtaRequest):
+    """Return ranked windows where the muhurta rules hold, or stream them as NDJSON."""
+    logger.info(f"Muhurta search {request.start} - {request.end}")
+
+    try:
+        if request.stream:
+            return StreamingResponse(stream_muhurta(request), media_type="application/x-ndjson")
+        return compute_muhurta(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Muhurta search failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Batch processing endpoint for multiple profiles
 @router.post("/profiles/batch")
 async def process_batch_profiles(
@@ -278,11 +459,7 @@ async def process_batch_profiles(
     
     for profile in profiles:
         try:
-            full_request = ProfileRequest(
-                birth_date=profile.birth_date,
-                birth_time=profile.birth_time,
-                location=profile.location
-            )
+            full_request = profile.to_profile_request()
             job_id = enqueue_profile_job(full_request, background_tasks)
             job_ids.append(job_id)
         except Exception as e:
@@ -3,11 +3,13 @@ from __future__ import annotations
 
 import logging
 import json
-from typing import Literal, Optional, Dict
-from datetime import date as dt_date, time as dt_time, datetime
+from itertools import islice
+from typing import Annotated, Iterator, Literal, Optional, Dict
+from datetime import date as dt_date, time as dt_time, datetime, timedelta, timezone as dt_timezone
 
 from fastapi import BackgroundTasks, HTTPException
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict, field_validator, model_validator
+import pytz
 import swisseph as swe
 import time
 import threading
@@ -17,23 +19,44 @@ import uuid
 import traceback
 
 from ..core.config import load_config
-from ..core.geocoder import geocode_location
+from ..core.geocoder import geocode_location, timezone_at
 from ..astrology.birth_info import get_birth_info
 from ..astrology.planets import calculate_planets
-from ..astrology.dasha import calculate_vimshottari_dasha
+from ..astrology.dasha import (
+    DASHA_CONVENTION,
+    DASHA_SYSTEMS,
+    build_dasha,
+    calculate_vimshottari_dasha,
+    datetime_to_jd,
+    format_cursor,
+    parse_cursor,
+)
 from ..astrology.nakshatra import get_nakshatra
 from ..astrology.house_analysis import analyze_houses
 from ..astrology.core_elements import calculate_core_elements
 from ..astrology.divisional_charts import (
     get_vargottama_planets,
     calculate_divisional_charts,
+    parse_chart_keys,
 )
-from ..astrology.aspects import calculate_vedic_aspects, calculate_sign_aspects
-from ..astrology.yogas import calculate_all_yogas
+from ..astrology.d_charts_interpretations import augment_divisional_charts
+from ..astrology.aspects import build_aspect_matrix, calculate_vedic_aspects, calculate_sign_aspects
+from ..astrology.yogas import calculate_all_yogas, varga_yogas
+from ..astrology.vimshopaka import calculate_vimshopaka
+from ..astrology.kp import KP_SUBS, calculate_kp, kp_cusp_table
 from ..astrology.shadbala import calculate_shadbala, calculate_bhava_bala
-from ..astrology.ashtakavarga import calculate_ashtakavarga
-from ..astrology.analysis import full_analysis
+from ..astrology.ashtakavarga import calculate_full_ashtakavarga
+from ..astrology.analysis import full_analysis, interpret_dasha_sequence
+from ..astrology.transits import ashtakavarga_timeline, transit_timeline
 from ..astrology import panchanga
+from ..astrology.panchanga_calendar import local_time, month_calendar
+from ..astrology.masa import lunar_months, masa_at
+from ..astrology.sun_data import day_number
+from ..astrology.hora import hora_timetable
+from ..astrology.lagna import lagna_table
+from ..astrology.rectification import rectification_intervals
+from ..astrology.chart_search import BODIES, ChartCondition, nakshatra_number, search_chart, sign_number
+from ..astrology.muhurta import MuhurtaRules, WEEKDAY_NAMES, iter_muhurtas, search_muhurtas
 from ..utils.signs import get_sign_name
 
 CONFIG = load_config()
@@ -98,7 +121,10 @@ def _run_profile_job(payload: dict):
 def enqueue_profile_job(request: ProfileRequest, background_tasks: BackgroundTasks) -> str:
     job_id = uuid.uuid4().hex
     with _JOBS_LOCK:
-        _JOBS[job_id] = {"status": "pending", "result": None, "error": None, "ts": time.time()}
+        _JOBS[job_id] = {
+            "status": "pending", "result": None, "error": None, "ts": time.time(),
+            "ayanamsa": request.ayanamsa, "node_type": request.node_type,
+        }
 
     def runner():
         with _JOBS_LOCK:
@@ -123,7 +149,10 @@ def get_job(job_id: str) -> dict | None:
         if not data:
             return None
         # keep legacy shape
-        return {"status": data["status"], "result": data["result"], "error": data["error"]}
+        return {
+            "status": data["status"], "result": data["result"], "error": data["error"],
+            "ayanamsa": data.get("ayanamsa"), "node_type": data.get("node_type"),
+        }
 
 def clear_profile_cache():
     for key in list(_CACHE.scan_iter("profile:")):
@@ -137,17 +166,46 @@ def clear_profile_cache() -> None:
         _CACHE.delete(key)
 
 
+def check_location_fields(location: str, latitude: float | None, longitude: float | None) -> None:
+    """Require either a place name or a complete latitude/longitude pair."""
+    if (latitude is None) != (longitude is None):
+        raise ValueError("latitude and longitude must be provided together")
+    if latitude is None and not (location or "").strip():
+        raise ValueError("location or latitude/longitude is required")
+
+
 class ProfileRequest(BaseModel):
-    """Request payload for Vedic profile computations."""
+    """Request payload for Vedic profile computations.
+
+    Clients that already know the coordinates may send ``latitude``,
+    ``longitude`` and optionally ``timezone``; geocoding is then skipped.
+    """
 
     model_config = ConfigDict(populate_by_name=True)
 
     birth_date: dt_date = Field(..., alias="date")
     birth_time: dt_time = Field(..., alias="time")
-    location: str
+    location: str = ""
+    latitude: Optional[float] = Field(
+        default=None, ge=-90, le=90, validation_alias=AliasChoices("latitude", "lat")
+    )
+    longitude: Optional[float] = Field(
+        default=None, ge=-180, le=180, validation_alias=AliasChoices("longitude", "lon")
+    )
+    timezone: Optional[str] = None
     ayanamsa: Literal["lahiri", "raman", "kp"] = Field(default="lahiri")
     node_type: Literal["mean", "true"] = Field(default="mean", alias="lunar_node")
     house_system: Literal["whole_sign", "equal", "sripati"] = Field(default="whole_sign")
+    charts: Optional[list[str]] = Field(
+        default=None, description="Divisional charts to include, e.g. ['D1', 'D9']; all when omitted"
+    )
+
+    @field_validator("charts", mode="before")
+    @classmethod
+    def _valid_charts(cls, v):
+        if v is None:
+            return v
+        return list(parse_chart_keys(v))
 
     @field_validator("birth_date")
     @classmethod
@@ -165,6 +223,295 @@ class ProfileRequest(BaseModel):
             raise ValueError("birth time must not include seconds")
         return v
 
+    @model_validator(mode="after")
+    def _location_or_coordinates(self) -> "ProfileRequest":
+        check_location_fields(self.location, self.latitude, self.longitude)
+        return self
+
+    @property
+    def has_coordinates(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
+    def location_key(self) -> str:
+        """Cache-key fragment identifying the place of this request."""
+        if self.has_coordinates:
+            return f"{self.latitude:.4f},{self.longitude:.4f},{self.timezone or ''}"
+        return self.location.strip().lower()
+
+
+class NatalPosition(BaseModel):
+    name: str
+    longitude: float = Field(..., ge=0, lt=360, description="Sidereal longitude")
+
+
+class NatalChart(BaseModel):
+    ascendant: float = Field(..., ge=0, lt=360, description="Sidereal ascendant")
+    planets: list[NatalPosition]
+
+
+MAX_TRANSIT_DAYS = 366 * 50
+
+
+class TransitRequest(BaseModel):
+    """Date range plus exactly one natal chart source.
+
+    ``birth`` computes the chart, ``job_id`` reuses a completed profile
+    job and ``natal`` passes sidereal positions directly.
+    """
+
+    start: dt_date
+    end: dt_date
+    planets: Optional[list[str]] = Field(default=None, description="Transiting grahas; all when omitted")
+    birth: Optional[ProfileRequest] = None
+    job_id: Optional[str] = None
+    natal: Optional[NatalChart] = None
+    ayanamsa: Literal["lahiri", "raman", "kp"] = Field(default="lahiri")
+    node_type: Literal["mean", "true"] = Field(default="mean", alias="lunar_node")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @model_validator(mode="after")
+    def _one_source_and_valid_range(self) -> "TransitRequest":
+        sources = [self.birth is not None, self.job_id is not None, self.natal is not None]
+        if sum(sources) != 1:
+            raise ValueError("provide exactly one of birth, job_id or natal")
+        if self.end <= self.start:
+            raise ValueError("end must be after start")
+        if (self.end - self.start).days > MAX_TRANSIT_DAYS:
+            raise ValueError(f"range is limited to {MAX_TRANSIT_DAYS} days")
+        return self
+
+
+MAX_SCORE_SAMPLES = 24 * 366
+
+
+class TransitScoreRequest(TransitRequest):
+    resolution: Literal["day", "hour"] = "day"
+
+    @model_validator(mode="after")
+    def _bounded_samples(self) -> "TransitScoreRequest":
+        per_day = 24 if self.resolution == "hour" else 1
+        if (self.end - self.start).days * per_day > MAX_SCORE_SAMPLES:
+            raise ValueError(f"at most {MAX_SCORE_SAMPLES} samples per request")
+        return self
+
+
+class PlaceRequest(BaseModel):
+    """A place given by name or by coordinates (with optional timezone)."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    location: str = ""
+    latitude: Optional[float] = Field(
+        default=None, ge=-90, le=90, validation_alias=AliasChoices("latitude", "lat")
+    )
+    longitude: Optional[float] = Field(
+        default=None, ge=-180, le=180, validation_alias=AliasChoices("longitude", "lon")
+    )
+    timezone: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _location_or_coordinates(self) -> "PlaceRequest":
+        check_location_fields(self.location, self.latitude, self.longitude)
+        return self
+
+    @property
+    def has_coordinates(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
+
+class PanchangaMonthRequest(PlaceRequest):
+    """A calendar month at a place."""
+
+    year: int = Field(..., ge=1800, le=2399)
+    month: int = Field(..., ge=1, le=12)
+    ayanamsa: Literal["lahiri", "raman", "kp"] = Field(default="lahiri")
+
+
+MAX_HORA_DAYS = 62
+
+
+class HoraRequest(PlaceRequest):
+    """A range of local dates (inclusive) at a place."""
+
+    start: dt_date
+    end: dt_date
+
+    @model_validator(mode="after")
+    def _valid_range(self) -> "HoraRequest":
+        if self.end < self.start:
+            raise ValueError("end must not be before start")
+        if (self.end - self.start).days >= MAX_HORA_DAYS:
+            raise ValueError(f"range is limited to {MAX_HORA_DAYS} days")
+        return self
+
+
+class LagnaRequest(PlaceRequest):
+    """A date at a place and the ascendant divisions to tabulate."""
+
+    date: dt_date
+    divisions: list[Literal["sign", "nakshatra", "navamsa"]] = Field(default_factory=lambda: ["sign"])
+    ayanamsa: Literal["lahiri", "raman", "kp"] = Field(default="lahiri")
+
+
+class RectificationRequest(PlaceRequest):
+    """A birth date, place and the local time window the birth fell in.
+
+    A window whose end is not after its start runs past midnight.
+    """
+
+    date: dt_date
+    window_start: dt_time
+    window_end: dt_time
+    ayanamsa: Literal["lahiri", "raman", "kp"] = Field(default="lahiri")
+
+
+class ChartConditionModel(BaseModel):
+    """``body`` in a sign and/or nakshatra (numbers or names), optionally retrograde."""
+
+    body: Literal[BODIES]
+    sign: Optional[int | str] = None
+    nakshatra: Optional[int | str] = None
+    retrograde: Optional[bool] = None
+
+    def to_condition(self) -> ChartCondition:
+        return ChartCondition(
+            self.body,
+            sign=None if self.sign is None else sign_number(self.sign),
+            nakshatra=None if self.nakshatra is None else nakshatra_number(self.nakshatra),
+            retrograde=self.retrograde,
+        )
+
+    @model_validator(mode="after")
+    def _valid_condition(self) -> "ChartConditionModel":
+        self.to_condition()
+        return self
+
+
+MAX_SEARCH_DAYS = 366 * 50
+# Without a graha condition the ascendant is solved for every day.
+MAX_LAGNA_SEARCH_DAYS = 366
+
+
+class ChartSearchRequest(PlaceRequest):
+    """Chart conditions to find over a range of local dates (inclusive) at a place."""
+
+    start: dt_date
+    end: dt_date
+    conditions: list[ChartConditionModel] = Field(..., min_length=1)
+    ayanamsa: Literal["lahiri", "raman", "kp"] = Field(default="lahiri")
+    node_type: Literal["mean", "true"] = Field(default="mean", alias="lunar_node")
+    limit: int = Field(default=500, ge=1, le=5000)
+
+    @model_validator(mode="after")
+    def _valid_range(self) -> "ChartSearchRequest":
+        if self.end < self.start:
+            raise ValueError("end must not be before start")
+        limit = MAX_SEARCH_DAYS
+        if all(c.body == "Lagna" for c in self.conditions):
+            limit = MAX_LAGNA_SEARCH_DAYS
+        if (self.end - self.start).days >= limit:
+            raise ValueError(f"range is limited to {limit} days for these conditions")
+        return self
+
+
+MAX_MUHURTA_DAYS = 366
+
+
+class MuhurtaRequest(PlaceRequest):
+    """Muhurta rules over a range of local dates (inclusive) at a place.
+
+    Tithis count 1-30 from Shukla Pratipada, nakshatras 1-27 from Ashwini
+    and lagnas 1-12 from Mesha; omitted lists allow every value.
+    """
+
+    start: dt_date
+    end: dt_date
+    tithis: Optional[list[Annotated[int, Field(ge=1, le=30)]]] = None
+    nakshatras: Optional[list[Annotated[int, Field(ge=1, le=27)]]] = None
+    weekdays: Optional[list[Literal[tuple(WEEKDAY_NAMES)]]] = None
+    lagnas: Optional[list[Annotated[int, Field(ge=1, le=12)]]] = None
+    exclude_rahu_kalam: bool = True
+    exclude_vishti: bool = True
+    min_minutes: float = Field(default=0.0, ge=0)
+    ayanamsa: Literal["lahiri", "raman", "kp"] = Field(default="lahiri")
+    limit: int = Field(default=20, ge=1, le=500)
+    stream: bool = Field(default=False, description="Stream every window in time order as NDJSON")
+
+    @model_validator(mode="after")
+    def _valid_range(self) -> "MuhurtaRequest":
+        if self.end < self.start:
+            raise ValueError("end must not be before start")
+        if (self.end - self.start).days >= MAX_MUHURTA_DAYS:
+            raise ValueError(f"range is limited to {MAX_MUHURTA_DAYS} days")
+        return self
+
+    def rules(self) -> MuhurtaRules:
+        def allowed(values):
+            return None if values is None else frozenset(values)
+
+        return MuhurtaRules(
+            tithis=allowed(self.tithis),
+            nakshatras=allowed(self.nakshatras),
+            weekdays=allowed(None if self.weekdays is None
+                             else [WEEKDAY_NAMES.index(d) for d in self.weekdays]),
+            lagnas=allowed(self.lagnas),
+            exclude_rahu_kalam=self.exclude_rahu_kalam,
+            exclude_vishti=self.exclude_vishti,
+            min_minutes=self.min_minutes,
+        )
+
+
+MAX_MASA_YEARS = 50
+
+
+class LunarMonthRequest(BaseModel):
+    start: dt_date
+    end: dt_date
+    ayanamsa: Literal["lahiri", "raman", "kp"] = Field(default="lahiri")
+
+    @model_validator(mode="after")
+    def _valid_range(self) -> "LunarMonthRequest":
+        if self.end <= self.start:
+            raise ValueError("end must be after start")
+        if (self.end - self.start).days > 366 * MAX_MASA_YEARS:
+            raise ValueError(f"range is limited to {MAX_MASA_YEARS} years")
+        return self
+
+
+MAX_KP_INSTANTS = 1440
+
+
+class KPCuspRequest(BaseModel):
+    """Instants (local to ``timezone``, UTC when omitted) at one place."""
+
+    times: list[datetime] = Field(..., min_length=1, max_length=MAX_KP_INSTANTS)
+    latitude: float = Field(..., ge=-90, le=90, validation_alias=AliasChoices("latitude", "lat"))
+    longitude: float = Field(..., ge=-180, le=180, validation_alias=AliasChoices("longitude", "lon"))
+    timezone: Optional[str] = None
+    ayanamsa: Literal["lahiri", "raman", "kp"] = Field(default="kp")
+    include_table: bool = Field(default=False, description="Also return the 249-sub table")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+def resolve_location(request: ProfileRequest | PlaceRequest) -> tuple[float, float, str]:
+    """Return ``(lat, lon, tz)`` for a request, geocoding only when needed."""
+    if request.has_coordinates:
+        tz = request.timezone or timezone_at(request.latitude, request.longitude)
+        return request.latitude, request.longitude, tz
+
+    loc_str = request.location.strip()
+    logger.info("Geocoding '%s'", loc_str)
+    try:
+        return geocode_location(loc_str)
+    except ValueError as ex:
+        logger.error(str(ex))
+        raise HTTPException(status_code=400, detail=str(ex))
+    except Exception as ex:  # pragma: no cover - unexpected
+        logger.exception("Geocoding failed")
+        raise HTTPException(status_code=500, detail="Geocoding failed") from ex
+
 
 class ProfileResponse(BaseModel):
     """Response schema for complete profile."""
@@ -181,38 +528,15 @@ class ProfileResponse(BaseModel):
     shadbala: Optional[dict] = None
     bhavaBala: Optional[dict] = None
     ashtakavarga: Optional[dict] = None
+    vimshopakaBala: Optional[dict] = None
+    kp: Optional[dict] = None
     panchanga: Optional[dict] = None
     analysis: Optional[dict] = None
 
 
-def compute_vedic_profile(request: ProfileRequest) -> dict:
-    """Compute complete Vedic astrological profile."""
-    key = (
-        request.birth_date.isoformat(),
-        request.birth_time.isoformat(),
-        request.location.strip().lower(),
-        request.ayanamsa,
-        request.house_system,
-        request.node_type,
-    )
-
-    cache_key = "profile:v3:" + "|".join(key)
-    if CONFIG.get("cache_enabled", "true") == "true":
-        cached = _CACHE.get(cache_key)
-        if cached:
-            logger.info("Cache hit for profile %s", key)
-            return json.loads(cached)
-
-    loc_str = request.location.strip()
-    logger.info("Geocoding '%s'", loc_str)
-    try:
-        lat, lon, tz = geocode_location(loc_str)
-    except ValueError as ex:
-        logger.error(str(ex))
-        raise HTTPException(status_code=400, detail=str(ex))
-    except Exception as ex:  # pragma: no cover - unexpected
-        logger.exception("Geocoding failed")
-        raise HTTPException(status_code=500, detail="Geocoding failed") from ex
+def _compute_birth_chart(request: ProfileRequest) -> tuple[float, float, str, dict, list]:
+    """Resolve the location and compute birth info and planetary positions."""
+    lat, lon, tz = resolve_location(request)
 
     logger.info("Computed coordinates %s, %s timezone %s", lat, lon, tz)
 
@@ -245,6 +569,30 @@ def compute_vedic_profile(request: ProfileRequest) -> dict:
         logger.exception("Failed to compute planetary positions")
         raise HTTPException(status_code=500, detail="Failed to compute planetary positions") from ex
 
+    return lat, lon, tz, binfo, planets
+
+
+def compute_vedic_profile(request: ProfileRequest) -> dict:
+    """Compute complete Vedic astrological profile."""
+    key = (
+        request.birth_date.isoformat(),
+        request.birth_time.isoformat(),
+        request.location_key(),
+        request.ayanamsa,
+        request.house_system,
+        request.node_type,
+        ",".join(request.charts or ["all"]),
+    )
+
+    cache_key = "profile:v9:" + "|".join(key)
+    if CONFIG.get("cache_enabled", "true") == "true":
+        cached = _CACHE.get(cache_key)
+        if cached:
+            logger.info("Cache hit for profile %s", key)
+            return json.loads(cached)
+
+    lat, lon, tz, binfo, planets = _compute_birth_chart(request)
+
     try:
         dashas = calculate_vimshottari_dasha(binfo, planets, depth=3)
     except Exception as ex:  # pragma: no cover - unexpected
@@ -272,46 +620,65 @@ def compute_vedic_profile(request: ProfileRequest) -> dict:
         raise HTTPException(status_code=500, detail="Failed to compute core elements") from ex
 
     try:
-        dcharts = calculate_divisional_charts(planets)
+        dcharts = calculate_divisional_charts(planets, charts=request.charts).to_dict()
     except Exception as ex:  # pragma: no cover - unexpected
         logger.exception("Failed to compute divisional charts")
         raise HTTPException(status_code=500, detail="Failed to compute divisional charts") from ex
 
     try:
+        rasi_navamsa = calculate_divisional_charts(planets, charts=["D1", "D9"])
         vargottama = get_vargottama_planets(
-            dcharts.get('D1', {}),
-            dcharts.get('D9', {})
+            rasi_navamsa.get('D1', {}),
+            rasi_navamsa.get('D9', {})
         )
     except Exception as ex:  # pragma: no cover - unexpected
         logger.exception("Failed to compute vargottama planets")
         raise HTTPException(status_code=500, detail="Failed to compute vargottama planets") from ex
 
     try:
-        graha_drishti = calculate_vedic_aspects(planets, houses)
+        aspect_matrix = build_aspect_matrix(planets, houses, virupa=True)
+        graha_drishti = calculate_vedic_aspects(planets, houses, aspect_matrix)
         rasi_drishti = calculate_sign_aspects(planets)
     except Exception as ex:  # pragma: no cover - unexpected
         logger.exception("Failed to compute aspects")
         raise HTTPException(status_code=500, detail="Failed to compute aspects") from ex
 
     try:
-        yogas = calculate_all_yogas(planets, houses, graha_drishti)
+        yogas = calculate_all_yogas(planets, houses, aspect_matrix)
     except Exception as ex:  # pragma: no cover - unexpected
         logger.exception("Failed to compute yogas")
         raise HTTPException(status_code=500, detail="Failed to compute yogas") from ex
 
     try:
-        shadbala = calculate_shadbala(planets, binfo, houses)
-        bhava_bala = calculate_bhava_bala(houses, planets, binfo)
+        shadbala = calculate_shadbala(planets, binfo, houses, aspect_matrix)
+        bhava_bala = calculate_bhava_bala(houses, planets, binfo, shadbala)
     except Exception as ex:  # pragma: no cover - unexpected
         logger.exception("Failed to compute strengths")
         raise HTTPException(status_code=500, detail="Failed to compute strengths") from ex
 
     try:
-        ashtakavarga = calculate_ashtakavarga(planets)
+        ashtakavarga = calculate_full_ashtakavarga(planets, binfo.get("ascendant"))
     except Exception as ex:  # pragma: no cover - unexpected
         logger.exception("Failed to compute ashtakavarga")
         raise HTTPException(status_code=500, detail="Failed to compute ashtakavarga") from ex
 
+    try:
+        vimshopaka = calculate_vimshopaka(planets)
+    except Exception as ex:  # pragma: no cover - unexpected
+        logger.exception("Failed to compute vimshopaka bala")
+        raise HTTPException(status_code=500, detail="Failed to compute vimshopaka bala") from ex
+
+    # KP is an optional section: a chart whose cusps cannot be found still
+    # gets the rest of its profile.
+    try:
+        kp = calculate_kp(planets, {**binfo, "latitude": lat, "longitude": lon})
+    except swe.Error as ex:
+        logger.warning("KP cusps undefined at %.2f, %.2f: %s", lat, lon, ex)
+        kp = None
+    except Exception as ex:  # pragma: no cover - unexpected
+        logger.exception("Failed to compute KP lords")
+        raise HTTPException(status_code=500, detail="Failed to compute KP lords") from ex
+
     try:
         analysis_results = full_analysis(
             planets, dashas, nak, houses, core, dcharts,
@@ -329,6 +696,7 @@ def compute_vedic_profile(request: ProfileRequest) -> dict:
     analysis_results['yogas'] = yogas
     analysis_results['shadbala'] = shadbala
     analysis_results['bhavaBala'] = bhava_bala
+    analysis_results['vimshopakaBala'] = vimshopaka
     analysis_results['vargottamaPlanets'] = vargottama
 
     named_planets = [
@@ -345,12 +713,15 @@ def compute_vedic_profile(request: ProfileRequest) -> dict:
         "divisionalCharts": dcharts,
         "vedicAspects": {
             "grahaDrishti": graha_drishti,
-            "rasiDrishti": rasi_drishti
+            "rasiDrishti": rasi_drishti,
+            "matrix": aspect_matrix.to_dict(),
         },
         "yogas": yogas,
         "ashtakavarga": ashtakavarga,
         "shadbala": shadbala,
         "bhavaBala": bhava_bala,
+        "vimshopakaBala": vimshopaka,
+        "kp": kp,
         "vargottamaPlanets": vargottama,
         "analysis": analysis_results
     }
@@ -360,18 +731,182 @@ def compute_vedic_profile(request: ProfileRequest) -> dict:
 
 
 
-def compute_panchanga(request: ProfileRequest) -> dict:
-    """Compute daily panchanga for the given request."""
-    loc_str = request.location.strip()
-    logger.info("Geocoding '%s'", loc_str)
+def compute_divisional_charts(request: ProfileRequest, charts=None) -> dict:
+    """Compute the requested divisional charts with interpretations and yogas."""
     try:
-        lat, lon, tz = geocode_location(loc_str)
+        keys = parse_chart_keys(charts if charts is not None else request.charts)
     except ValueError as ex:
-        logger.error(str(ex))
         raise HTTPException(status_code=400, detail=str(ex))
+
+    _, _, _, binfo, planets = _compute_birth_chart(request)
+
+    try:
+        dcharts = calculate_divisional_charts(planets, charts=keys)
+        rasi_navamsa = calculate_divisional_charts(planets, charts=["D1", "D9"])
+        charts_data = dcharts.to_dict()
+        interpretations = augment_divisional_charts(charts_data)
+        vargottama = get_vargottama_planets(rasi_navamsa["D1"], rasi_navamsa["D9"])
+        yogas = varga_yogas(planets, binfo["ascendant"], keys)
+        vimshopaka = calculate_vimshopaka(planets)
     except Exception as ex:  # pragma: no cover - unexpected
-        logger.exception("Geocoding failed")
-        raise HTTPException(status_code=500, detail="Geocoding failed") from ex
+        logger.exception("Failed to compute divisional charts")
+        raise HTTPException(status_code=500, detail="Failed to compute divisional charts") from ex
+
+    return {
+        "charts": charts_data,
+        "interpretations": interpretations,
+        "vargottama_planets": vargottama,
+        "yogas": yogas["charts"],
+        "yoga_summary": yogas["summary"],
+        "vimshopaka": vimshopaka,
+    }
+
+
+def compute_dasha(
+    request: ProfileRequest,
+    depth: int = 3,
+    cursor: str | None = None,
+    limit: int = 200,
+    at: datetime | None = None,
+    system: str = "vimshottari",
+) -> dict:
+    """Return one page of a dasha tree expanded to ``depth``.
+
+    Periods are listed in chronological pre-order; pass the returned
+    ``next_cursor`` back as ``cursor`` to fetch the following page.
+    """
+    if system not in DASHA_SYSTEMS:
+        raise HTTPException(status_code=400, detail=f"Unknown dasha system: {system}")
+    try:
+        after = parse_cursor(cursor)
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+
+    _, _, _, binfo, planets = _compute_birth_chart(request)
+
+    if at is None:
+        at = datetime.now(dt_timezone.utc)
+    if at.tzinfo is not None:
+        at = at.astimezone(dt_timezone.utc).replace(tzinfo=None)
+
+    try:
+        engine = build_dasha(system, binfo, planets)
+        periods = engine.iter_periods(depth, after)
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+
+    try:
+        page = list(islice(periods, limit + 1))
+        current = engine.active_at(datetime_to_jd(at), depth)
+    except Exception as ex:  # pragma: no cover - unexpected
+        logger.exception("Failed to compute dasha")
+        raise HTTPException(status_code=500, detail=f"Failed to compute {system} dasha") from ex
+
+    has_more = len(page) > limit
+    page = page[:limit]
+    mahadashas = [p for p in engine.mahadashas() if p.end_jd > engine.birth_jd]
+    fanout = len(engine.system.lords)
+    result = {
+        "system": system,
+        "convention": DASHA_CONVENTION,
+        "mahadashas": [p.to_dict() for p in mahadashas],
+        "total_periods": len(mahadashas) * sum(fanout ** level for level in range(depth)),
+        "periods": [p.to_dict() for p in page],
+        "current_period": [p.to_dict() for p in current],
+        "next_cursor": format_cursor(page[-1].path) if has_more else None,
+    }
+    if system == "vimshottari":
+        dashas = calculate_vimshottari_dasha(binfo, planets)
+        result["vimshottari_dasha"] = dashas
+        result["interpretations"] = interpret_dasha_sequence(dashas)
+    return result
+
+
+def _natal_chart(request: TransitRequest) -> tuple[list[dict], float, str, str]:
+    """Return ``(planets, ascendant, ayanamsa, node_type)`` for a transit request."""
+    if request.natal is not None:
+        planets = [p.model_dump() for p in request.natal.planets]
+        return planets, request.natal.ascendant, request.ayanamsa, request.node_type
+    if request.job_id is not None:
+        job = get_job(request.job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job["status"] != "complete":
+            raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+        # Stored positions only line up with transits in the job's own zodiac.
+        settings = {}
+        for field in ("ayanamsa", "node_type"):
+            settings[field] = job.get(field) or getattr(request, field)
+            if field in request.model_fields_set and getattr(request, field) != settings[field]:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Job was computed with {field} '{settings[field]}'",
+                )
+        result = job["result"]
+        return (
+            result["planetaryPositions"],
+            result["birthInfo"]["ascendant"],
+            settings["ayanamsa"],
+            settings["node_type"],
+        )
+    birth = request.birth
+    _, _, _, binfo, planets = _compute_birth_chart(birth)
+    return planets, binfo["ascendant"], birth.ayanamsa, birth.node_type
+
+
+def compute_transits(request: TransitRequest) -> dict:
+    """Compute transit intervals over a date range for a natal chart."""
+    natal_planets, ascendant, ayanamsa, node_type = _natal_chart(request)
+    start_jd = datetime_to_jd(request.start)
+    end_jd = datetime_to_jd(request.end)
+    try:
+        data = transit_timeline(
+            natal_planets,
+            ascendant,
+            start_jd,
+            end_jd,
+            request.planets,
+            ayanamsa=ayanamsa,
+            node_type=node_type,
+        )
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+    data["range"] = {"start": request.start, "end": request.end}
+    return data
+
+
+def compute_transit_scores(request: TransitScoreRequest) -> dict:
+    """Score transits against the natal Ashtakavarga over a date range."""
+    natal_planets, ascendant, ayanamsa, node_type = _natal_chart(request)
+    positions = [{"name": p["name"], "longitude": p["longitude"]} for p in natal_planets]
+    natal = calculate_full_ashtakavarga(positions, ascendant)
+    try:
+        data = ashtakavarga_timeline(
+            natal["bav"],
+            natal["total_points"],
+            ascendant,
+            datetime_to_jd(request.start),
+            datetime_to_jd(request.end),
+            request.planets,
+            resolution=request.resolution,
+            ayanamsa=ayanamsa,
+            node_type=node_type,
+        )
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+    data["natal"] = natal
+    return data
+
+
+def compute_panchanga(request: ProfileRequest) -> dict:
+    """Compute daily panchanga for the given request."""
+    lat, lon, tz = resolve_location(request)
 
     try:
         binfo = get_birth_info(
@@ -399,8 +934,254 @@ def compute_panchanga(request: ProfileRequest) -> dict:
         moon["longitude"],
         tz,
     )
+    try:
+        data["masa"] = masa_at(binfo["jd_ut"], ayanamsa=request.ayanamsa)
+    except swe.Error as ex:
+        # Outside the ephemeris range; the other limbs are still valid.
+        logger.warning("Could not compute masa: %s", ex)
+
+    return data
+
+
+
+
 
+def compute_kp_cusps(request: KPCuspRequest) -> dict:
+    """Return KP cusp lords for every requested instant in one batch."""
+    try:
+        tz = pytz.timezone(request.timezone or "UTC")
+    except pytz.UnknownTimeZoneError:
+        raise HTTPException(status_code=400, detail=f"Invalid timezone '{request.timezone}'")
+
+    def to_utc(value: datetime) -> datetime:
+        local = tz.localize(value) if value.tzinfo is None else value
+        return local.astimezone(pytz.utc).replace(tzinfo=None)
+
+    jd_values = [datetime_to_jd(to_utc(t)) for t in request.times]
+    try:
+        table = kp_cusp_table(jd_values, request.latitude, request.longitude, request.ayanamsa)
+    except swe.Error as ex:
+        raise HTTPException(status_code=400, detail=f"House cusps are undefined at this location: {ex}")
+
+    for item, value in zip(table, request.times):
+        item["time"] = value
+    # Placidus unless it is undefined at some instant (see kp.kp_cusps).
+    systems = {item["house_system"] for item in table}
+    house_system = systems.pop() if len(systems) == 1 else "mixed"
+    data = {"ayanamsa": request.ayanamsa, "house_system": house_system, "instants": table}
+    if request.include_table:
+        data["subs"] = KP_SUBS.rows()
     return data
 
 
+def compute_panchanga_month(request: PanchangaMonthRequest) -> dict:
+    """Return the sunrise panchanga with element end times for a month.
 
+    Results are cached per location, month and ayanamsa.
+    """
+    lat, lon, tz = resolve_location(request)
+    key = f"{lat:.4f},{lon:.4f},{tz}|{request.year:04d}-{request.month:02d}|{request.ayanamsa}"
+    cache_key = "panchanga-month:v2:" + key
+    if CONFIG.get("cache_enabled", "true") == "true":
+        cached = _CACHE.get(cache_key)
+        if cached:
+            logger.info("Cache hit for panchanga month %s", key)
+            return json.loads(cached)
+
+    try:
+        days = month_calendar(request.year, request.month, lat, lon, tz, ayanamsa=request.ayanamsa)
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+
+    result = {
+        "year": request.year,
+        "month": request.month,
+        "location": {"latitude": lat, "longitude": lon, "timezone": tz},
+        "ayanamsa": request.ayanamsa,
+        "days": days,
+    }
+    if CONFIG.get("cache_enabled", "true") == "true":
+        _CACHE.setex(cache_key, CACHE_TTL, json.dumps(result))
+    return result
+
+
+def compute_lunar_months(request: LunarMonthRequest) -> dict:
+    """Return amanta months with adhika/kshaya flags over a date range."""
+    try:
+        months = lunar_months(
+            datetime_to_jd(request.start), datetime_to_jd(request.end), ayanamsa=request.ayanamsa
+        )
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+    return {"range": {"start": request.start, "end": request.end}, "months": months}
+
+
+def compute_hora(request: HoraRequest) -> dict:
+    """Return horas, choghadiyas and Rahu Kalam/Yamaganda/Gulika for each date."""
+    lat, lon, tz = resolve_location(request)
+    try:
+        days = hora_timetable(request.start, request.end, lat, lon, tz)
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+    return {"location": {"latitude": lat, "longitude": lon, "timezone": tz}, "days": days}
+
+
+def compute_muhurta(request: MuhurtaRequest) -> dict:
+    """Return the best-ranked windows where every muhurta rule holds."""
+    lat, lon, tz = resolve_location(request)
+    try:
+        windows = search_muhurtas(request.start, request.end, lat, lon, tz, request.rules(),
+                                  ayanamsa=request.ayanamsa, limit=request.limit)
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+    return {
+        "range": {"start": request.start, "end": request.end},
+        "location": {"latitude": lat, "longitude": lon, "timezone": tz},
+        "windows": windows,
+    }
+
+
+def stream_muhurta(request: MuhurtaRequest) -> Iterator[str]:
+    """Return NDJSON lines of every matching window in time order.
+
+    The first block is searched before returning so that bad input still
+    fails with an HTTP error instead of a truncated stream.
+    """
+    lat, lon, tz = resolve_location(request)
+    windows = iter_muhurtas(request.start, request.end, lat, lon, tz, request.rules(),
+                            ayanamsa=request.ayanamsa)
+    try:
+        first = next(windows, None)
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+
+    def lines() -> Iterator[str]:
+        if first is None:
+            return
+        yield json.dumps(first) + "\n"
+        for window in windows:
+            yield json.dumps(window) + "\n"
+
+    return lines()
+
+
+def compute_lagna_table(request: LagnaRequest) -> dict:
+    """Return when each sign (and optionally nakshatra/navamsa) rises on a date."""
+    lat, lon, tz = resolve_location(request)
+    try:
+        zone = pytz.timezone(tz)
+    except pytz.UnknownTimeZoneError:
+        raise HTTPException(status_code=400, detail=f"Invalid timezone '{tz}'")
+    try:
+        table = lagna_table(day_number(request.date), lat, lon,
+                            divisions=tuple(dict.fromkeys(request.divisions)), ayanamsa=request.ayanamsa)
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+    for rows in table.values():
+        for row in rows:
+            row["start"] = local_time(row["start"], zone).isoformat(timespec="seconds")
+            row["end"] = local_time(row["end"], zone).isoformat(timespec="seconds")
+    return {
+        "date": request.date,
+        "location": {"latitude": lat, "longitude": lon, "timezone": tz},
+        "ayanamsa": request.ayanamsa,
+        **table,
+    }
+
+
+def compute_rectification(request: RectificationRequest) -> dict:
+    """Return the spans of a birth-time window with constant chart keys."""
+    lat, lon, tz = resolve_location(request)
+    try:
+        zone = pytz.timezone(tz)
+    except pytz.UnknownTimeZoneError:
+        raise HTTPException(status_code=400, detail=f"Invalid timezone '{tz}'")
+
+    def to_jd(day: dt_date, value: dt_time) -> float:
+        local = zone.localize(datetime.combine(day, value))
+        return datetime_to_jd(local.astimezone(pytz.utc).replace(tzinfo=None))
+
+    start_jd = to_jd(request.date, request.window_start)
+    end_day = request.date
+    if request.window_end <= request.window_start:
+        end_day += timedelta(days=1)
+    end_jd = to_jd(end_day, request.window_end)
+    try:
+        intervals = rectification_intervals(start_jd, end_jd, lat, lon, ayanamsa=request.ayanamsa)
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+    def stamp(jd: float) -> str:
+        # Julian day floats carry about 10 microseconds of noise: round, don't truncate.
+        value = local_time(jd, zone) + timedelta(microseconds=500_000)
+        return value.replace(microsecond=0).isoformat()
+
+    for item in intervals:
+        item["minutes"] = round((item["end"] - item["start"]) * 1440, 2)
+        item["start"] = stamp(item["start"])
+        item["end"] = stamp(item["end"])
+    return {
+        "location": {"latitude": lat, "longitude": lon, "timezone": tz},
+        "ayanamsa": request.ayanamsa,
+        "intervals": intervals,
+    }
+
+
+def compute_chart_search(request: ChartSearchRequest) -> dict:
+    """Return the intervals of a date range where every chart condition holds."""
+    lat, lon, tz = resolve_location(request)
+    try:
+        zone = pytz.timezone(tz)
+    except pytz.UnknownTimeZoneError:
+        raise HTTPException(status_code=400, detail=f"Invalid timezone '{tz}'")
+
+    def to_jd(day: dt_date) -> float:
+        local = zone.localize(datetime.combine(day, dt_time()))
+        return datetime_to_jd(local.astimezone(pytz.utc).replace(tzinfo=None))
+
+    try:
+        windows = search_chart(
+            [c.to_condition() for c in request.conditions],
+            to_jd(request.start),
+            to_jd(request.end + timedelta(days=1)),
+            lat,
+            lon,
+            ayanamsa=request.ayanamsa,
+            node_type=request.node_type,
+            limit=request.limit + 1,
+        )
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    except swe.Error as ex:
+        logger.error("SwissEph error: %s", ex)
+        raise HTTPException(status_code=500, detail=f"SwissEph error: {ex}")
+    truncated = len(windows) > request.limit
+    windows = windows[:request.limit]
+    return {
+        "range": {"start": request.start, "end": request.end},
+        "location": {"latitude": lat, "longitude": lon, "timezone": tz},
+        "count": len(windows),
+        "truncated": truncated,
+        "intervals": [
+            {
+                "start": local_time(start, zone).isoformat(timespec="seconds"),
+                "end": local_time(end, zone).isoformat(timespec="seconds"),
+                "minutes": round((end - start) * 1440, 1),
+            }
+            for start, end in windows
+        ],
+    }
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Precompute the new/full moon table used for lunar months (masa).
+
+Run once per deployment (the Docker image does this at build time):
+
+    python build_lunation_table.py [--start 1900] [--end 2100] [--output PATH]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import swisseph as swe
+
+from app.astrology.masa import DEFAULT_TABLE_FILE, build_lunation_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=int, default=1900, help="First year (inclusive)")
+    parser.add_argument("--end", type=int, default=2100, help="Last year (inclusive)")
+    parser.add_argument("--ayanamsa", default="lahiri")
+    parser.add_argument("--output", type=Path, default=DEFAULT_TABLE_FILE)
+    args = parser.parse_args()
+
+    start_jd = swe.julday(args.start, 1, 1, 0.0)
+    end_jd = swe.julday(args.end + 1, 1, 1, 0.0)
+    began = time.perf_counter()
+    table = build_lunation_table(start_jd, end_jd, ayanamsa=args.ayanamsa)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    table.save(args.output)
+    print(
+        f"✓ {len(table)} lunations for {args.start}-{args.end} written to {args.output} "
+        f"({args.output.stat().st_size / 1e3:.0f} kB, {time.perf_counter() - began:.0f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
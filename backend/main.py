@@ -18,6 +18,8 @@ from app.routes.auth import router as auth_router
 from app.routes.profile import router as profile_router
 from app.routes.blog import router as blog_router
 from app.routes.admin import router as admin_router
+from app.routes.locations import router as locations_router
+from app.routes.events import router as events_router
 
 
 logging.basicConfig(level=logging.INFO)
@@ -81,6 +83,8 @@ try:
     app.include_router(profile_router, prefix="/api")
     app.include_router(blog_router, prefix="/api")
     app.include_router(admin_router, prefix="/api")
+    app.include_router(locations_router, prefix="/api")
+    app.include_router(events_router, prefix="/api")
 except Exception as e:
     logger.warning(f"Some routers could not be loaded: {e}")
 
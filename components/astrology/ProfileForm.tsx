@@ -41,7 +41,7 @@ export default function ProfileForm({
     defaultValues: { name: '', birthDate: '', birthTime: '', location: '' },
   });
 
-  const [coords, setCoords] = useState<{ lat?: number; lon?: number }>({});
+  const [coords, setCoords] = useState<{ lat?: number; lon?: number; tz?: string }>({});
   const disabled = useMemo(() => submitting || !isValid, [submitting, isValid]);
 
   return (
@@ -81,7 +81,7 @@ export default function ProfileForm({
             }}
             onSelect={(it: PlaceSuggestion) => {
               setValue('location', it.label, { shouldValidate: true });
-              setCoords({ lat: it.lat, lon: it.lon });
+              setCoords({ lat: it.lat, lon: it.lon, tz: it.tz });
             }}
           />
           {errors.location && (
@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -8,6 +10,9 @@ from backend import main
 from backend.app import models
 from backend.app.core import auth
 
+# Keep the sunrise cache in memory so test runs leave no file behind.
+os.environ.setdefault("SUN_CACHE_FILE", "")
+
 
 @pytest.fixture
 def test_app():
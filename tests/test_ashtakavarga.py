@@ -1,4 +1,14 @@
-from backend.app.astrology.ashtakavarga import calculate_ashtakavarga
+import numpy as np
+
+from backend.app.astrology.ashtakavarga import (
+    BAV_MASKS,
+    BAV_PLANETS,
+    batch_ashtakavarga,
+    calculate_ashtakavarga,
+    calculate_full_ashtakavarga,
+    ekadhipatya_shodhana,
+    trikona_shodhana,
+)
 
 
 def test_example_chart_one():
@@ -35,3 +45,65 @@ def test_example_chart_two():
     expected_totals = {1: 4, 2: 2, 3: 4, 4: 1, 5: 4, 6: 2, 7: 1, 8: 2, 9: 4, 10: 1, 11: 4, 12: 3}
     assert res["bav"] == expected_bav
     assert res["total_points"] == expected_totals
+
+
+def test_full_ashtakavarga_bindu_totals():
+    planets = [
+        {"name": "Sun", "sign": 1},
+        {"name": "Moon", "sign": 4},
+        {"name": "Mars", "sign": 6},
+        {"name": "Mercury", "sign": 12},
+        {"name": "Jupiter", "sign": 9},
+        {"name": "Venus", "sign": 2},
+        {"name": "Saturn", "sign": 11},
+    ]
+    res = calculate_full_ashtakavarga(planets, ascendant=95.0)
+    totals = {name: sum(points.values()) for name, points in res["bav"].items()}
+    assert totals == {"Sun": 48, "Moon": 49, "Mars": 39, "Mercury": 54,
+                      "Jupiter": 56, "Venus": 52, "Saturn": 39}
+    assert sum(res["total_points"].values()) == 337
+    # Sun's own contribution: bindus in the 1st, 2nd, 4th... from Aries.
+    assert res["bav"]["Sun"][1] >= 1
+    for name, points in res["sodhya"].items():
+        assert all(0 <= points[s] <= res["bav"][name][s] for s in range(1, 13))
+
+
+def test_full_ashtakavarga_matches_contributor_loop():
+    rng = np.random.default_rng(7)
+    signs = rng.integers(0, 12, (50, 8))
+    result = batch_ashtakavarga(signs)
+    for chart, bav in zip(signs, result["bav"]):
+        expected = np.zeros((7, 12), dtype=int)
+        for p, name in enumerate(BAV_PLANETS):
+            for c, mask in enumerate(BAV_MASKS[name]):
+                for house in range(1, 13):
+                    if mask & (1 << (house - 1)):
+                        expected[p, (chart[c] + house - 1) % 12] += 1
+        np.testing.assert_array_equal(bav, expected)
+    np.testing.assert_array_equal(result["sav"], result["bav"].sum(axis=1))
+
+
+def test_trikona_shodhana():
+    bav = np.array([[3, 0, 2, 2, 5, 1, 2, 2, 4, 1, 2, 2]])
+    np.testing.assert_array_equal(
+        trikona_shodhana(bav), [[0, 0, 0, 0, 2, 1, 0, 0, 1, 1, 0, 0]]
+    )
+
+
+def test_ekadhipatya_shodhana_rules():
+    # Signs 0/7 (Mars): both empty and unequal -> both take the smaller.
+    # Signs 1/6 (Venus): 1 occupied with more bindus -> 6 drops to zero.
+    # Signs 2/5 (Mercury): 2 occupied with fewer bindus -> 5 reduced to it.
+    # Signs 8/11 (Jupiter): both occupied -> unchanged.
+    # Signs 9/10 (Saturn): one is zero -> unchanged.
+    bav = np.array([4, 5, 1, 0, 0, 3, 2, 2, 3, 0, 4, 2])
+    occupied = np.zeros(12, dtype=bool)
+    occupied[[1, 2, 8, 11]] = True
+    np.testing.assert_array_equal(
+        ekadhipatya_shodhana(bav, occupied), [2, 5, 1, 0, 0, 1, 0, 2, 3, 0, 4, 2]
+    )
+
+
+def test_full_ashtakavarga_tolerates_missing_planets():
+    res = calculate_full_ashtakavarga([{"name": "Sun", "longitude": 15.0}], ascendant=None)
+    assert sum(res["bav"]["Sun"].values()) == 8
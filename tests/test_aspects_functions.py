@@ -1,4 +1,10 @@
-from backend.app.astrology.aspects import calculate_vedic_aspects, calculate_sign_aspects
+from backend.app.astrology.aspects import (
+    build_aspect_matrix,
+    calculate_sign_aspects,
+    calculate_vedic_aspects,
+    drishti_virupas,
+)
+from backend.app.astrology.house_analysis import analyze_houses
 
 
 def test_calculate_vedic_aspects_simple():
@@ -28,3 +34,45 @@ def test_calculate_sign_aspects_simple():
     assert set(res[1]) == {5, 8, 11}
     assert set(res[2]) == {4, 7, 10}
     assert set(res[3]) == {6, 9, 12}
+
+
+def test_drishti_virupas():
+    assert drishti_virupas(180) == 60
+    assert drishti_virupas(20) == 0
+    assert drishti_virupas(90) == 45
+    assert drishti_virupas(90, "Mars") == 60
+    assert drishti_virupas(240, "Jupiter") == 60
+    assert drishti_virupas(75, "Saturn") == 60
+
+
+def test_aspect_matrix_house_and_degree_modes():
+    planets = [
+        {"name": "Mars", "sign": 1, "longitude": 10.0},
+        {"name": "Jupiter", "sign": 4, "longitude": 100.0},
+        {"name": "Saturn", "sign": 7, "longitude": 190.0},
+    ]
+    houses = {"houses": {1: ["Mars"], 4: ["Jupiter"], 7: ["Saturn"]}}
+    matrix = build_aspect_matrix(planets, houses)
+    assert matrix.to_house.shape == (3, 12)
+    assert matrix.to_house[0].nonzero()[0].tolist() == [3, 6, 7]
+    assert matrix.to_planet[0].tolist() == [0, 45, 60]   # Mars: 4th and 7th
+    assert matrix.to_planet[2].tolist() == [60, 60, 0]   # Saturn: 7th and 10th
+    assert matrix.aspects("Jupiter", "Saturn") is False
+
+    degrees = build_aspect_matrix(planets, houses, virupa=True)
+    assert degrees.to_planet[0].tolist() == [0, 60, 60]
+    assert degrees.to_planet[1, 2] == 45   # 90 degrees, ordinary drishti
+    assert degrees.submatrix(["Saturn", "Sun"]).tolist() == [[0, 0], [0, 0]]
+
+
+def test_vedic_aspects_from_analyze_houses():
+    binfo = {"jd_ut": 0, "latitude": 0, "longitude": 0, "cusps": [i * 30.0 for i in range(12)]}
+    planets = [
+        {"name": "Jupiter", "longitude": 15.0, "sign": 1},
+        {"name": "Rahu", "longitude": 45.0, "sign": 2},
+    ]
+    houses = analyze_houses(binfo, planets)
+    res = calculate_vedic_aspects(planets, houses)
+    mapping = {r["planet"]: sorted(a["house"] for a in r["aspects_to"]) for r in res}
+    assert mapping == {"Jupiter": [5, 7, 9], "Rahu": [6, 8, 10]}
+    assert houses["aspects"]["planet_aspects"] == mapping
@@ -1,6 +1,7 @@
 from datetime import date, time
 import fakeredis
 from backend.app.services import astro
+from backend.app.astrology.divisional_charts import DivisionalCharts
 
 
 def test_profile_cache(monkeypatch):
@@ -16,14 +17,14 @@ def test_profile_cache(monkeypatch):
     monkeypatch.setattr(astro, "get_nakshatra", lambda *a, **k: {})
     monkeypatch.setattr(astro, "analyze_houses", lambda *a, **k: {})
     monkeypatch.setattr(astro, "calculate_core_elements", lambda *a, **k: {})
-    monkeypatch.setattr(astro, "calculate_divisional_charts", lambda *a, **k: {})
+    monkeypatch.setattr(astro, "calculate_divisional_charts", lambda *a, **k: DivisionalCharts([]))
     monkeypatch.setattr(astro, "get_vargottama_planets", lambda *a, **k: {})
     monkeypatch.setattr(astro, "calculate_vedic_aspects", lambda *a, **k: {})
     monkeypatch.setattr(astro, "calculate_sign_aspects", lambda *a, **k: {})
     monkeypatch.setattr(astro, "calculate_all_yogas", lambda *a, **k: {})
     monkeypatch.setattr(astro, "calculate_shadbala", lambda *a, **k: {})
     monkeypatch.setattr(astro, "calculate_bhava_bala", lambda *a, **k: {})
-    monkeypatch.setattr(astro, "calculate_ashtakavarga", lambda *a, **k: {})
+    monkeypatch.setattr(astro, "calculate_full_ashtakavarga", lambda *a, **k: {})
     monkeypatch.setattr(astro, "full_analysis", lambda *a, **k: {})
 
     astro.CONFIG["cache_enabled"] = "true"
@@ -36,3 +37,37 @@ def test_profile_cache(monkeypatch):
     assert calls["geo"] == 1
     astro.compute_vedic_profile(req)
     assert calls["geo"] == 1
+
+
+def test_coordinates_skip_geocoding(monkeypatch):
+    def fail_geo(loc):
+        raise AssertionError("geocoder must not be called")
+
+    captured = {}
+
+    def fake_birth_info(**kwargs):
+        captured.update(kwargs)
+        raise ValueError("stop here")
+
+    monkeypatch.setattr(astro, "geocode_location", fail_geo)
+    monkeypatch.setattr(astro, "timezone_at", lambda lat, lon: "Asia/Kolkata")
+    monkeypatch.setattr(astro, "get_birth_info", fake_birth_info)
+    monkeypatch.setattr(astro, "_CACHE", fakeredis.FakeRedis())
+
+    req = astro.ProfileRequest(date=date(2020, 1, 1), time=time(12, 0), latitude=28.6, longitude=77.2)
+    try:
+        astro.compute_vedic_profile(req)
+    except Exception:
+        pass
+    assert captured["latitude"] == 28.6
+    assert captured["timezone"] == "Asia/Kolkata"
+
+    captured.clear()
+    req = astro.ProfileRequest(
+        date=date(2020, 1, 1), time=time(12, 0), latitude=28.6, longitude=77.2, timezone="UTC"
+    )
+    try:
+        astro.compute_panchanga(req)
+    except Exception:
+        pass
+    assert captured["timezone"] == "UTC"
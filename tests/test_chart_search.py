@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology import chart_search
+from backend.app.astrology.chart_search import ChartCondition, nakshatra_number, search_chart, sign_number
+from backend.app.astrology.dasha import datetime_to_jd
+from backend.app.astrology.events import ephemeris, set_ayanamsa
+from backend.app.astrology.lagna import ascendant
+
+client = TestClient(main.app)
+
+DELHI = (28.61, 77.21)
+
+
+def test_names_and_numbers():
+    assert sign_number("leo") == sign_number(5) == 5
+    assert nakshatra_number("Rohini") == 4
+    with pytest.raises(ValueError):
+        sign_number(13)
+    with pytest.raises(ValueError):
+        ChartCondition("Lagna", sign=5, retrograde=True)
+    with pytest.raises(ValueError):
+        ChartCondition("Moon")
+
+
+def test_matches_hold_at_their_edges():
+    start, end = datetime_to_jd(datetime(2024, 1, 1)), datetime_to_jd(datetime(2024, 7, 1))
+    conditions = [ChartCondition("Moon", nakshatra=4), ChartCondition("Lagna", sign=5)]
+    windows = search_chart(conditions, start, end, *DELHI)
+    # The Moon spends about a day in Rohini each month and Leo rises once a day.
+    assert 6 <= len(windows) <= 14
+    set_ayanamsa("lahiri")
+    moon = ephemeris("Moon")
+    for a, b in windows:
+        for t in (a + 1e-5, b - 1e-5):
+            assert int(moon(t)[0] // (360 / 27)) == 3
+            assert int(ascendant(t, *DELHI) // 30) == 4
+
+
+def test_chunks_join_and_limit(monkeypatch):
+    start, end = datetime_to_jd(datetime(2024, 1, 1)), datetime_to_jd(datetime(2024, 1, 11))
+    conditions = [ChartCondition("Lagna", sign=5)]
+    whole = search_chart(conditions, start, end, *DELHI)
+    monkeypatch.setattr(chart_search, "CHUNK_DAYS", 0.1)
+    chunked = search_chart(conditions, start, end, *DELHI)
+    assert np.allclose(chunked, whole)
+    assert np.array_equal(search_chart(conditions, start, end, *DELHI, limit=3), chunked[:3])
+
+
+def test_retrograde_condition():
+    start, end = datetime_to_jd(datetime(2024, 1, 1)), datetime_to_jd(datetime(2026, 1, 1))
+    windows = search_chart([ChartCondition("Mars", retrograde=True),
+                            ChartCondition("Saturn", sign=11)], start, end, *DELHI)
+    # Mars retrograde, December 2024 - February 2025.
+    assert len(windows) == 1
+    assert 70 < windows[0][1] - windows[0][0] < 90
+
+
+def test_chart_search_route():
+    body = {"start": "2024-01-01", "end": "2024-03-31", "latitude": 28.61, "longitude": 77.21,
+            "timezone": "Asia/Kolkata",
+            "conditions": [{"body": "Moon", "nakshatra": "Rohini"}, {"body": "Lagna", "sign": "Leo"}]}
+    resp = client.post("/api/chart/search", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["count"] == len(data["intervals"]) >= 2
+    assert all(0 < item["minutes"] < 160 for item in data["intervals"])
+
+    limited = client.post("/api/chart/search", json={**body, "limit": 1}).json()
+    assert limited["count"] == 1 and limited["truncated"]
+    assert not data["truncated"]
+
+    # Lagna-only searches solve the ascendant daily, so their range is shorter.
+    lagna_only = {**body, "end": "2025-06-01", "conditions": [{"body": "Lagna", "sign": "Leo"}]}
+    assert client.post("/api/chart/search", json=lagna_only).status_code == 422
+    bad = {**body, "conditions": [{"body": "Pluto", "sign": 1}]}
+    assert client.post("/api/chart/search", json=bad).status_code == 422
+    bad = {**body, "conditions": [{"body": "Moon", "nakshatra": "Vega"}]}
+    assert client.post("/api/chart/search", json=bad).status_code == 422
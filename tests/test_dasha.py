@@ -0,0 +1,167 @@
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology.dasha import (
+    MAX_DEPTH,
+    AshtottariDasha,
+    CharaDasha,
+    VimshottariDasha,
+    YoginiDasha,
+    build_dasha,
+    chara_dasha_years,
+    format_cursor,
+    parse_cursor,
+)
+
+client = TestClient(main.app)
+
+BIRTH_JD = 2440587.5
+
+
+def test_active_at_matches_tree_walk():
+    engine = VimshottariDasha(10.0, BIRTH_JD)
+    for jd in (BIRTH_JD, BIRTH_JD + 1234.56, BIRTH_JD + 20000.1, engine.end_jd - 0.001):
+        chain = engine.active_at(jd)
+        assert len(chain) == MAX_DEPTH
+        periods = engine.mahadashas()
+        for expected in chain:
+            found = next(p for p in periods if p.contains(jd))
+            assert found == expected
+            periods = engine.children(found)
+
+
+def test_active_at_outside_cycle():
+    engine = VimshottariDasha(10.0, BIRTH_JD)
+    assert engine.active_at(BIRTH_JD - 1) == []
+    assert engine.active_at(engine.end_jd) == []
+
+
+def test_children_tile_parent():
+    engine = VimshottariDasha(123.4, BIRTH_JD)
+    maha = engine.mahadashas()[2]
+    kids = engine.children(maha)
+    assert kids[0].lord == maha.lord
+    assert kids[0].start_jd == maha.start_jd
+    assert kids[-1].end_jd == pytest.approx(maha.end_jd)
+    for a, b in zip(kids, kids[1:]):
+        assert a.end_jd == b.start_jd
+
+
+def test_iter_periods_resumes_after_cursor():
+    engine = VimshottariDasha(10.0, BIRTH_JD)
+    full = list(itertools.islice(engine.iter_periods(depth=3), 500))
+    assert [p.level for p in full[:4]] == [1, 2, 3, 3]
+    for i in (0, 8, 9, 90, 91, 450):
+        after = parse_cursor(format_cursor(full[i].path))
+        resumed = list(itertools.islice(engine.iter_periods(depth=3, after=after), 40))
+        assert resumed == full[i + 1:i + 41]
+
+
+def test_iter_periods_counts():
+    engine = VimshottariDasha(10.0, BIRTH_JD)
+    assert sum(1 for _ in engine.iter_periods(depth=2)) == 9 + 81
+
+
+@pytest.mark.parametrize("cursor", ["x", "-1", "1.2.3.4.5.6"])
+def test_parse_cursor_rejects_bad_values(cursor):
+    with pytest.raises(ValueError):
+        parse_cursor(cursor)
+
+
+def test_iter_periods_rejects_out_of_range_cursor():
+    engine = VimshottariDasha(10.0, BIRTH_JD)
+    with pytest.raises(ValueError):
+        engine.iter_periods(depth=2, after=(0, 9))
+    with pytest.raises(ValueError):
+        engine.iter_periods(depth=2, after=(9,))
+
+
+def test_yogini_starts_with_balance():
+    # Ashwini (nakshatra 1) starts Bhramari; half of it has elapsed at 6°40',
+    # so, as in Vimshottari, its remaining two years start at birth.
+    engine = YoginiDasha(360 / 54, BIRTH_JD)
+    first = engine.mahadashas()[0]
+    assert first.lord == "Bhramari"
+    assert first.start_jd == BIRTH_JD
+    assert first.end_jd == pytest.approx(BIRTH_JD + 2 * 365.25)
+    assert engine.end_jd - BIRTH_JD >= 120 * 365.25
+    assert engine.active_at(BIRTH_JD, depth=1) == [first]
+    periods = list(engine.iter_periods(depth=2))
+    assert all(p.end_jd > BIRTH_JD for p in periods)
+
+
+def test_ashtottari_nakshatra_groups():
+    span = 360 / 27
+    assert AshtottariDasha(5.5 * span, BIRTH_JD).mahadashas()[0].lord == "Sun"
+    assert AshtottariDasha(9.5 * span, BIRTH_JD).mahadashas()[0].lord == "Moon"
+    assert AshtottariDasha(0.0, BIRTH_JD).mahadashas()[0].lord == "Rahu"
+    engine = AshtottariDasha(0.0, BIRTH_JD)
+    assert engine.children(engine.mahadashas()[1])[0].lord == "Venus"
+    # Ashwini is the third of Rahu's four nakshatras: half of its 12 years remain.
+    first = engine.mahadashas()[0]
+    assert first.start_jd == BIRTH_JD
+    assert first.end_jd == pytest.approx(BIRTH_JD + 6 * 365.25)
+
+
+
+def test_chara_dasha_years_and_order():
+    planets = [
+        {"name": "Mars", "longitude": 95.0},      # Cancer
+        {"name": "Venus", "longitude": 40.0},     # Taurus, own sign
+        {"name": "Jupiter", "longitude": 100.0},  # Cancer, exalted
+    ]
+    assert chara_dasha_years(1, planets) == 2    # Aries forward to Cancer, -1 debilitated
+    assert chara_dasha_years(2, planets) == 12   # lord in own sign
+    assert chara_dasha_years(9, planets) == 8    # Sagittarius forward, +1 exalted
+    assert chara_dasha_years(12, planets) == 9   # Pisces backward, +1 exalted
+
+    # Aries lagna: ninth is Sagittarius (savya), so the sequence runs forward.
+    engine = CharaDasha(1, planets, BIRTH_JD)
+    mahas = engine.mahadashas()
+    assert [p.lord for p in mahas[:3]] == ["Aries", "Taurus", "Gemini"]
+    antars = engine.children(mahas[0])
+    assert antars[0].lord == "Taurus" and antars[-1].lord == "Aries"
+    assert antars[0].end_jd - antars[0].start_jd == pytest.approx(2 * 365.25 / 12)
+
+    # Taurus lagna: ninth is Capricorn, so the sequence runs backward.
+    mahas = CharaDasha(2, planets, BIRTH_JD).mahadashas()
+    assert [p.lord for p in mahas[:3]] == ["Taurus", "Aries", "Pisces"]
+
+
+def test_build_dasha_unknown_system():
+    with pytest.raises(ValueError):
+        build_dasha("kalachakra", {"jd_ut": BIRTH_JD}, [])
+
+
+def test_dasha_route_paginates():
+    body = {"date": "1990-05-17", "time": "06:30", "latitude": 28.61, "longitude": 77.21, "timezone": "Asia/Kolkata"}
+    resp = client.post("/api/dasha", params={"depth": 5, "limit": 50, "at": "2024-01-01T00:00:00"}, json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["periods"]) == 50
+    assert [p["level"] for p in data["current_period"]] == ["maha", "antar", "pratyantar", "sookshma", "prana"]
+    assert data["metadata"]["total_periods"] == sum(9 ** i for i in range(1, 6))
+
+    resp = client.post("/api/dasha", params={"depth": 5, "limit": 50, "cursor": data["next_cursor"]}, json=body)
+    assert resp.status_code == 200
+    assert resp.json()["periods"][0]["start"] == data["periods"][-1]["end"]
+
+    resp = client.post("/api/dasha", params={"cursor": "bogus"}, json=body)
+    assert resp.status_code == 400
+
+
+@pytest.mark.parametrize("system", ["yogini", "ashtottari", "chara"])
+def test_dasha_route_other_systems(system):
+    body = {"date": "1990-05-17", "time": "06:30", "latitude": 28.61, "longitude": 77.21, "timezone": "Asia/Kolkata"}
+    resp = client.post("/api/dasha", params={"system": system, "depth": 2, "at": "2024-01-01T00:00:00"}, json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["system"] == system
+    assert data["convention"].startswith("The first mahadasha starts at birth")
+    assert data["mahadashas"][0]["start"] == data["periods"][0]["start"]
+    assert data["mahadashas"][0]["start"].startswith("1990-05-17T00:59")
+    assert len(data["current_period"]) == 2
+    assert "vimshottari_dasha" not in data
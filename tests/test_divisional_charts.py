@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology.d_charts_interpretations import augment_divisional_charts
+from backend.app.astrology.divisional_charts import (
+    VARGA_FUNCTIONS,
+    calculate_all_vargas,
+    calculate_divisional_charts,
+    parse_chart_keys,
+    varga_signs,
+)
+
+client = TestClient(main.app)
+
+
+def _reference(lon):
+    return [VARGA_FUNCTIONS[d](lon) for d in range(1, 61)]
+
+
+def test_table_matches_reference_on_arc_minute_grid():
+    lons = np.arange(21600) / 60.0 + 1 / 120.0
+    table = varga_signs(lons)
+    for d, func in VARGA_FUNCTIONS.items():
+        expected = [func(lon) for lon in lons.tolist()]
+        assert table[d - 1].tolist() == expected, f"D{d} differs"
+
+
+def test_table_matches_reference_at_part_boundaries():
+    for d, func in VARGA_FUNCTIONS.items():
+        edges = [s * 30 + k * 30 / d for s in range(12) for k in range(d)]
+        lons = [max(0.0, e + eps) for e in edges for eps in (-1e-9, 0.0, 1e-9)]
+        lons = [lon % 360 for lon in lons]
+        got = varga_signs(lons, [d])[0].tolist()
+        assert got == [func(lon) for lon in lons], f"D{d} differs at boundaries"
+
+
+def test_random_longitudes_match_reference():
+    rng = np.random.default_rng(7)
+    lons = rng.uniform(0, 360, 500)
+    table = varga_signs(lons)
+    for i, lon in enumerate(lons.tolist()):
+        assert table[:, i].tolist() == _reference(lon)
+
+
+def test_charts_for_many_planets_are_plain_ints():
+    planets = [{"name": "Sun", "longitude": 15.0}, {"name": "Moon", "longitude": 200.5}]
+    charts = calculate_divisional_charts(planets)
+    assert charts["D9"] == {"Sun": 5, "Moon": calculate_all_vargas(200.5)["D9"]}
+    assert all(type(v) is int for chart in charts.values() for v in chart.values())
+    assert calculate_divisional_charts([]) == {f"D{i}": {} for i in range(1, 61)}
+
+
+def test_parse_chart_keys():
+    assert parse_chart_keys("d9, D1,9,D60") == ("D1", "D9", "D60")
+    assert parse_chart_keys([10, "D2"]) == ("D2", "D10")
+    assert len(parse_chart_keys(None)) == 60
+    with pytest.raises(ValueError):
+        parse_chart_keys("D61")
+    with pytest.raises(ValueError):
+        parse_chart_keys("navamsa")
+
+
+def test_subset_is_computed_lazily():
+    planets = [{"name": "Sun", "longitude": 15.0}]
+    charts = calculate_divisional_charts(planets, charts="D1,D9")
+    assert list(charts) == ["D1", "D9"]
+    assert charts._computed == {}
+    assert charts["D9"] == {"Sun": 5}
+    assert list(charts._computed) == ["D9"]
+    assert "D10" not in charts
+    with pytest.raises(KeyError):
+        charts["D10"]
+    assert charts.to_dict() == {"D1": {"Sun": 1}, "D9": {"Sun": 5}}
+
+
+def test_augment_subset():
+    charts = calculate_divisional_charts([{"name": "Sun", "longitude": 15.0}]).to_dict()
+    rich = augment_divisional_charts(charts, charts=["D9", "D10"])
+    assert set(rich) == {"D9", "D10"}
+
+
+def test_divisional_charts_route_subset():
+    body = {"date": "1990-05-17", "time": "06:30", "latitude": 28.61, "longitude": 77.21, "timezone": "Asia/Kolkata"}
+    resp = client.post("/api/divisional-charts", params={"charts": "D1,D9,D60"}, json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert list(data["charts"]) == ["D1", "D9", "D60"]
+    assert set(data["interpretations"]) <= {"D1", "D9", "D60"}
+    assert data["summary"]["total_charts"] == 3
+    assert list(data["yogas"]) == ["D1", "D9", "D60"]
+    assert set(data["summary"]["strong_planets"]) <= set(data["summary"]["yoga_planets"])
+    assert set(data["summary"]["vimshopaka"]) == {"shadvarga", "saptavarga", "dashavarga", "shodashavarga"}
+
+    resp = client.post("/api/divisional-charts", params={"charts": "D99"}, json=body)
+    assert resp.status_code == 400
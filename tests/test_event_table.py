@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from backend.app.astrology import event_table
+from backend.app.astrology.dasha import datetime_to_jd, jd_to_datetime
+from backend.app.astrology.event_table import EventTable, build_event_table, event_table_for
+from backend.app.astrology.events import iter_events
+
+START = datetime_to_jd(datetime(2020, 1, 1))
+END = datetime_to_jd(datetime(2021, 1, 1))
+
+
+@pytest.fixture(scope="module")
+def table():
+    return build_event_table(START, END)
+
+
+def test_events_match_solver(table):
+    ref = list(iter_events(START, END))
+    got = table.events(START, END)
+    assert [(e.planet, e.type, e.index) for e in got] == [(e.planet, e.type, e.index) for e in ref]
+    assert max(abs(a.jd_ut - b.jd_ut) for a, b in zip(got, ref)) < 1e-5
+
+
+def test_save_and_load_roundtrip(table, tmp_path):
+    path = tmp_path / "events.npz"
+    table.save(path)
+    loaded = EventTable.load(path)
+    assert len(loaded) == len(table)
+    assert loaded.covers(START, END)
+    assert not loaded.covers(START, END, ayanamsa="raman")
+    np.testing.assert_array_equal(loaded.jd, table.jd)
+
+
+def test_intervals_tile_window(table):
+    lo, hi = START + 10.3, START + 200.7
+    starts, ends, signs = table.intervals("Sun", lo, hi)
+    assert starts[0] == lo and ends[-1] == hi
+    np.testing.assert_array_equal(starts[1:], ends[:-1])
+    assert list(signs) == [9, 10, 11, 12, 1, 2, 3, 4]
+    assert table.value_at("Saturn", START + 100) == 10
+
+
+def test_retrograde_and_sade_sati(table):
+    starts, ends = table.retrograde_intervals("Saturn", START, END)
+    assert len(starts) == 1
+    assert datetime(2020, 5, 11) <= jd_to_datetime(starts[0]) <= datetime(2020, 5, 12)
+
+    periods = table.sade_sati(10, START, END)
+    assert len(periods) == 1
+    assert [p["phase"] for p in periods[0]["phases"]] == ["rising", "peak"]
+
+
+def test_fallback_computes_window(monkeypatch, tmp_path):
+    monkeypatch.setenv("EVENT_TABLE_FILE", str(tmp_path / "missing.npz"))
+    event_table.get_event_table.cache_clear()
+    try:
+        table = event_table_for(START + 5, START + 20)
+        assert table.covers(START + 5, START + 20)
+        assert table.events(START + 5, START + 20, ["Sun"], ["sign_ingress"])[0].index == 10
+    finally:
+        event_table.get_event_table.cache_clear()
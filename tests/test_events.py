@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology.events import ephemeris, iter_events, set_ayanamsa
+
+client = TestClient(main.app)
+
+
+def test_mercury_stations_2020():
+    events = list(iter_events(datetime(2020, 1, 1), datetime(2021, 1, 1), ["Mercury"],
+                              ["station_retrograde", "station_direct"]))
+    days = [(e.type, e.time.date().isoformat()) for e in events]
+    assert days == [
+        ("station_retrograde", "2020-02-17"),
+        ("station_direct", "2020-03-10"),
+        ("station_retrograde", "2020-06-18"),
+        ("station_direct", "2020-07-12"),
+        ("station_retrograde", "2020-10-14"),
+        ("station_direct", "2020-11-03"),
+    ]
+    set_ayanamsa("lahiri")
+    position = ephemeris("Mercury")
+    for e in events:
+        assert abs(position(e.jd_ut)[1]) < 1e-4
+
+
+def test_makara_sankranti_and_precision():
+    events = list(iter_events(datetime(2020, 1, 1), datetime(2020, 2, 1), ["Sun", "Moon"], ["sign_ingress"]))
+    sun = [e for e in events if e.planet == "Sun"]
+    assert len(sun) == 1
+    assert sun[0].index == 10 and sun[0].previous == 9
+    assert sun[0].time.date().isoformat() == "2020-01-14"
+
+    set_ayanamsa("lahiri")
+    moon = ephemeris("Moon")
+    for e in events:
+        if e.planet == "Moon":
+            lon, _ = moon(e.jd_ut)
+            # 1e-4 degrees of lunar motion is well under a second.
+            assert abs((lon - e.longitude + 180) % 360 - 180) < 1e-4
+            assert e.index == e.previous % 12 + 1
+
+
+def test_events_are_chronological_and_cover_nodes():
+    events = list(iter_events(datetime(2020, 1, 1), datetime(2021, 1, 1)))
+    times = [e.jd_ut for e in events]
+    assert times == sorted(times)
+    rahu = [e for e in events if e.planet == "Rahu" and e.type == "sign_ingress"]
+    ketu = [e for e in events if e.planet == "Ketu" and e.type == "sign_ingress"]
+    assert len(rahu) == len(ketu) == 1
+    assert rahu[0].index == 2  # Rahu entered Taurus in September 2020
+    assert ketu[0].index == 8
+
+
+def test_unknown_planet_rejected():
+    with pytest.raises(ValueError):
+        list(iter_events(datetime(2020, 1, 1), datetime(2020, 2, 1), ["Pluto"]))
+
+
+def test_events_route():
+    resp = client.get("/api/events", params={"start": "2020-01-01", "end": "2020-03-01", "planets": "Sun", "types": "sign_ingress"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["count"] == 2
+    assert [e["index"] for e in data["events"]] == [10, 11]
+
+    resp = client.get("/api/events", params={"start": "2020-01-01", "end": "2020-03-01", "planets": "Pluto"})
+    assert resp.status_code == 400
+
+
+def test_true_node_stations():
+    start, end = datetime(2020, 1, 1), datetime(2020, 3, 1)
+    kinds = ["station_retrograde", "station_direct"]
+    assert list(iter_events(start, end, ["Rahu"], kinds)) == []
+    events = list(iter_events(start, end, ["Rahu", "Ketu"], kinds, node_type="true"))
+    rahu = [e for e in events if e.planet == "Rahu"]
+    assert [(e.type, e.time.date().isoformat()) for e in rahu][:3] == [
+        ("station_direct", "2020-01-02"),
+        ("station_retrograde", "2020-01-09"),
+        ("station_direct", "2020-01-17"),
+    ]
+    assert [e.type for e in events if e.planet == "Ketu"] == [e.type for e in rahu]
+    set_ayanamsa("lahiri")
+    position = ephemeris("Rahu", "true")
+    for e in rahu:
+        assert abs(position(e.jd_ut)[1]) < 1e-4
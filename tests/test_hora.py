@@ -0,0 +1,52 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology.hora import divide_day, hora_timetable
+
+client = TestClient(main.app)
+
+
+def test_divide_day_sequences():
+    # Sunday with 12-hour day and night.
+    res = divide_day(0.25, 0.75, 1.25, 0)
+    horas = res["horas"]
+    assert [h["lord"] for h in horas[:8]] == [
+        "Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter", "Mars", "Sun"
+    ]
+    assert horas[12]["period"] == "night" and horas[12]["start"] == 0.75
+    assert all(a["end"] == b["start"] for a, b in zip(horas, horas[1:]))
+    names = [c["name"] for c in res["choghadiya"]]
+    assert names[:8] == ["Udveg", "Char", "Labh", "Amrit", "Kaal", "Shubh", "Rog", "Udveg"]
+    assert names[8:] == ["Shubh", "Amrit", "Char", "Rog", "Kaal", "Labh", "Udveg", "Shubh"]
+    # Sunday Rahu Kalam is the last eighth of daytime.
+    assert res["rahu_kalam"] == {"start": 0.6875, "end": 0.75}
+
+
+def test_hora_timetable_delhi():
+    days = hora_timetable(date(2024, 1, 1), date(2024, 1, 31), 28.61, 77.21, "Asia/Kolkata")
+    assert len(days) == 31
+    monday = days[0]
+    assert monday["vaara"] == "Monday"
+    assert monday["horas"][0]["lord"] == "Moon"
+    assert monday["rahu_kalam"]["start"].startswith("2024-01-01T08:3")
+    assert monday["choghadiya"][0]["name"] == "Amrit"
+    for today, tomorrow in zip(days, days[1:]):
+        assert today["next_sunrise"] == tomorrow["sunrise"]
+        assert today["horas"][-1]["end"] == tomorrow["horas"][0]["start"]
+
+
+def test_hora_route():
+    body = {"start": "2024-01-01", "end": "2024-01-03", "latitude": 28.61, "longitude": 77.21,
+            "timezone": "Asia/Kolkata"}
+    resp = client.post("/api/hora", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [d["date"] for d in data["days"]] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert len(data["days"][0]["horas"]) == 24 and len(data["days"][0]["choghadiya"]) == 16
+
+    resp = client.post("/api/hora", json={**body, "end": "2024-06-01"})
+    assert resp.status_code == 422
+    resp = client.post("/api/hora", json={**body, "latitude": 80.0, "end": "2024-01-01"})
+    assert resp.status_code == 400
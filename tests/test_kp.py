@@ -0,0 +1,97 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology.dasha import ORDER
+from backend.app.astrology.kp import KP_SUB_SUBS, KP_SUBS, calculate_kp, kp_lords
+
+client = TestClient(main.app)
+
+
+def test_sub_table_has_249_contiguous_rows():
+    rows = KP_SUBS.rows()
+    assert len(rows) == 249
+    assert rows[0]["start"] == 0 and rows[-1]["end"] == 360
+    assert all(a["end"] == b["start"] for a, b in zip(rows, rows[1:]))
+    # Ashwini: Ketu star, first sub Ketu (0°00'-0°46'40"), then Venus.
+    assert rows[0]["star"] == rows[0]["sub"] == "Ketu"
+    assert abs(rows[0]["end"] - (46 + 40 / 60) / 60) < 1e-12
+    assert rows[1]["sub"] == "Venus"
+    # A sub straddling 30° is split so no row spans two signs.
+    assert all(int(r["start"] // 30) + 1 == r["sign"] for r in rows)
+
+
+def test_lookup_matches_direct_subdivision():
+    rng = np.random.default_rng(7)
+    lons = rng.uniform(0, 360, 500)
+    lords = kp_lords(lons)
+    span = 360 / 27
+    years = {"Ketu": 7, "Venus": 20, "Sun": 6, "Moon": 10, "Mars": 7,
+             "Rahu": 18, "Jupiter": 16, "Saturn": 19, "Mercury": 17}
+    for i, lon in enumerate(lons):
+        star = int(lon // span) % 9
+        assert lords["star"][i] == star
+        offset, width, lord = lon % span, span, star
+        for level in ("sub", "sub_sub"):
+            for k in range(9):
+                child = (lord + k) % 9
+                part = width * years[ORDER[child]] / 120
+                if offset < part:
+                    break
+                offset -= part
+            assert ORDER[lords[level][i]] == ORDER[child], (lon, level)
+            width, lord = part, child
+
+
+def test_sub_numbers_follow_sub_sub_rows():
+    assert len(KP_SUB_SUBS) > 27 * 81
+    ends = np.append(KP_SUB_SUBS.starts[1:], 360 * 10800)
+    subs = kp_lords((KP_SUB_SUBS.starts + ends) / 2 / 10800.0)
+    assert np.array_equal(subs["sub_number"], KP_SUB_SUBS.sub_number)
+    assert np.array_equal(KP_SUBS.lords[KP_SUB_SUBS.sub_number - 1], KP_SUB_SUBS.lords[:, :2])
+
+
+def test_calculate_kp_planets_and_cusps():
+    binfo = {"jd_ut": 2451545.0, "latitude": 28.61, "longitude": 77.21, "sidereal_offset": 23.85}
+    res = calculate_kp([{"name": "Sun", "longitude": 256.5}], binfo)
+    assert res["planets"]["Sun"]["sign"] == 9
+    assert res["planets"]["Sun"]["star"] == "Venus"     # Purva Ashadha
+    assert sorted(res["cusps"]) == list(range(1, 13))
+    assert res["house_system"] == "placidus"
+    assert all(set(c) >= {"star", "sub", "sub_sub", "sign_lord"} for c in res["cusps"].values())
+
+
+def test_kp_cusps_route_batch():
+    body = {
+        "times": ["2024-01-01T06:00:00", "2024-01-01T07:00:00"],
+        "latitude": 28.61, "longitude": 77.21, "timezone": "Asia/Kolkata",
+        "include_table": True,
+    }
+    resp = client.post("/api/kp/cusps", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["instants"]) == 2
+    assert len(data["subs"]) == 249
+    first, second = (item["cusps"]["1"]["longitude"] for item in data["instants"])
+    assert first != second
+
+    resp = client.post("/api/kp/cusps", json={**body, "timezone": "Mars/Olympus"})
+    assert resp.status_code == 400
+
+
+def test_kp_cusps_fall_back_to_porphyry_above_polar_circle():
+    # Placidus is undefined at Tromsø for these instants.
+    body = {"times": ["1990-06-15T06:00:00", "1990-06-15T12:00:00"],
+            "latitude": 69.65, "longitude": 18.96, "timezone": "Europe/Oslo"}
+    resp = client.post("/api/kp/cusps", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["house_system"] == "porphyry"
+    assert [item["house_system"] for item in data["instants"]] == ["porphyry", "porphyry"]
+
+    resp = client.post("/api/profile", json={"date": "1990-06-15", "time": "06:00:00",
+                                             "latitude": 69.65, "longitude": 18.96,
+                                             "timezone": "Europe/Oslo"})
+    assert resp.status_code == 200
+    assert resp.json()["kp"]["house_system"] == "porphyry"
+    assert len(resp.json()["kp"]["cusps"]) == 12
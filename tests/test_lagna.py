@@ -0,0 +1,53 @@
+from datetime import date
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology.events import set_ayanamsa
+from backend.app.astrology.lagna import _day_boundaries, ascendant, lagna_boundaries, lagna_table
+from backend.app.astrology.sun_data import day_number
+
+client = TestClient(main.app)
+
+DELHI = (28.61, 77.21)
+
+
+def test_sign_boundaries_are_ascendant_crossings():
+    table = lagna_table(day_number(date(2024, 1, 1)), *DELHI, divisions=("sign", "navamsa"))
+    signs = table["sign"]
+    assert 12 <= len(signs) <= 14
+    assert all(a["end"] == b["start"] for a, b in zip(signs, signs[1:]))
+    assert all(b["index"] == a["index"] % 12 + 1 for a, b in zip(signs, signs[1:]))
+    set_ayanamsa("lahiri")
+    for row in signs:
+        assert abs(((ascendant(row["end"], *DELHI) + 15) % 30) - 15) < 1e-3
+        middle = ascendant((row["start"] + row["end"]) / 2, *DELHI)
+        assert int(middle // 30) + 1 == row["index"]
+    # Nine navamsas rise per sign.
+    assert 108 <= len(table["navamsa"]) <= 112
+
+
+def test_boundaries_cached_per_day():
+    _day_boundaries.cache_clear()
+    jd = 2460310.5
+    lagna_boundaries(jd, jd + 2, *DELHI)
+    misses = _day_boundaries.cache_info().misses
+    ends, indices = lagna_boundaries(jd + 0.3, jd + 1.7, 28.611, 77.209)
+    assert _day_boundaries.cache_info().misses == misses
+    assert np.all(np.diff(ends) > 0)
+    assert np.array_equal((indices[:-1] + 1) % 12, indices[1:])
+
+
+def test_lagna_route():
+    body = {"date": "2024-01-01", "latitude": 28.61, "longitude": 77.21,
+            "timezone": "Asia/Kolkata", "divisions": ["sign", "nakshatra"]}
+    resp = client.post("/api/lagna", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    sagittarius = next(r for r in data["sign"] if r["name"] == "Sagittarius")
+    assert sagittarius["start"].startswith("2024-01-01T06:")
+    assert len(data["nakshatra"]) >= 27
+    assert "navamsa" not in data
+
+    assert client.post("/api/lagna", json={**body, "divisions": ["drekkana"]}).status_code == 422
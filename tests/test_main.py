@@ -2,6 +2,7 @@ from fastapi.testclient import TestClient
 from backend import main
 from backend.app.routes import profile
 from backend.app.services import astro
+from backend.app.astrology.divisional_charts import DivisionalCharts
 import fakeredis
 from backend.app import models
 from backend.app.core import auth
@@ -34,8 +35,8 @@ def test_profile(monkeypatch):
     monkeypatch.setattr(astro, "get_nakshatra", lambda planets: {"nakshatra": "Ashwini", "pada": 1})
     monkeypatch.setattr(astro, "analyze_houses", lambda *a, **k: {1: ["Moon"]})
     monkeypatch.setattr(astro, "calculate_core_elements", lambda *a, **k: {"Fire": 100})
-    monkeypatch.setattr(astro, "calculate_divisional_charts", lambda *a, **k: {})
-    monkeypatch.setattr(astro, "calculate_ashtakavarga", lambda *a, **k: {"bav": {}, "total_points": {}})
+    monkeypatch.setattr(astro, "calculate_divisional_charts", lambda *a, **k: DivisionalCharts([]))
+    monkeypatch.setattr(astro, "calculate_full_ashtakavarga", lambda *a, **k: {"bav": {}, "total_points": {}})
     monkeypatch.setattr(astro, "full_analysis", lambda *a, **k: {})
 
     resp = client.post("/profile", json={"date": "2020-01-01", "time": "12:00:00", "location": "Delhi"})
@@ -56,8 +57,8 @@ def test_divisional_charts(monkeypatch):
     monkeypatch.setattr(astro, "get_nakshatra", lambda planets: {})
     monkeypatch.setattr(astro, "analyze_houses", lambda *a, **k: {})
     monkeypatch.setattr(astro, "calculate_core_elements", lambda *a, **k: {})
-    monkeypatch.setattr(astro, "calculate_divisional_charts", lambda *a, **k: {"D1": {}})
-    monkeypatch.setattr(astro, "calculate_ashtakavarga", lambda *a, **k: {"bav": {}, "total_points": {}})
+    monkeypatch.setattr(astro, "calculate_divisional_charts", lambda *a, **k: DivisionalCharts([], charts=["D1"]))
+    monkeypatch.setattr(astro, "calculate_full_ashtakavarga", lambda *a, **k: {"bav": {}, "total_points": {}})
     monkeypatch.setattr(astro, "full_analysis", lambda *a, **k: {})
 
     resp = client.post("/divisional-charts", json={"date": "2020-01-01", "time": "12:00:00", "location": "Delhi"})
@@ -77,8 +78,8 @@ def test_dasha(monkeypatch):
     monkeypatch.setattr(astro, "get_nakshatra", lambda planets: {})
     monkeypatch.setattr(astro, "analyze_houses", lambda *a, **k: {})
     monkeypatch.setattr(astro, "calculate_core_elements", lambda *a, **k: {})
-    monkeypatch.setattr(astro, "calculate_divisional_charts", lambda *a, **k: {})
-    monkeypatch.setattr(astro, "calculate_ashtakavarga", lambda *a, **k: {"bav": {}, "total_points": {}})
+    monkeypatch.setattr(astro, "calculate_divisional_charts", lambda *a, **k: DivisionalCharts([]))
+    monkeypatch.setattr(astro, "calculate_full_ashtakavarga", lambda *a, **k: {"bav": {}, "total_points": {}})
     monkeypatch.setattr(astro, "full_analysis", lambda *a, **k: {})
 
     resp = client.post("/dasha", json={"date": "2020-01-01", "time": "12:00:00", "location": "Delhi"})
@@ -355,3 +356,17 @@ def test_health_route():
     resp = client.get("/health")
     assert resp.status_code == 200
     assert resp.json()["status"] == "healthy"
+
+
+def test_profile_route_full_chart():
+    # No stubs: the whole pipeline runs, including yogas on the aspect matrix.
+    body = {"date": "1990-06-15", "time": "06:00:00", "latitude": 28.6139,
+            "longitude": 77.209, "timezone": "Asia/Kolkata"}
+    resp = client.post("/api/profile", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert "summary" in data["yogas"]
+    assert len(data["planetaryPositions"]) == 9
+
+    resp = client.post("/api/profile/quick", json=body)
+    assert resp.status_code == 200
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology import masa
+from backend.app.astrology.dasha import datetime_to_jd
+from backend.app.astrology.events import ephemeris, set_ayanamsa
+from backend.app.astrology.masa import LunationTable, build_lunation_table
+
+client = TestClient(main.app)
+
+START = datetime_to_jd(datetime(1982, 6, 1))
+END = datetime_to_jd(datetime(1984, 1, 1))
+
+
+@pytest.fixture(scope="module")
+def table():
+    return build_lunation_table(START, END)
+
+
+def test_lunations_are_exact(table):
+    set_ayanamsa("lahiri")
+    sun, moon = ephemeris("Sun"), ephemeris("Moon")
+    for jd in table.new_moons:
+        assert abs((moon(jd)[0] - sun(jd)[0] + 180) % 360 - 180) < 1e-4
+    for jd in table.full_moons:
+        assert abs((moon(jd)[0] - sun(jd)[0]) % 360 - 180) < 1e-4
+    gaps = np.diff(table.new_moons)
+    assert gaps.min() > 29.2 and gaps.max() < 29.9
+
+
+def test_adhika_and_kshaya_masa(table):
+    months = table.months(datetime_to_jd(datetime(1982, 9, 1)), datetime_to_jd(datetime(1983, 4, 1)))
+    labels = [
+        ("Adhika " if m["adhika"] else "") + m["name"] + (" (kshaya)" if m["kshaya"] else "")
+        for m in months
+    ]
+    # 1982-83: adhika Ashwin, kshaya Pausha (covering Magha), adhika Phalguna.
+    assert labels == [
+        "Bhadrapada", "Adhika Ashwin", "Ashwin", "Kartika", "Margashirsha",
+        "Pausha (kshaya)", "Adhika Phalguna", "Phalguna",
+    ]
+    assert months[5]["merged"] == "Magha"
+    for m in months:
+        assert m["purnimanta_start"] < m["start"] < m["full_moon"] < m["end"]
+
+
+def test_save_load_and_fallback(table, tmp_path, monkeypatch):
+    path = tmp_path / "lunations.npz"
+    table.save(path)
+    loaded = LunationTable.load(path)
+    assert loaded.covers(START + 90, END - 90)
+    assert not loaded.covers(START + 90, END - 90, ayanamsa="raman")
+    np.testing.assert_array_equal(loaded.new_moons, table.new_moons)
+
+    monkeypatch.setenv("LUNATION_TABLE_FILE", str(path))
+    masa.get_lunation_table.cache_clear()
+    try:
+        jd = datetime_to_jd(datetime(2023, 8, 1))
+        assert masa.lunation_table_for(START + 90, START + 100) is masa.get_lunation_table()
+        # 2023 is outside the file, so the month is solved on demand.
+        month = masa.masa_at(jd)
+        assert month["name"] == "Shravana" and month["adhika"]
+    finally:
+        masa.get_lunation_table.cache_clear()
+
+
+def test_lunar_months_route():
+    resp = client.post("/api/panchanga/months", json={"start": "2023-07-01", "end": "2023-09-01"})
+    assert resp.status_code == 200
+    names = [(m["name"], m["adhika"]) for m in resp.json()["months"]]
+    assert names == [("Ashadha", False), ("Shravana", True), ("Shravana", False)]
+
+    resp = client.post("/api/panchanga/months", json={"start": "2023-07-01", "end": "2023-06-01"})
+    assert resp.status_code == 422
@@ -0,0 +1,91 @@
+import json
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology.intervals import complement, intersect, normalize, subtract, union
+from backend.app.astrology.muhurta import MuhurtaRules, iter_muhurtas, search_muhurtas
+
+client = TestClient(main.app)
+
+DELHI = (28.61, 77.21, "Asia/Kolkata")
+
+
+def test_interval_set_operations():
+    a = normalize([(5, 7), (0, 2), (1, 3), (3, 4), (8, 8)])
+    assert a.tolist() == [[0, 4], [5, 7]]
+    b = [(2, 6)]
+    assert intersect(a, b).tolist() == [[2, 4], [5, 6]]
+    assert union(a, b).tolist() == [[0, 7]]
+    assert complement(a, -1, 10).tolist() == [[-1, 0], [4, 5], [7, 10]]
+    assert subtract(a, b).tolist() == [[0, 2], [6, 7]]
+
+
+def test_windows_satisfy_rules():
+    rules = MuhurtaRules(nakshatras=frozenset({4}), weekdays=frozenset({1, 3, 4, 5}))
+    windows = list(iter_muhurtas(date(2024, 1, 1), date(2024, 4, 30), *DELHI, rules))
+    assert windows
+    starts = [w["start"] for w in windows]
+    assert starts == sorted(starts)
+    for w in windows:
+        assert w["nakshatra"] == ["Rohini"]
+        assert set(w["vaara"]) <= {"Monday", "Wednesday", "Thursday", "Friday"}
+
+
+def test_rahu_kalam_excluded():
+    everything = list(iter_muhurtas(date(2024, 1, 1), date(2024, 1, 1), *DELHI,
+                                    MuhurtaRules(exclude_vishti=False)))
+    # Monday: the day is split by Rahu Kalam (08:32-09:49) only.
+    assert [w["end"][11:16] for w in everything] == ["08:32", "07:15"]
+    assert everything[1]["start"][11:16] == "09:49"
+
+
+def test_vishti_excluded():
+    # Raksha Bandhan 2024: Bhadra (Vishti) fills the first half of Shravana
+    # Purnima, from 03:05 until about 13:32 IST on 19 August.
+    rules = MuhurtaRules(exclude_rahu_kalam=False)
+    windows = list(iter_muhurtas(date(2024, 8, 18), date(2024, 8, 19), *DELHI, rules))
+    assert [(w["end"][:16], n["start"][:16]) for w, n in zip(windows, windows[1:])] == [
+        ("2024-08-19T03:05", "2024-08-19T13:32"),
+    ]
+    assert windows[1]["tithi"][0] == "Purnima"
+
+
+def test_windows_merge_across_blocks():
+    rules = MuhurtaRules(exclude_rahu_kalam=False, exclude_vishti=False, tithis=frozenset({1}))
+    windows = list(iter_muhurtas(date(2024, 1, 1), date(2024, 3, 31), *DELHI, rules))
+    # Only one Shukla Pratipada a month; each is a single window.
+    assert len(windows) == 3
+    assert all(w["tithi"] == ["Shukla Pratipada"] for w in windows)
+
+
+def test_lagna_rule_and_ranking():
+    rules = MuhurtaRules(lagnas=frozenset({5}), min_minutes=30)
+    ranked = search_muhurtas(date(2024, 1, 1), date(2024, 1, 10), *DELHI, rules, limit=5)
+    assert [w["rank"] for w in ranked] == [1, 2, 3, 4, 5]
+    assert all(w["lagna"] == ["Leo"] for w in ranked)
+    minutes = [w["minutes"] for w in ranked]
+    assert minutes == sorted(minutes, reverse=True)
+    # Leo takes roughly two hours to rise at Delhi.
+    assert 100 < minutes[0] < 160
+
+
+def test_muhurta_route_ranked_and_stream():
+    body = {"start": "2024-01-01", "end": "2024-01-31", "latitude": 28.61, "longitude": 77.21,
+            "timezone": "Asia/Kolkata", "weekdays": ["Thursday"], "limit": 3}
+    resp = client.post("/api/muhurta", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["windows"]) == 3
+    assert all(w["vaara"] == ["Thursday"] for w in data["windows"])
+
+    resp = client.post("/api/muhurta", json={**body, "stream": True})
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(lines) >= 4
+    assert [w["start"] for w in lines] == sorted(w["start"] for w in lines)
+
+    assert client.post("/api/muhurta", json={**body, "weekdays": ["Caturday"]}).status_code == 422
+    assert client.post("/api/muhurta", json={**body, "latitude": 80.0}).status_code == 400
+    assert client.post("/api/muhurta", json={**body, "latitude": 80.0, "stream": True}).status_code == 400
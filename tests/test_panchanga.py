@@ -8,7 +8,7 @@ from fastapi import HTTPException
 from backend import main
 from backend.app.routes import profile
 from backend.app.services import astro
-from backend.app.astrology import panchanga
+from backend.app.astrology import panchanga, panchanga_calendar
 
 client = TestClient(main.app)
 
@@ -20,8 +20,14 @@ def test_tithi_calculation():
 
 
 def test_karana_calculation():
+    # First half of Dvitiya: Kimstughna and Bava fill Pratipada.
     res = panchanga.get_karana(0.0, 15.0)
-    assert res["name"] == "Kaulava"
+    assert res["name"] == "Balava"
+    assert panchanga.get_karana(0.0, 3.0)["name"] == "Kimstughna"
+    # Vishti takes the second half of Shukla Chaturthi and the first of Ashtami.
+    assert panchanga.get_karana(0.0, 45.0)["name"] == "Vishti"
+    assert panchanga.get_karana(0.0, 87.0)["name"] == "Vishti"
+    assert panchanga.get_karana(0.0, 357.0)["name"] == "Naga"
 
 
 def test_vaara():
@@ -69,3 +75,54 @@ def test_compute_panchanga_birth_info_error(monkeypatch):
     with pytest.raises(HTTPException) as exc:
         astro.compute_panchanga(req)
     assert exc.value.status_code == 400
+
+
+def test_month_calendar_udaya_and_end_times():
+    days = panchanga_calendar.month_calendar(2024, 1, 28.61, 77.21, "Asia/Kolkata")
+    assert len(days) == 31
+    first = days[0]
+    assert first["vaara"] == "Monday"
+    assert first["sunrise"].startswith("2024-01-01T07:1")
+    # Krishna Panchami runs at sunrise and ends at 14:28 IST.
+    assert first["tithi"][0]["name"] == "Krishna Panchami"
+    assert first["tithi"][0]["end"].startswith("2024-01-01T14:28")
+    assert first["nakshatra"][0]["name"] == "Magha"
+    assert first["masa"] == {"name": "Margashirsha", "adhika": False}
+    assert days[11]["masa"]["name"] == "Pausha"     # new moon on 11 January
+    for day in days:
+        for element in ("tithi", "nakshatra", "yoga", "karana"):
+            ends = [e["end"] for e in day[element]]
+            assert ends == sorted(ends) and ends[0] > day["sunrise"]
+    # Consecutive days continue the same sequence of tithis.
+    for today, tomorrow in zip(days, days[1:]):
+        assert today["tithi"][-1]["index"] == tomorrow["tithi"][0]["index"]
+
+
+def test_panchanga_month_is_cached(monkeypatch):
+    fake = fakeredis.FakeRedis()
+    monkeypatch.setattr(astro, "_CACHE", fake)
+    calls = []
+
+    def fake_calendar(*args, **kwargs):
+        calls.append(args)
+        return [{"date": "2024-02-01"}]
+
+    monkeypatch.setattr(astro, "month_calendar", fake_calendar)
+    req = astro.PanchangaMonthRequest(year=2024, month=2, latitude=28.61, longitude=77.21,
+                                      timezone="Asia/Kolkata")
+    for _ in range(2):
+        assert astro.compute_panchanga_month(req)["days"] == [{"date": "2024-02-01"}]
+    assert len(calls) == 1
+
+
+def test_panchanga_calendar_route():
+    body = {"year": 2024, "month": 2, "latitude": 28.61, "longitude": 77.21, "timezone": "Asia/Kolkata"}
+    resp = client.post("/api/panchanga/calendar", json=body)
+    assert resp.status_code == 200
+    days = resp.json()["days"]
+    assert len(days) == 29 and days[0]["date"] == "2024-02-01"
+
+    resp = client.post("/api/panchanga/calendar", json={**body, "month": 13})
+    assert resp.status_code == 422
+    resp = client.post("/api/panchanga/calendar", json={**body, "latitude": 89.0})
+    assert resp.status_code == 400
@@ -0,0 +1,68 @@
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.core.places import Place, PlaceIndex, normalize, suggest_places
+
+client = TestClient(main.app)
+
+
+def _index():
+    places = [
+        Place("Pune", "Maharashtra", "India", 18.52, 73.86, "Asia/Kolkata", 3124458),
+        Place("Puri", "Odisha", "India", 19.81, 85.83, "Asia/Kolkata", 201026),
+        Place("Punjab Town", "", "Nowhere", 0.0, 0.0, "UTC", 10),
+        Place("São Paulo", "Sao Paulo", "Brazil", -23.55, -46.63, "America/Sao_Paulo", 12325232),
+    ]
+    places.sort(key=lambda p: -p.population)
+    return PlaceIndex(places)
+
+
+def test_normalize_folds_accents_and_commas():
+    assert normalize("  São  Paulo, Brazil ") == "sao paulo brazil"
+
+
+def test_prefix_ranked_by_population():
+    idx = _index()
+    names = [p.name for p in idx.suggest("pu", limit=5)]
+    assert names == ["Pune", "Puri", "Punjab Town"]
+    assert [p.name for p in idx.suggest("pu", limit=1)] == ["Pune"]
+
+
+def test_prefix_matches_qualified_label():
+    idx = _index()
+    assert [p.name for p in idx.suggest("puri, odisha")] == ["Puri"]
+    assert [p.name for p in idx.suggest("sao")] == ["São Paulo"]
+    assert idx.suggest("xyz") == []
+    assert idx.suggest("  ") == []
+
+
+def test_short_prefixes_match_full_scan():
+    # Short prefixes come from stored top lists; they must agree with a scan.
+    places = [
+        Place(f"{a}{b}town", "State", "Land", 0.0, 0.0, "UTC", (i * 7919) % 1000)
+        for i, (a, b) in enumerate((a, b) for a in "abc" for b in "abcdefghij")
+    ] * 2
+    places.sort(key=lambda p: -p.population)
+    idx = PlaceIndex(places)
+    for prefix in ("a", "b", "ab", "c", "cj", "abt", "abto", "x"):
+        expected = []
+        for i, place in enumerate(places):
+            if (normalize(place.name).startswith(prefix)
+                    or normalize(place.label).startswith(prefix)):
+                expected.append(i)
+        for limit in (1, 5, 20):
+            assert idx.suggest(prefix, limit) == [places[i] for i in expected[:limit]]
+
+
+def test_bundled_index_has_timezones():
+    res = suggest_places("Delhi", 3)
+    assert res[0]["name"] == "Delhi"
+    assert res[0]["timezone"] == "Asia/Kolkata"
+
+
+def test_suggest_route():
+    resp = client.get("/api/locations/suggest", params={"q": "mum", "limit": 2})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data[0]["name"] == "Mumbai"
+    assert {"latitude", "longitude", "timezone"} <= set(data[0])
@@ -37,3 +37,19 @@ def test_profile_request_time_with_seconds_string():
     with pytest.raises(ValueError):
         ProfileRequest(date=date(2020, 1, 1), time="23:59:01", location="Delhi")
 
+
+
+def test_profile_request_coordinates_without_location():
+    req = ProfileRequest(date=date(2020, 1, 1), time=time(6, 30), lat=28.61, lon=77.21)
+    assert req.has_coordinates
+    assert req.latitude == 28.61
+    assert req.location_key() == "28.6100,77.2100,"
+
+
+def test_profile_request_requires_location_or_coordinates():
+    with pytest.raises(ValueError):
+        ProfileRequest(date=date(2020, 1, 1), time=time(6, 30))
+    with pytest.raises(ValueError):
+        ProfileRequest(date=date(2020, 1, 1), time=time(6, 30), latitude=10.0)
+    with pytest.raises(ValueError):
+        ProfileRequest(date=date(2020, 1, 1), time=time(6, 30), latitude=95.0, longitude=10.0)
@@ -0,0 +1,93 @@
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.app.astrology.events import ephemeris, set_ayanamsa
+from backend.app.astrology.lagna import ascendant
+from backend.app.astrology.dasha import DASHA_YEARS, VimshottariDasha
+from backend.app.astrology.rectification import birth_dasha, rectification_intervals
+
+client = TestClient(main.app)
+
+DELHI = (28.61, 77.21)
+# 2024-01-01 06:00 IST.
+START = 2460310.5 + 0.5 / 24
+
+
+def test_intervals_tile_window_and_keys_hold():
+    intervals = rectification_intervals(START, START + 3 / 24, *DELHI)
+    assert intervals[0]["start"] == START and intervals[-1]["end"] == START + 3 / 24
+    assert all(a["end"] == b["start"] for a, b in zip(intervals, intervals[1:]))
+    assert all(item["changed"] for item in intervals[1:])
+    set_ayanamsa("lahiri")
+    moon = ephemeris("Moon")
+    signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio",
+             "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+    for item in intervals:
+        for t in (item["start"] + 1e-5, item["end"] - 1e-5):
+            asc = ascendant(t, *DELHI)
+            assert signs[int(asc // 30)] == item["lagna"]
+            assert signs[int(asc // (10 / 3)) % 12] == item["navamsa_lagna"]
+            assert int((moon(t)[0] % (360 / 27)) // (90 / 27)) + 1 == item["pada"]
+            dasha = birth_dasha(moon(t)[0], t)
+            assert (dasha["mahadasha"], dasha["antardasha"]) == (item["mahadasha"], item["antardasha"])
+
+
+def test_moon_changing_nakshatra_changes_dasha():
+    # The Moon leaves Magha for Purva Phalguni around 08:36 IST.
+    intervals = rectification_intervals(START, START + 3 / 24, *DELHI)
+    change = next(i for i, item in enumerate(intervals) if "nakshatra" in item["changed"])
+    before, after = intervals[change - 1], intervals[change]
+    # Ketu-Mercury is the last antardasha of Magha; Venus-Venus the first of Purva Phalguni.
+    assert (before["nakshatra"], before["mahadasha"], before["antardasha"]) == ("Magha", "Ketu", "Mercury")
+    assert (after["nakshatra"], after["mahadasha"], after["antardasha"]) == (
+        "Purva Phalguni", "Venus", "Venus")
+    assert abs(before["balance_years"][1]) < 1e-6
+    assert abs(after["balance_years"][0] - 20) < 1e-6
+    # Only the nakshatra moves the mahadasha; antardashas also change within it.
+    for item in intervals[1:]:
+        assert ("mahadasha" in item["changed"]) == ("nakshatra" in item["changed"])
+    # Venus-Venus lasts a sixth of the nakshatra (about four hours of the
+    # Moon) and Venus-Sun a twentieth.
+    longer = rectification_intervals(START, START + 9 / 24, *DELHI)
+    split = [item for item in longer if item["changed"] == ["antardasha"]]
+    assert [(item["mahadasha"], item["antardasha"]) for item in split] == [("Venus", "Sun"), ("Venus", "Moon")]
+
+
+def test_birth_dasha_matches_dasha_engine():
+    span = 360 / 27
+    jd = 2451545.0
+    assert birth_dasha(0.0, jd)["balance_years"] == 7           # start of Ashwini: all of Ketu
+    assert abs(birth_dasha(span * 1.5, jd)["balance_years"] - 10) < 1e-9   # half of Bharani
+    for moon in (130.0, 205.0, 359.0):
+        # The antardasha is the one running in the full mahadasha, which began
+        # when the Moon entered its nakshatra.
+        dasha = birth_dasha(moon, jd)
+        elapsed = (moon % span) / span * DASHA_YEARS[dasha["mahadasha"]] * 365.25
+        maha, antar = VimshottariDasha(moon - moon % span, jd - elapsed).active_at(jd, depth=2)
+        assert (dasha["mahadasha"], dasha["antardasha"]) == (maha.lord, antar.lord)
+    # Three quarters into Magha: Ketu's Saturn antardasha runs from 70% to 86%.
+    assert (birth_dasha(130.0, jd)["mahadasha"], birth_dasha(130.0, jd)["antardasha"]) == ("Ketu", "Saturn")
+
+
+def test_rectification_route():
+    body = {"date": "2024-01-01", "window_start": "06:00", "window_end": "09:00",
+            "latitude": 28.61, "longitude": 77.21, "timezone": "Asia/Kolkata"}
+    resp = client.post("/api/rectification", json=body)
+    assert resp.status_code == 200
+    intervals = resp.json()["intervals"]
+    assert intervals[0]["start"] == "2024-01-01T06:00:00+05:30"
+    assert intervals[-1]["end"] == "2024-01-01T09:00:00+05:30"
+    assert abs(sum(i["minutes"] for i in intervals) - 180) < 0.1
+
+    overnight = client.post("/api/rectification", json={**body, "window_start": "23:00",
+                                                          "window_end": "01:00"})
+    assert overnight.json()["intervals"][-1]["end"] == "2024-01-02T01:00:00+05:30"
+
+    # The window edges are echoed exactly, not truncated a second early.
+    oslo = client.post("/api/rectification", json={
+        "date": "1990-06-15", "window_start": "06:00", "window_end": "08:00",
+        "latitude": 59.91, "longitude": 10.75, "timezone": "Europe/Oslo"})
+    intervals = oslo.json()["intervals"]
+    assert intervals[0]["start"] == "1990-06-15T06:00:00+02:00"
+    assert intervals[-1]["end"] == "1990-06-15T08:00:00+02:00"
+    assert all(a["end"] == b["start"] for a, b in zip(intervals, intervals[1:]))
@@ -0,0 +1,49 @@
+import math
+from datetime import date
+
+import numpy as np
+
+from backend.app.astrology import sun_data
+from backend.app.astrology.sun_data import SunTimesCache, day_number, get_sun_times
+
+
+def test_vedic_day_starts_at_sunrise():
+    # 7 January 2025 (Tuesday), 03:00 UTC at 0N 0E is before sunrise.
+    jd = 2460682.625
+    night = get_sun_times(jd, 0.0, 0.0)
+    assert not night["is_day_birth"]
+    assert night["vedic_weekday"] == 1          # still Monday
+    assert night["sunrise"] < jd < night["next_sunrise"]
+    day = get_sun_times(jd + 0.25, 0.0, 0.0)
+    assert day["is_day_birth"] and day["vedic_weekday"] == 2
+    assert day["sunrise"] == night["next_sunrise"]
+
+
+def test_weekday_uses_local_date_east_of_greenwich():
+    # Sunrise at 160E falls on the previous UTC date.
+    res = get_sun_times(2460406.6, -32.55, 160.3)
+    assert res["vedic_weekday"] == 6           # Saturday 6 April 2024 locally
+
+
+def test_cache_roundtrip_through_disk(tmp_path, monkeypatch):
+    path = tmp_path / "sun.sqlite3"
+    first = day_number(date(2024, 3, 1))
+    rows = SunTimesCache(path).get_range(28.614, 77.209, first, first + 9)
+    assert rows.shape == (10, 2) and np.all(np.diff(rows[:, 0]) > 0.99)
+
+    calls = []
+    monkeypatch.setattr(sun_data, "_solve_days", lambda *a: calls.append(a))
+    again = SunTimesCache(path).get_range(28.61, 77.21, first, first + 9)
+    assert calls == []
+    np.testing.assert_array_equal(again, rows)
+
+
+def test_year_batch_and_polar_night(monkeypatch):
+    monkeypatch.setattr(sun_data, "_CACHE", SunTimesCache(None))
+    year = sun_data.sun_times_for_year(28.61, 77.21, 2024)
+    assert len(year["days"]) == 366
+    assert np.isfinite(year["sunrise"]).all()
+    assert np.all(year["sunrise"] < year["sunset"])
+    polar = sun_data.sun_times_for_year(80.0, 20.0, 2024)
+    december = polar["sunrise"][-10:]
+    assert all(math.isnan(v) for v in december)
@@ -0,0 +1,138 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fastapi import HTTPException
+
+from backend import main
+from backend.app.astrology.dasha import datetime_to_jd
+from backend.app.astrology.transits import ashtakavarga_timeline, transit_timeline
+from backend.app.services import astro
+
+client = TestClient(main.app)
+
+START = datetime_to_jd(datetime(2020, 1, 1))
+END = datetime_to_jd(datetime(2021, 1, 1))
+NATAL = [
+    {"name": "Moon", "longitude": 280.0},  # Capricorn
+    {"name": "Mars", "longitude": 100.0},  # Cancer
+    {"name": "Sun", "longitude": 5.0},     # Aries
+]
+
+
+def test_saturn_houses_from_moon_and_lagna():
+    data = transit_timeline(NATAL, 35.0, START, END, ["Saturn"])
+    assert data["natal"] == {"moon_sign": 10, "lagna_sign": 2}
+    signs = [(p["sign"], p["house_from_moon"], p["house_from_lagna"]) for p in data["positions"]]
+    assert signs == [(9, 12, 8), (10, 1, 9)]
+    assert data["positions"][1]["start"].date().isoformat() == "2020-01-24"
+    assert data["positions"][0]["end"] == data["positions"][1]["start"]
+
+
+def test_saturn_aspects_natal_planets():
+    data = transit_timeline(NATAL, 35.0, START, END, ["Saturn"])
+    in_capricorn = [a for a in data["aspects"] if a["sign"] == 10]
+    assert {(a["natal_planet"], a["type"]) for a in in_capricorn} == {
+        ("Moon", "conjunction"),
+        ("Mars", "7th aspect"),
+    }
+    assert len(data["retrograde"]) == 1
+
+
+def test_requires_natal_moon():
+    with pytest.raises(ValueError):
+        transit_timeline(NATAL[1:], 35.0, START, END)
+
+
+def test_transits_route_inline_chart():
+    body = {
+        "start": "2020-01-01",
+        "end": "2021-01-01",
+        "planets": ["Saturn", "Jupiter"],
+        "natal": {"ascendant": 35.0, "planets": NATAL},
+    }
+    resp = client.post("/api/transits", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert {p["planet"] for p in data["positions"]} == {"Saturn", "Jupiter"}
+
+    body["job_id"] = "abc"
+    assert client.post("/api/transits", json=body).status_code == 422
+
+    del body["natal"]
+    assert client.post("/api/transits", json=body).status_code == 404
+
+
+def test_transits_from_job_use_its_ayanamsa(monkeypatch):
+    job = {
+        "status": "complete", "error": None, "ayanamsa": "raman", "node_type": "true",
+        "result": {"planetaryPositions": NATAL, "birthInfo": {"ascendant": 35.0}},
+    }
+    monkeypatch.setattr(astro, "get_job", lambda job_id: job)
+    seen = {}
+
+    def fake_timeline(*args, ayanamsa, node_type):
+        seen.update(ayanamsa=ayanamsa, node_type=node_type)
+        return {}
+
+    monkeypatch.setattr(astro, "transit_timeline", fake_timeline)
+    body = {"start": "2020-01-01", "end": "2021-01-01", "job_id": "abc"}
+    astro.compute_transits(astro.TransitRequest.model_validate(body))
+    assert seen == {"ayanamsa": "raman", "node_type": "true"}
+
+    body["ayanamsa"] = "lahiri"
+    with pytest.raises(HTTPException) as exc:
+        astro.compute_transits(astro.TransitRequest.model_validate(body))
+    assert exc.value.status_code == 400
+
+
+def test_ashtakavarga_timeline_scores_transits():
+    bav = {"Saturn": {s: s for s in range(1, 13)}, "Sun": {str(s): 1 for s in range(1, 13)}}
+    sav = {s: 20 + s for s in range(1, 13)}
+    data = ashtakavarga_timeline(bav, sav, 35.0, START, START + 60, ["Saturn", "Sun"])
+    assert len(data["times"]) == 60
+    assert list(data["planets"]) == ["Saturn", "Sun"]
+    assert list(ashtakavarga_timeline(bav, sav, 35.0, START, START + 2)["planets"]) == ["Sun", "Saturn"]
+    # Requested planets without a BAV, or unknown ones, are refused.
+    for planets in (["Saturn", "Moon"], ["Rahu"], ["Saturnn"]):
+        with pytest.raises(ValueError):
+            ashtakavarga_timeline(bav, sav, 35.0, START, START + 60, planets)
+    saturn = data["planets"]["Saturn"]
+    assert saturn["sign"][0] == 9 and saturn["sign"][-1] == 10
+    assert saturn["bindus"] == saturn["sign"]
+    assert saturn["sav"] == [20 + s for s in saturn["sign"]]
+    # Lagna is Taurus, so Saturn in Capricorn sits in the 9th house.
+    day = saturn["sign"].index(10)
+    expected = 10 + (1 if data["planets"]["Sun"]["sign"][day] == 10 else 0)
+    assert data["houses"][9][day] == expected
+    total = sum(data["houses"][h][day] for h in range(1, 13))
+    assert total == saturn["bindus"][day] + data["planets"]["Sun"]["bindus"][day]
+
+
+def test_ashtakavarga_timeline_hourly():
+    data = ashtakavarga_timeline({"Moon": {s: 1 for s in range(1, 13)}}, {}, 0.0, START, START + 2,
+                                 resolution="hour")
+    assert len(data["times"]) == 48
+    assert len(set(data["planets"]["Moon"]["sign"])) >= 2
+
+
+def test_transit_scores_route():
+    body = {
+        "start": "2020-01-01",
+        "end": "2020-02-01",
+        "resolution": "day",
+        "natal": {"ascendant": 35.0, "planets": NATAL},
+    }
+    resp = client.post("/api/transits/scores", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["times"]) == 31
+    assert set(data["planets"]) == {"Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"}
+    assert set(data["houses"]) == {str(h) for h in range(1, 13)}
+
+    resp = client.post("/api/transits/scores", json={**body, "planets": ["Saturn", "Rahu"]})
+    assert resp.status_code == 400
+
+    body.update(end="2022-01-01", resolution="hour")
+    assert client.post("/api/transits/scores", json=body).status_code == 422
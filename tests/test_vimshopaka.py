@@ -0,0 +1,41 @@
+import numpy as np
+
+from backend.app.astrology.vimshopaka import (
+    VIMSHOPAKA_SCHEMES,
+    calculate_vimshopaka,
+    dignity_points,
+)
+
+
+def test_scheme_weights_sum_to_twenty():
+    for weights in VIMSHOPAKA_SCHEMES.values():
+        assert sum(weights.values()) == 20
+
+
+def test_dignity_points_compound_relationship():
+    # Rows: Sun, Moon, Mars, Mercury, Jupiter, Venus, Saturn; one varga.
+    signs = np.array([[7], [4], [0], [0], [0], [9], [1]])
+    points = dignity_points(signs)[:, 0].tolist()
+    # Sun in Libra: Venus is a natural enemy but 3rd from the Sun (temporal friend).
+    assert points[0] == 10
+    assert points[1] == 20          # Moon in own sign
+    assert points[2] == 0           # missing planet
+    # Venus in Sagittarius: Jupiter neutral and missing, so no temporal relation.
+    assert points[5] == 10
+    # Saturn debilitated in Aries: Mars is a natural enemy and missing.
+    assert points[6] == 7
+
+
+def test_calculate_vimshopaka_ranges():
+    planets = [
+        {"name": "Sun", "longitude": 130.0},
+        {"name": "Moon", "longitude": 95.0},
+        {"name": "Rahu", "longitude": 10.0},
+    ]
+    res = calculate_vimshopaka(planets)
+    assert set(res) == set(VIMSHOPAKA_SCHEMES)
+    for scores in res.values():
+        assert set(scores) == {"Sun", "Moon"}
+        assert all(0 < v <= 20 for v in scores.values())
+    # 5° into Cancer keeps the Moon in its own sign in D1, D2 (Cancer hora) and D3.
+    assert res["shadvarga"]["Moon"] >= 6 + 2 + 4
@@ -1,7 +1,18 @@
 from datetime import time
 import math
-from backend.app.astrology.yogas import calculate_all_yogas
-from backend.app.astrology.shadbala import calculate_shadbala
+import numpy as np
+import pytest
+
+from backend.app.astrology.yogas import (
+    calculate_all_yogas,
+    chart_state,
+    compile_rule,
+    evaluate_rules,
+    find_yogas,
+    varga_yogas,
+)
+from backend.app.astrology.aspects import build_aspect_matrix
+from backend.app.astrology.shadbala import calculate_bhava_bala, calculate_shadbala
 from backend.app.astrology.divisional_charts import calculate_all_vargas
 from backend.app.utils.signs import get_sign_lord
 
@@ -25,9 +36,93 @@ def test_calculate_all_yogas_nabhasa_only():
     assert res["total_count"] == 1 + len(res["yogas"]["chandra_yogas"])
 
 
+def test_yogas_use_lagna_for_lordship():
+    # Leo lagna: the Sun rules the 1st and Mars the 4th and 9th.
+    planets = [{"name": "Sun", "sign": 9}, {"name": "Mars", "sign": 9}, {"name": "Moon", "sign": 3}]
+    houses = {"houses": {1: {"sign_id": 5, "occupants": []}, 5: {"sign_id": 9, "occupants": ["Sun", "Mars"]}}}
+    res = calculate_all_yogas(planets, houses)
+    raja = [(y["type"], y["planets"], y["houses"]) for y in res["yogas"]["raj_yogas"]]
+    assert raja == [
+        ("Conjunction", ["Sun", "Mars"], [1, 9]),
+        ("Conjunction", ["Mars", "Sun"], [4, 1]),   # Mars rules both 4 and 9: no 4/9 pair
+    ]
+    dhana = [(y["planets"], y["houses"]) for y in res["yogas"]["dhana_yogas"]]
+    assert (["Sun", "Mars"], [1, 9]) in dhana
+    chandra = {y["name"] for y in res["yogas"]["chandra_yogas"]}
+    assert chandra == {"Kemadruma Yoga"}
+
+
+def test_custom_rule_and_batch_evaluation():
+    rule = compile_rule({
+        "name": "Test", "family": "chandra_yogas", "type": "Test",
+        "when": [{"who": ("any", ["Mars", "Saturn"]), "in_house": [2], "from": "Moon"}],
+        "output": {"planets": [("matching", 0)]},
+    })
+    signs = np.zeros((3, 9), dtype=int)
+    signs[:, 1] = 1                       # Moon in Aries
+    signs[0, 2] = 2                       # Mars in Taurus
+    signs[1, 6] = 2                       # Saturn in Taurus
+    signs[2, 2] = 3
+    state = chart_state(signs, np.zeros((3, 9), dtype=int), [1, 1, 1])
+    assert evaluate_rules(state, [rule])[:, 0].tolist() == [True, True, False]
+    found = find_yogas(state, [rule])
+    assert [y["planets"] for y in found[0]["chandra_yogas"]] == [["Mars"]]
+    assert found[2]["chandra_yogas"] == []
+
+    with pytest.raises(ValueError):
+        compile_rule({"name": "Bad", "family": "x", "type": "x", "when": [{"who": ("some", ["Mars"]), "in_sign": [1]}]})
+
+
+def test_varga_yogas_batch():
+    # Mars and the lagna at 2° Aries stay in Aries in D1 and D9; in D2 both fall in Leo.
+    planets = [{"name": "Mars", "longitude": 2.0}]
+    res = varga_yogas(planets, 2.0, "D9,D1,D2")
+    assert list(res["charts"]) == ["D1", "D2", "D9"]
+    assert [y["name"] for y in res["charts"]["D9"]["pancha_mahapurusha"]] == ["Ruchaka Yoga"]
+    assert res["charts"]["D2"]["pancha_mahapurusha"] == []
+    assert res["summary"]["yogas"] == {"Ruchaka Yoga": ["D1", "D9"]}
+    assert res["summary"]["strong_planets"] == ["Mars"]
+
+
+def test_calculate_all_yogas_with_aspect_matrix():
+    planets = [
+        {"name": "Sun", "sign": 1, "degree": 10},
+        {"name": "Moon", "sign": 4, "degree": 5},
+        {"name": "Mars", "sign": 10, "degree": 28},
+        {"name": "Jupiter", "sign": 4, "degree": 5},
+        {"name": "Saturn", "sign": 7, "degree": 20},
+    ]
+    houses = {"houses": {1: ["Sun"], 4: ["Moon", "Jupiter"], 7: ["Saturn"], 10: ["Mars"]}}
+    # The matrix's house aspects follow the drishti table, so the yogas match.
+    res = calculate_all_yogas(planets, houses, build_aspect_matrix(planets, houses))
+    assert res == calculate_all_yogas(planets, houses)
+    assert [y["planet"] for y in res["yogas"]["pancha_mahapurusha"]] == ["Mars", "Jupiter", "Saturn"]
+
+
+def test_mahapurusha_one_yoga_per_planet():
+    # Matches the former hand-written check: own sign or exaltation in a
+    # kendra gives one yoga, Strong when exalted.
+    exaltation = {"Mars": 10, "Mercury": 6, "Jupiter": 4, "Venus": 12, "Saturn": 7}
+    own_signs = {"Mars": [1, 8], "Mercury": [3, 6], "Jupiter": [9, 12],
+                 "Venus": [2, 7], "Saturn": [10, 11]}
+    for planet in exaltation:
+        for sign in range(1, 13):
+            for house in (1, 2, 10):
+                res = calculate_all_yogas([{"name": planet, "sign": sign}],
+                                          {"houses": {house: [planet]}})
+                found = [(y["planet"], y["strength"]) for y in res["yogas"]["pancha_mahapurusha"]]
+                expected = []
+                if house != 2 and (sign == exaltation[planet] or sign in own_signs[planet]):
+                    expected = [(planet, "Strong" if sign == exaltation[planet] else "Medium")]
+                assert found == expected, (planet, sign, house)
+
+
 def test_calculate_shadbala_edge_cases():
+    # Noon UT on Saturday 2000-01-01 at 0N 0E, with the Moon 90 degrees
+    # ahead of the Sun so Paksha Bala is 30 for benefics and malefics alike.
     planets = [
         {"name": "Sun", "sign": 5, "degree": 10, "retrograde": False},
+        {"name": "Moon", "sign": 8, "degree": 10, "retrograde": False},
         {"name": "Saturn", "sign": 1, "degree": 20, "retrograde": False},
         {"name": "Rahu", "sign": 10, "degree": 0, "retrograde": True},
     ]
@@ -37,19 +132,61 @@ def test_calculate_shadbala_edge_cases():
     assert "Rahu" not in res
     assert res["Saturn"]["sthana_bala"] == 0
     assert res["Sun"]["dig_bala"] == 30
-    assert res["Sun"]["kala_bala"] == 30
-    assert res["Saturn"]["kala_bala"] == 15
+    # Sun: day birth (30) and lord of the middle third of the day (60),
+    # plus its Ayana Bala (also its Chesta Bala) and Paksha Bala.
+    assert math.isclose(res["Sun"]["kala_bala"], 90 + res["Sun"]["chesta_bala"] + 30)
+    # Saturn: lord of the weekday (45), plus Paksha Bala and the Ayana Bala
+    # of its southern-favoured declination at 20 degrees tropical.
+    declination = math.degrees(math.asin(math.sin(math.radians(23.44)) * math.sin(math.radians(20))))
+    ayana = 60 * (23.44 - declination) / (2 * 23.44)
+    assert math.isclose(res["Saturn"]["kala_bala"], 45 + 30 + ayana)
 
 
 def test_moon_paksha_bala():
+    binfo = {"birth_time": time(12, 0), "jd_ut": 2451545.0}
+    # The Moon's Chesta Bala is its Paksha Bala: 0 at new Moon, 60 at full.
+    for moon_sign, paksha in ((1, 0.0), (4, 30.0), (7, 60.0), (10, 30.0)):
+        planets = [
+            {"name": "Sun", "sign": 1, "degree": 0, "retrograde": False},
+            {"name": "Moon", "sign": moon_sign, "degree": 0, "retrograde": False},
+        ]
+        houses = {"houses": {1: ["Sun"], moon_sign: ["Moon"]}}
+        res = calculate_shadbala(planets, binfo, houses)
+        assert math.isclose(res["Moon"]["chesta_bala"], paksha, abs_tol=1e-9)
     planets = [
         {"name": "Sun", "sign": 1, "degree": 0, "retrograde": False},
         {"name": "Moon", "sign": 4, "degree": 0, "retrograde": False},
     ]
-    binfo = {"birth_time": time(12, 0), "jd_ut": 2451545.0}
-    houses = {"houses": {1: ["Sun"], 4: ["Moon"]}}
+    res = calculate_shadbala(planets, binfo, {"houses": {1: ["Sun"], 4: ["Moon"]}})
+    # Paksha (30), Ayana (0 at the northern solstice point) and lord of the
+    # month (30).
+    assert math.isclose(res["Moon"]["kala_bala"], 60.0)
+
+
+def test_shadbala_drik_chesta_and_houses():
+    planets = [
+        {"name": "Sun", "sign": 1, "degree": 10, "longitude": 10.0},
+        {"name": "Jupiter", "sign": 7, "degree": 10, "longitude": 190.0, "speed": -0.14},
+        {"name": "Saturn", "sign": 7, "degree": 10, "longitude": 190.0, "speed": 0.13},
+    ]
+    binfo = {"jd_ut": 2451545.0, "latitude": 0.0, "longitude": 0.0}
+    houses = {"houses": {1: {"occupants": ["Sun"]}, 7: {"occupants": ["Jupiter", "Saturn"]}}}
     res = calculate_shadbala(planets, binfo, houses)
-    assert math.isclose(res["Moon"]["kala_bala"], 15.0)
+    # Jupiter (benefic) and Saturn (malefic) both fully aspect the Sun.
+    assert res["Sun"]["drik_bala"] == 0
+    assert res["Jupiter"]["drik_bala"] == -15
+    assert res["Jupiter"]["chesta_bala"] == 60
+    assert res["Saturn"]["chesta_bala"] == 0
+    assert res["Saturn"]["dig_bala"] == 60
+    # 2000-01-01 12:00 UT at 0°E is a Saturday: Saturn rules the day.
+    # Kala Bala also carries Saturn's Ayana and Paksha Bala.
+    assert res["Saturn"]["kala_bala"] > 45
+    bhava = calculate_bhava_bala(houses, planets, binfo, res)
+    assert bhava[7]["occupants"] == ["Jupiter", "Saturn"]
+
+    # Sphuta drishti is degree-based, so a chart without houses keeps it.
+    unplaced = calculate_shadbala(planets, binfo, {"houses": {}})
+    assert {p: unplaced[p]["drik_bala"] for p in res} == {p: res[p]["drik_bala"] for p in res}
 
 
 def test_calculate_all_vargas_values():
@@ -14,6 +14,7 @@ export interface StartProfileJobRequest {
   location: string;
   lat?: number;
   lon?: number;
+  tz?: string;         // known timezone lets the backend skip geocoding entirely
 }
 
 type BackendProfilePayload = {
@@ -23,6 +24,7 @@ type BackendProfilePayload = {
   location: string;
   lat?: number;
   lon?: number;
+  timezone?: string;
 };
 
 export interface StartProfileJobResponse { job_id: string; status?: JobStatus; message?: string; }
@@ -76,6 +78,7 @@ export const profileApi = {
       location: body.location,
       lat: body.lat,
       lon: body.lon,
+      timezone: body.tz,
     } as BackendProfilePayload),
 
   jobStatus: (jobId: string) => get<JobStatusResponse>(`/jobs/${jobId}`),
@@ -1,9 +1,28 @@
+import { get } from './http';
+
 export interface PlaceSuggestion {
   id: string;
   label: string;       // human readable
   place_name: string;  // raw provider label
   lat: number;
   lon: number;
+  tz?: string;         // IANA timezone when the source knows it
+}
+
+async function serverSuggest(q: string, limit = 5): Promise<PlaceSuggestion[]> {
+  try {
+    const rows = await get<any[]>(`/locations/suggest?q=${encodeURIComponent(q)}&limit=${limit}`);
+    return (rows || []).map((r: any) => ({
+      id: `local:${r.label}`,
+      label: r.label,
+      place_name: r.label,
+      lat: r.latitude,
+      lon: r.longitude,
+      tz: r.timezone,
+    }));
+  } catch {
+    return [];
+  }
 }
 
 async function mapboxSearch(q: string, limit = 5): Promise<PlaceSuggestion[]> {
@@ -36,10 +55,30 @@ async function nominatimSearch(q: string, limit = 5): Promise<PlaceSuggestion[]>
   }));
 }
 
+// Same place from two sources: coordinates agree to about 10 km.
+function placeKey(p: PlaceSuggestion): string {
+  return `${p.lat?.toFixed(1)},${p.lon?.toFixed(1)}`;
+}
+
 export async function geocodeSearch(q: string, limit = 5): Promise<PlaceSuggestion[]> {
   if (!q || q.trim().length < 3) return [];
-  // Prefer Mapbox if token present; otherwise Nominatim
-  const mb = await mapboxSearch(q, limit);
-  if (mb.length) return mb;
-  return nominatimSearch(q, limit);
-}
\ No newline at end of file
+  // Local prefix index first (instant, includes timezone); when it has fewer
+  // than `limit` hits, top up from Mapbox, then Nominatim, dropping duplicates.
+  const local = await serverSuggest(q, limit);
+  if (local.length >= limit) return local;
+  let remote: PlaceSuggestion[] = [];
+  try {
+    remote = await mapboxSearch(q, limit);
+    if (!remote.length) remote = await nominatimSearch(q, limit);
+  } catch (err) {
+    if (!local.length) throw err;
+  }
+  const seen = new Set(local.map(placeKey));
+  const extra = remote.filter((p) => {
+    const key = placeKey(p);
+    if (seen.has(key)) return false;
+    seen.add(key);
+    return true;
+  });
+  return [...local, ...extra].slice(0, limit);
+}